@@ -8,95 +8,154 @@ import gzip
 import struct
 from cube2common.constants import cs_id_types, MAXENTS, game_entity_types
 
-def read_map_data(map_filename):
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+header_struct = struct.Struct("4s6i")
+old_light_struct = struct.Struct("3i")
+maptitle_struct = struct.Struct("128s")
+blendmap_numvars_struct = struct.Struct("2i")
+blendmap_numvars_numvslots_struct = struct.Struct("3i")
+var_header_struct = struct.Struct("<bH")
+int_struct = struct.Struct("i")
+float_struct = struct.Struct("f")
+ushort_struct = struct.Struct("H")
+gt_len_struct = struct.Struct("b")
+extra_struct = struct.Struct("HH")
+
+# x, y, z, attr1-5, type, reserved
+entity_struct = struct.Struct("<3f5h2B")
+
+if numpy is not None:
+    entity_dtype = numpy.dtype([('x', '<f4'), ('y', '<f4'), ('z', '<f4'),
+                                ('a1', '<i2'), ('a2', '<i2'), ('a3', '<i2'), ('a4', '<i2'), ('a5', '<i2'),
+                                ('type', 'u1'), ('reserved', 'u1')])
+
+CHUNK_SIZE = 1 << 16
+
+class MapDataStream(object):
+    '''
+    Reads the decompressed map in large chunks, updating the crc of the whole
+    file as each chunk is read so the file only needs to be decompressed once.
+    '''
+    def __init__(self, f):
+        self._f = f
+        self._buffer = b''
+        self._pos = 0
+        self._crc = 0
+
+    def _fill(self, n):
+        while len(self._buffer) - self._pos < n:
+            chunk = self._f.read(max(CHUNK_SIZE, n - (len(self._buffer) - self._pos)))
+            if not chunk:
+                return
+            self._crc = zlib.crc32(chunk, self._crc)
+            self._buffer = self._buffer[self._pos:] + chunk
+            self._pos = 0
+
+    def unpack(self, record_struct):
+        self._fill(record_struct.size)
+        values = record_struct.unpack_from(self._buffer, self._pos)
+        self._pos += record_struct.size
+        return values
+
+    def read(self, n):
+        self._fill(n)
+        data = self._buffer[self._pos:self._pos + n]
+        self._pos += len(data)
+        return data
+
+    def crc(self):
+        "Reads the remainder of the file and returns the crc of the whole decompressed file."
+        while True:
+            chunk = self._f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            self._crc = zlib.crc32(chunk, self._crc)
+        return self._crc & 0xffffffff
+
+def read_entities(data, count, use_numpy):
+    if use_numpy:
+        records = numpy.frombuffer(data, dtype=entity_dtype, count=count).tolist()
+    else:
+        records = entity_struct.iter_unpack(data)
+
+    return [{'id': i, 'type': ent_type, 'x': x, 'y': y, 'z': z, 'attrs': (a1, a2, a3, a4, a5), 'reserved': reserved}
+            for i, (x, y, z, a1, a2, a3, a4, a5, ent_type, reserved) in enumerate(records)]
+
+def read_map_data(map_filename, use_numpy=None):
+    if use_numpy is None:
+        use_numpy = numpy is not None
+
     meta_data = {'vars': {}, 'ents': []}
-    
+
     with gzip.open(map_filename) as f:
-        magic, version, headersize, worldsize, numents, numpvs, lightmaps = struct.unpack("4s6i", f.read(28))
-        
+        s = MapDataStream(f)
+
+        magic, version, headersize, worldsize, numents, numpvs, lightmaps = s.unpack(header_struct)
+
         meta_data['version'] = version
         meta_data['worldsize'] = worldsize
-        
+
         if version <= 28:
-            lightprecision, lighterror, lightlod = struct.unpack("3i", f.read(12))
-            
-            ambient         = struct.unpack("B",   f.read(1))
-            watercolor      = struct.unpack("3B",  f.read(3))
-            blendmap        = struct.unpack("B",   f.read(1))
-            lerpangle       = struct.unpack("B",   f.read(1))
-            lerpsubdiv      = struct.unpack("B",   f.read(1))
-            lerpsubdivsize  = struct.unpack("B",   f.read(1))
-            bumperror       = struct.unpack("B",   f.read(1))
-            skylight        = struct.unpack("3B",  f.read(3))
-            lavacolor       = struct.unpack("3B",  f.read(3))
-            waterfallcolor  = struct.unpack("3B",  f.read(3))
-            reserved        = struct.unpack("10B", f.read(10))
-            
-            maptitle = struct.unpack("128s", f.read(128))
-            
+            s.unpack(old_light_struct)
+            # ambient, watercolor, blendmap, lerpangle, lerpsubdiv, lerpsubdivsize, bumperror, skylight, lavacolor, waterfallcolor, reserved
+            s.read(28)
+            maptitle = s.unpack(maptitle_struct)
+
             meta_data['vars']['maptitle'] = maptitle
         else:
             if version <= 29:
-                blendmap, numvars = struct.unpack("2i", f.read(8))
+                blendmap, numvars = s.unpack(blendmap_numvars_struct)
             else:
-                blendmap, numvars, numvslots = struct.unpack("3i", f.read(12))
-           
+                blendmap, numvars, numvslots = s.unpack(blendmap_numvars_numvslots_struct)
+
         if version <= 28:
             numvars = 0
-    
-        if version <= 29:
-            numvslots = 0
-    
+
         for i in range(numvars):
-            var_type = struct.unpack("b", f.read(1))[0]
-            ilen     = struct.unpack("<H", f.read(2))[0]
-            var_name = f.read(ilen)
+            var_type, ilen = s.unpack(var_header_struct)
+            var_name = s.read(ilen)
             if var_type == cs_id_types.ID_VAR:
-                var_value = struct.unpack("i", f.read(4))[0]
+                var_value = s.unpack(int_struct)[0]
             elif var_type == cs_id_types.ID_FVAR:
-                var_value = struct.unpack("f", f.read(4))[0]
+                var_value = s.unpack(float_struct)[0]
             elif var_type == cs_id_types.ID_SVAR:
-                slen = struct.unpack("H", f.read(2))[0]
-                var_value = f.read(slen)
-                
-            #print "{:.8}: {:.32s} = {}".format(cs_id_types.by_value(var_type), var_name, var_value)
-            
+                slen = s.unpack(ushort_struct)[0]
+                var_value = s.read(slen)
+
             meta_data['vars'][var_name] = var_value
-            
+
         if version >= 16:
-            gt_len = struct.unpack("b", f.read(1))[0]
-            game_type = f.read(gt_len+1)
+            gt_len = s.unpack(gt_len_struct)[0]
+            game_type = s.read(gt_len+1)
         else:
             game_type = 'fps'
-            
+
         meta_data['gametype'] = game_type
 
         if version >= 16:
-            eif = struct.unpack("H", f.read(2))[0]
-            extra_size = struct.unpack("H", f.read(2))[0]
-            f.read(extra_size)
-    
+            eif, extra_size = s.unpack(extra_struct)
+            s.read(extra_size)
+
         if version < 14:
-            f.read(256)
+            s.read(256)
         else:
-            nummru = struct.unpack("H", f.read(2))[0]
-            f.read(nummru*2)
-            
-        for i in range(min(numents, MAXENTS)):
-            x, y, z = struct.unpack("3f", f.read(12))
-            attrs = struct.unpack('5h', f.read(10))
-            ent_type, reserved = struct.unpack('2B', f.read(2))
-            
-            #if game_entity_types.by_value(ent_type) == "FLAG":
-            #    print x, y, z, attrs, game_entity_types.by_value(ent_type), reserved
-                
-            ent = {'id': i, 'type': ent_type, 'x': x, 'y': y, 'z': z, 'attrs': attrs, 'reserved': reserved}
-            meta_data['ents'].append(ent)
-    
-    try:
-        with gzip.open(map_filename) as f:
-            meta_data['crc'] = zlib.crc32(f.read()) & 0xffffffff
-    except IOError:
-        meta_data['crc'] = 0
-        
-    return meta_data
\ No newline at end of file
+            nummru = s.unpack(ushort_struct)[0]
+            s.read(nummru*2)
+
+        entity_count = max(0, min(numents, MAXENTS))
+        entity_data = s.read(entity_count * entity_struct.size)
+        if len(entity_data) != entity_count * entity_struct.size:
+            raise struct.error("unpack requires a buffer of {} bytes".format(entity_count * entity_struct.size))
+        meta_data['ents'] = read_entities(entity_data, entity_count, use_numpy)
+
+        try:
+            meta_data['crc'] = s.crc()
+        except IOError:
+            meta_data['crc'] = 0
+
+    return meta_data
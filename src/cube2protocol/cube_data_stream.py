@@ -1,17 +1,18 @@
-import collections
 import struct
 
 
+prefixed_int16_struct = struct.Struct('<Bh')
+prefixed_uint32_struct = struct.Struct('<BI')
+float_struct = struct.Struct('<f')
+
 class CubeDataStream(object):
     def __init__(self, data=""):
         if isinstance(data, CubeDataStream):
             self.data = bytearray(data.data)
-        elif isinstance(data, bytearray):
+        elif isinstance(data, (bytearray, bytes, memoryview)):
             self.data = bytearray(data)
         else:
-            self.data = bytearray(list(map(ord, data)))
-
-
+            self.data = bytearray(data.encode('latin-1'))
 
     @staticmethod
     def pack_format(fmt, data):
@@ -34,12 +35,12 @@ class CubeDataStream(object):
         return cds
 
     def write(self, data):
-        if isinstance(data, collections.Iterable):
-            self.data.extend(data)
+        if isinstance(data, int):
+            self.data.append(data)
         elif isinstance(data, CubeDataStream):
-            self.data.extend(data.data)
+            self.data += data.data
         else:
-            self.data.append(data)
+            self.data.extend(data)
 
     def clear(self):
         self.data = bytearray()
@@ -63,47 +64,51 @@ class CubeDataStream(object):
             if not peek: del self.data[:n]
 
     def putbyte(self, b):
-        self.write(b & 0xFF)
+        self.data.append(b & 0xFF)
 
     def putint(self, i):
         i = int(i)
         if -127 < i and i < 128:
-            self.write(i & 0xFF)
-        elif -0x8000 < i and i < 0x8000 :
-            self.write(0x80)
-            self.write(i & 0xFF)
-            self.write(i >> 8 & 0xFF)
+            self.data.append(i & 0xFF)
+        elif -0x8000 < i and i < 0x8000:
+            self.data += prefixed_int16_struct.pack(0x80, i)
         else:
-            self.write(0x81)
-            self.write(i & 0xFF)
-            self.write((i >> 8) & 0xFF)
-            self.write((i >> 16) & 0xFF)
-            self.write((i >> 24) & 0xFF)
+            self.data += prefixed_uint32_struct.pack(0x81, i & 0xFFFFFFFF)
+
+    def putints(self, values):
+        "Puts each of the values as an int."
+        data = self.data
+        for i in values:
+            i = int(i)
+            if -127 < i and i < 128:
+                data.append(i & 0xFF)
+            elif -0x8000 < i and i < 0x8000:
+                data += prefixed_int16_struct.pack(0x80, i)
+            else:
+                data += prefixed_uint32_struct.pack(0x81, i & 0xFFFFFFFF)
 
     def putuint(self, n):
         n = int(n)
         if(n < 0 or n >= (1 << 21)):
-            self.write(0x80 | (n & 0x7F))
-            self.write(0x80 | ((n >> 7) & 0x7F))
-            self.write(0x80 | ((n >> 14) & 0x7F))
-            self.write(n >> 21)
+            self.data += bytes((0x80 | (n & 0x7F), 0x80 | ((n >> 7) & 0x7F), 0x80 | ((n >> 14) & 0x7F), n >> 21))
         elif(n < (1 << 7)):
-            self.write(n)
+            self.data.append(n)
         elif(n < (1 << 14)):
-            self.write(0x80 | (n & 0x7F))
-            self.write(n >> 7)
+            self.data += bytes((0x80 | (n & 0x7F), n >> 7))
         else:
-            self.write(0x80 | (n & 0x7F))
-            self.write(0x80 | ((n >> 7) & 0x7F))
-            self.write(n >> 14)
+            self.data += bytes((0x80 | (n & 0x7F), 0x80 | ((n >> 7) & 0x7F), n >> 14))
 
     def putfloat(self, f):
-        f = float(f)
-        self.write(bytearray(list(map(ord, struct.pack('<f', f)))))
+        self.data += float_struct.pack(float(f))
 
     def putstring(self, s):
-        self.write(bytearray(list(map(ord, s))))
-        self.write(0)
+        self.data += s.encode('latin-1')
+        self.data.append(0)
+
+    def putstring_bytes(self, b):
+        "Puts an already encoded string followed by the null terminator."
+        self.data += b
+        self.data.append(0)
 
     def getbyte(self, peek=False):
         return self.read(1, peek)
@@ -112,15 +117,15 @@ class CubeDataStream(object):
         c = self.read(1, peek)
 
         if c == 0x80:
-                t = str(self.read(3 if peek else 2, peek))
+                t = bytes(self.read(3 if peek else 2, peek))
                 if peek: t = t[1:]
-                return struct.unpack('h', t)[0]
+                return struct.unpack('<h', t)[0]
         elif c == 0x81:
-                t = str(self.read(5 if peek else 4, peek))
+                t = bytes(self.read(5 if peek else 4, peek))
                 if peek: t = t[1:]
-                return struct.unpack('i', t)[0]
+                return struct.unpack('<i', t)[0]
         else:
-                return struct.unpack('b', chr(c))[0]
+                return c - 0x100 if c & 0x80 else c
 
     def getuint(self, peek=False):
         n = self.read(1)
@@ -135,11 +140,11 @@ class CubeDataStream(object):
         return n;
 
     def getfloat(self, peek=False):
-        return struct.unpack('<f', str(self.read(4, peek)))[0]
+        return float_struct.unpack(bytes(self.read(4, peek)))[0]
 
     def getstring(self, peek=False):
         try:
-            return str(self.read(self.data.index(chr(0)), peek))
+            return self.read(self.data.index(0), peek).decode('latin-1')
         finally:
             self.read(1, peek)  # Throw away the null terminator
 
@@ -1,96 +1,131 @@
 import struct
 
+int16_struct = struct.Struct('<h')
+int32_struct = struct.Struct('<i')
+uint16_struct = struct.Struct('<H')
+float_struct = struct.Struct('<f')
+
 class ReadCubeDataStream(object):
+    """
+    Reads cube 2 protocol values out of a packet without copying it.
+
+    The packet is wrapped in a memoryview and values are decoded in place at
+    the current offset using precompiled struct.Struct objects.
+    """
     def __init__(self, data=b"", pos=0):
         try:
-            assert len(data) == len(bytearray(data))
             if isinstance(data, ReadCubeDataStream):
-                self.data = bytearray(data.data)
-            elif isinstance(data, bytearray):
-                self.data = data
-            elif type(data) == bytes:
-                self.data = bytearray(data)
+                self._buffer = data._buffer
+            elif isinstance(data, (bytes, bytearray)):
+                self._buffer = data
+            elif isinstance(data, memoryview):
+                if isinstance(data.obj, (bytes, bytearray)) and data.nbytes == len(data.obj):
+                    self._buffer = data.obj
+                else:
+                    # A sub view can't be searched for string terminators in place so copy it once.
+                    self._buffer = data.tobytes()
             else:
                 print("I don't know what I got so just trying to map to a bytearray using ord. This shouldn't happen, it is slow.")
-                self.data = bytearray(list(map(ord, data)))
+                self._buffer = bytearray(list(map(ord, data)))
         except:
             print(("Data causing exception: '{}', type = {}".format(data, type(data))))
             raise
-                
+
+        self.data = memoryview(self._buffer)
         self.length = len(self.data)
         self.pos = pos
 
     def copy(self):
-        return ReadCubeDataStream(self.data, self.pos)
+        return ReadCubeDataStream(self, self.pos)
 
     def empty(self):
         return self.pos >= self.length
-        
+
     def __bytes__(self):
-        return bytes(self.data[self.pos:])
-    
+        return self.data[self.pos:].tobytes()
+
     def __len__(self):
         return self.length - self.pos
-    
+
     def read(self, n, peek=False):
-        if n > len(self):
-            print((self.pos, self.length, len(self), n, repr(self.data)))
+        "Returns a memoryview of the next n bytes which shares the underlying packet buffer."
+        pos = self.pos
+        if n > self.length - pos:
+            print((pos, self.length, len(self), n, repr(bytes(self.data))))
             raise IndexError()
-        try:
-            #if n == 1:
-            #    return bytearray((self.data[self.pos],))
-            #else:
-            return self.data[self.pos:self.pos+n]
-        finally:
-            if not peek: self.pos += n
-            
+        if not peek: self.pos = pos + n
+        return self.data[pos:pos + n]
+
+    def skip(self, n):
+        if n > self.length - self.pos:
+            raise IndexError()
+        self.pos += n
+
     def getbyte(self, peek=False):
         try:
             return self.data[self.pos]
         finally:
             if not peek: self.pos += 1
-        
+
     def getint(self, peek=False):
-        c = self.getbyte(peek)
-        
+        pos = self.pos
+        c = self.data[pos]
+
         if c == 0x80:
-            t = self.read(3 if peek else 2, peek)
-            if peek: t = bytes(t[1:])
-            else: t = bytes(t)
-            return struct.unpack('h', t)[0]
+            value = int16_struct.unpack_from(self.data, pos + 1)[0]
+            size = 3
         elif c == 0x81:
-            t = self.read(5 if peek else 4, peek)
-            if peek: t = bytes(t[1:])
-            else: t = bytes(t)
-            return struct.unpack('i', t)[0]
+            value = int32_struct.unpack_from(self.data, pos + 1)[0]
+            size = 5
         else:
-            if(c & 0x80):
-                return -0x100 + c
-            return c
-        
+            value = c - 0x100 if c & 0x80 else c
+            size = 1
+
+        if not peek: self.pos = pos + size
+        return value
+
+    def getints(self, count):
+        "Returns a list of the next count ints."
+        getint = self.getint
+        return [getint() for _ in range(count)]
+
     def getuint(self, peek=False):
-        n = self.getbyte()
+        data = self.data
+        pos = self.pos
+
+        n = data[pos]
+        pos += 1
         if(n & 0x80):
-            n += (self.getbyte(peek) << 7) - 0x80;
+            n += (data[pos] << 7) - 0x80
+            pos += 1
             if(n & (1<<14)):
-                n += (self.getbyte(peek) << 14) - (1<<14)
-            if(n & (1<<21)): 
-                n += (self.getbyte(peek) << 21) - (1<<21)
-            if(n & (1<<28)): 
+                n += (data[pos] << 14) - (1<<14)
+                pos += 1
+            if(n & (1<<21)):
+                n += (data[pos] << 21) - (1<<21)
+                pos += 1
+            if(n & (1<<28)):
                 n |= -1<<28
-        return n;
-        
+
+        if not peek: self.pos = pos
+        return n
+
     def getfloat(self, peek=False):
-        return struct.unpack('<f', str(self.read(4, peek)))[0]
-        
-    def getstring(self, peek=False):
-        try:
-            for i in range(self.pos, self.length):
-                if self.data[i] == 0:
-                    return bytes(self.read(i-self.pos, peek)).decode('utf-8')
-        except:
-            print((repr(self.data)))
-            raise
-        finally:
-            if not peek: self.getbyte(peek) # Throw away the null terminator
+        value = float_struct.unpack_from(self.data, self.pos)[0]
+        if not peek: self.pos += 4
+        return value
 
+    def getrecord(self, record_struct, peek=False):
+        "Returns the tuple unpacked from the fixed layout record_struct (a struct.Struct) at the current position."
+        value = record_struct.unpack_from(self.data, self.pos)
+        if not peek: self.pos += record_struct.size
+        return value
+
+    def getstring(self, peek=False):
+        pos = self.pos
+        end = self._buffer.find(0, pos, self.length)
+        if end < 0:
+            print((repr(bytes(self.data))))
+            raise IndexError()
+        if not peek: self.pos = end + 1 # Throw away the null terminator
+        return str(self.data[pos:end], 'utf-8')
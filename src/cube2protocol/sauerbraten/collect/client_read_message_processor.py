@@ -5,6 +5,10 @@ from cube2protocol.cube_data_stream import CubeDataStream
 from cube2protocol.read_cube_data_stream import ReadCubeDataStream
 from cube2protocol.sauerbraten.collect.client_read_stream_protocol import sauerbraten_stream_spec
 from cube2protocol.sauerbraten.collect.read_physics_state import read_physics_state
+from cube2protocol.stream_specification_compiler import compile_stream_specification
+
+
+compiled_stream_spec = compile_stream_specification(sauerbraten_stream_spec)
 
 
 class ClientReadMessageProcessor(object):
@@ -14,7 +18,7 @@ class ClientReadMessageProcessor(object):
         if channel == 0:
             messages = self._parse_channel_0_data(data)
         elif channel == 1:
-            messages = sauerbraten_stream_spec.read(data, {'aiclientnum':-1})
+            messages = compiled_stream_spec.read(data, {'aiclientnum':-1})
         else:
             return []
             print(channel)
@@ -1,6 +1,10 @@
 from cube2common.constants import message_types
-from cube2protocol.read_cube_data_stream import ReadCubeDataStream
+from cube2protocol.read_cube_data_stream import ReadCubeDataStream, uint16_struct
 from cube2protocol.sauerbraten.collect.server_read_stream_protocol import sauerbraten_stream_spec
+from cube2protocol.stream_specification_compiler import compile_stream_specification
+
+
+compiled_stream_spec = compile_stream_specification(sauerbraten_stream_spec)
 
 
 class ServerReadMessageProcessor(object):
@@ -10,7 +14,7 @@ class ServerReadMessageProcessor(object):
         if channel == 0:
             messages = self._parse_channel_0_data(data)
         elif channel == 1:
-            messages = sauerbraten_stream_spec.read(data, {'aiclientnum':-1})
+            messages = compiled_stream_spec.read(data, {'aiclientnum':-1})
 
         return messages
 
@@ -21,40 +25,36 @@ class ServerReadMessageProcessor(object):
         if message_type == message_types.N_POS:
             cn = cds.getuint()
 
-            cds.getbyte()
+            cds.skip(1)
 
             flags = cds.getuint()
 
             v = [0, 0, 0]
             for k in range(3):
-                n = cds.getbyte()
-                n |= cds.getbyte() << 8
+                n = cds.getrecord(uint16_struct)[0]
                 if flags & (1 << k):
                     n |= cds.getbyte() << 16
                     if n & 0x800000:
                         n |= -1 << 24
                 v[k] = n
 
-            cds.read(3)
-
-            mag = cds.getbyte()
+            # yaw, pitch, roll and magnitude are not used but must be present
+            cds.skip(4)
             if flags & (1 << 3):
-                mag |= cds.getbyte() << 8
+                cds.skip(1)
 
-            dir = cds.getbyte() | (cds.getbyte() << 8)  # @ReservedAssignment
+            # vel dir
+            cds.skip(2)
 
             message = ('N_POS', {'clientnum': cn, 'position': v, 'raw_position': data})
 
         elif message_type == message_types.N_JUMPPAD:
-            cn = cds.getint()
-            jumppad = cds.getint()
+            cn, jumppad = cds.getints(2)
 
             message = ('N_JUMPPAD', {'aiclientnum': cn, 'jumppad': jumppad})
 
         elif message_type == message_types.N_TELEPORT:
-            cn = cds.getint()
-            teleport = cds.getint()
-            teledest = cds.getint()
+            cn, teleport, teledest = cds.getints(3)
 
             message = ('N_TELEPORT', {'aiclientnum': cn, 'teleport': teleport, 'teledest': teledest})
 
@@ -0,0 +1,342 @@
+import logging
+
+from cube2protocol.stream_specification import Field, GameStateField, RawField, FieldCollection, IteratedFieldCollection, TerminatedFieldCollection, StateDependent, ConditionalFieldCollection, SwitchField, MessageType, StreamStateModifierType, StreamContainerType, UnknownMessageType
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(level=logging.WARN)
+
+class _CodeWriter(object):
+    def __init__(self):
+        self.lines = []
+        self.indent_level = 0
+
+    def line(self, text):
+        self.lines.append("    " * self.indent_level + text)
+
+    def indent(self):
+        self.indent_level += 1
+
+    def dedent(self):
+        self.indent_level -= 1
+
+    def source(self):
+        return "\n".join(self.lines) + "\n"
+
+class MessageReaderCompiler(object):
+    """
+    Turns the Field/FieldCollection object graph of a stream specification into
+    generated python functions which perform the same reads in straight-line code.
+
+    Any node which the compiler does not understand is called through its own
+    read method so the decoded structures are always identical to the interpreter.
+    """
+    def __init__(self, type_method_mapping):
+        self.type_method_mapping = type_method_mapping
+        self._namespace = {'_tmm': type_method_mapping, '_logger': logger}
+        self._constant_ids = {}
+        self._variable_count = 0
+
+    def compile_message_type(self, message_type):
+        "Returns a function(stream_object, state, game_state, read_data) which appends the decoded message to read_data."
+        tail = ["d.update(state)", "read_data.append(({!r}, d))".format(message_type.message_name)]
+        return self._compile_function(message_type.message_name, message_type.fields, ('s', 'state', 'game_state', 'read_data'), tail)
+
+    def compile_state_modifier_type(self, function_name, state_modifier_type):
+        "Returns a function(stream_object, state, game_state, read_data) which updates the stream state."
+        return self._compile_function(function_name, state_modifier_type.fields, ('s', 'state', 'game_state', 'read_data'), ["state.update(d)"])
+
+    def compile_container_type(self, function_name, container_type, compiled_container_specification):
+        "Returns a function(stream_object, state, game_state, read_data) which reads the contained stream."
+        w = _CodeWriter()
+        _, length_var = self._emit_field(w, container_type.length_field)
+        stream_data = self._constant(self.type_method_mapping['stream_data'])
+        container_specification = self._constant(compiled_container_specification)
+
+        tail = ["c = dict(state)",
+                "c.update(d)"]
+        tail.extend(w.lines)
+        tail.append("read_data.extend({}.read({}(s, {}), c, game_state))".format(container_specification, stream_data, length_var))
+        return self._compile_function(function_name, container_type.field_collection.fields, ('s', 'state', 'game_state', 'read_data'), tail)
+
+    def _compile_function(self, message_name, fields, arguments, tail):
+        function_name = "read_{}".format(message_name)
+
+        w = _CodeWriter()
+        w.line("def {}({}):".format(function_name, ", ".join(arguments)))
+        w.indent()
+        w.line("try:")
+        w.indent()
+        self._emit_collection(w, fields, 'd')
+        for line in tail:
+            w.line(line)
+        w.dedent()
+        w.line("except:")
+        w.indent()
+        w.line("_logger.error({!r})".format("Exception occurred in MessageType '{}'".format(message_name)))
+        w.line("raise")
+
+        source = w.source()
+        code = compile(source, "<compiled {}>".format(function_name), "exec")
+        exec(code, self._namespace)
+        function = self._namespace.pop(function_name)
+        function.source = source
+        return function
+
+    def _variable(self):
+        self._variable_count += 1
+        return "v{}".format(self._variable_count)
+
+    def _constant(self, value):
+        key = id(value)
+        if key not in self._constant_ids:
+            name = "_c{}".format(len(self._constant_ids))
+            self._constant_ids[key] = name
+            self._namespace[name] = value
+        return self._constant_ids[key]
+
+    def _reader(self, type_name):
+        return self._constant(self.type_method_mapping[type_name])
+
+    def _is_inlined(self, field):
+        return isinstance(field, (ConditionalFieldCollection, SwitchField))
+
+    def _emit_collection(self, w, fields, target):
+        "Emits code which assigns the dictionary read by a FieldCollection to the variable target."
+        if not any(self._is_inlined(field) for field in fields):
+            items = []
+            for field in fields:
+                key, value_var = self._emit_field(w, field, game_state_field=True)
+                items.append("{}: {}".format(key, value_var))
+            w.line("{} = {{{}}}".format(target, ", ".join(items)))
+        else:
+            w.line("{} = {{}}".format(target))
+            self._emit_collection_into(w, fields, target)
+
+    def _emit_collection_into(self, w, fields, target):
+        "Emits code which stores the fields of a FieldCollection into the existing dictionary target."
+        for field in fields:
+            if isinstance(field, ConditionalFieldCollection):
+                self._emit_conditional(w, field, target)
+            elif isinstance(field, SwitchField):
+                self._emit_switch(w, field, target)
+            else:
+                key, value_var = self._emit_field(w, field, game_state_field=True)
+                w.line("{}[{}] = {}".format(target, key, value_var))
+
+    def _emit_merge(self, w, field_collection, target):
+        "Emits an indented block equivalent to target.update(field_collection.read(...))."
+        w.indent()
+        line_count = len(w.lines)
+        if type(field_collection) is FieldCollection:
+            self._emit_collection_into(w, field_collection.fields, target)
+        else:
+            w.line("{}.update({}.read(s, _tmm, game_state=game_state))".format(target, self._constant(field_collection)))
+        if len(w.lines) == line_count:
+            w.line("pass")
+        w.dedent()
+
+    def _emit_predicate(self, w, predicate, peek):
+        if predicate is None:
+            return "None"
+        _, value_var = self._emit_field(w, predicate, peek=peek)
+        return value_var
+
+    def _predicate_test(self, predicate_comparison, value_var):
+        if isinstance(predicate_comparison, StateDependent):
+            return "{}({}, game_state)".format(self._constant(predicate_comparison), value_var)
+        return "{}({})".format(self._constant(predicate_comparison), value_var)
+
+    def _emit_conditional(self, w, field, target):
+        value_var = self._emit_predicate(w, field.predicate, field.peek_predicate)
+
+        w.line("if {}:".format(self._predicate_test(field.predicate_comparison, value_var)))
+        self._emit_merge(w, field.consequent, target)
+        if field.alternative is not None:
+            w.line("else:")
+            self._emit_merge(w, field.alternative, target)
+
+    def _emit_switch(self, w, field, target):
+        value_var = self._emit_predicate(w, field.predicate, field.peek_predicate)
+
+        keyword = "if"
+        for case in field.cases:
+            w.line("{} {}:".format(keyword, self._predicate_test(case.predicate_comparison, value_var)))
+            self._emit_merge(w, case.consequent, target)
+            keyword = "elif"
+
+        if field.default is not None:
+            w.line("else:" if field.cases else "if True:")
+            self._emit_merge(w, field.default, target)
+
+    def _emit_field(self, w, field, peek=False, game_state_field=False):
+        "Emits code which reads a ('field name', field_data) node and returns the key expression and the variable holding the value."
+        value_var = self._variable()
+        key = repr(getattr(field, 'name', None))
+
+        if type(field) in (Field, GameStateField):
+            w.line("{} = {}(s, {})".format(value_var, self._reader(field.type), peek))
+            if game_state_field and isinstance(field, GameStateField):
+                w.line("game_state[{}] = {}".format(key, value_var))
+        elif type(field) is RawField:
+            w.line("{} = {}(s, {})".format(value_var, self._reader('stream_data'), field.size))
+        elif type(field) is IteratedFieldCollection:
+            self._emit_iterated(w, field, value_var)
+        elif type(field) is TerminatedFieldCollection:
+            self._emit_terminated(w, field, value_var)
+        else:
+            key = self._variable()
+            peek_argument = "peek=True, " if peek else ""
+            w.line("{}, {} = {}.read(s, _tmm, {}game_state=game_state)".format(key, value_var, self._constant(field), peek_argument))
+
+        return key, value_var
+
+    def _emit_item(self, w, field_collection, target):
+        "Emits code which assigns one element of an iterated or terminated collection to target."
+        if type(field_collection) is FieldCollection:
+            self._emit_collection(w, field_collection.fields, target)
+        elif type(field_collection) in (Field, GameStateField, RawField):
+            key, value_var = self._emit_field(w, field_collection)
+            w.line("{} = ({}, {})".format(target, key, value_var))
+        else:
+            w.line("{} = {}.read(s, _tmm, game_state=game_state)".format(target, self._constant(field_collection)))
+
+    def _emit_iterated(self, w, field, value_var):
+        if isinstance(field.count, Field):
+            _, count = self._emit_field(w, field.count)
+        else:
+            count = int(field.count)
+
+        item_var = self._variable()
+        w.line("{} = []".format(value_var))
+        w.line("for _ in range({}):".format(count))
+        w.indent()
+        self._emit_item(w, field.field_collection, item_var)
+        w.line("{}.append({})".format(value_var, item_var))
+        w.dedent()
+
+    def _emit_terminated(self, w, field, value_var):
+        terminator_reader = self._reader(field.terminator_field.type)
+        comparison = self._constant(field.terminator_comparison)
+
+        item_var = self._variable()
+        w.line("{} = []".format(value_var))
+        w.line("while {}({}(s, True)):".format(comparison, terminator_reader))
+        w.indent()
+        self._emit_item(w, field.field_collection, item_var)
+        w.line("{}.append({})".format(value_var, item_var))
+        w.dedent()
+        # throw away the terminator once it is found
+        w.line("{}(s, False)".format(terminator_reader))
+
+class CompiledStreamSpecification(object):
+    """
+    Drop in replacement for a StreamSpecification which decodes using compiled
+    message readers looked up in a table indexed by message type id.
+    """
+    def __init__(self, stream_specification):
+        self.StreamClass = stream_specification.StreamClass
+        self.type_method_mapping = stream_specification.type_method_mapping
+        self.default_state = stream_specification.default_state
+        self.message_type_enum = stream_specification.message_type_enum
+
+        self._read_message_type_id = self.type_method_mapping[stream_specification.message_type_id_type]
+
+        compiler = MessageReaderCompiler(self.type_method_mapping)
+
+        handlers = {}
+
+        for message_type_id, message_type in stream_specification.message_types.items():
+            if type(message_type) is MessageType:
+                handlers[message_type_id] = compiler.compile_message_type(message_type)
+            else:
+                handlers[message_type_id] = self._interpreted_message_handler(message_type)
+
+        for message_type_id, container_type in stream_specification.container_types.items():
+            function_name = "container_{}".format(self._debug_message_type_name(message_type_id))
+            if isinstance(container_type, StreamContainerType):
+                compiled_container_specification = CompiledStreamSpecification(container_type)
+                handlers[message_type_id] = compiler.compile_container_type(function_name, container_type, compiled_container_specification)
+            else:
+                handlers[message_type_id] = self._interpreted_container_handler(container_type)
+
+        for message_type_id, state_modifier_type in stream_specification.state_modifier_types.items():
+            function_name = "state_modifier_{}".format(self._debug_message_type_name(message_type_id))
+            if type(state_modifier_type) is StreamStateModifierType:
+                handlers[message_type_id] = compiler.compile_state_modifier_type(function_name, state_modifier_type)
+            else:
+                handlers[message_type_id] = self._interpreted_state_modifier_handler(state_modifier_type)
+
+        dispatch_size = max([message_type_id + 1 for message_type_id in handlers if message_type_id >= 0] or [0])
+
+        self._dispatch = [None] * dispatch_size
+        self._negative_handlers = {}
+
+        for message_type_id, handler in handlers.items():
+            if message_type_id >= 0:
+                self._dispatch[message_type_id] = handler
+            else:
+                self._negative_handlers[message_type_id] = handler
+
+    def _debug_message_type_name(self, message_type_id):
+        if self.message_type_enum is not None:
+            return self.message_type_enum.by_value(message_type_id)
+        return message_type_id
+
+    def _interpreted_message_handler(self, message_type):
+        type_method_mapping = self.type_method_mapping
+
+        def handler(stream_object, state, game_state, read_data):
+            message_name, datum = message_type.read(stream_object, type_method_mapping, game_state)
+            datum.update(state)
+            read_data.append((message_name, datum))
+        return handler
+
+    def _interpreted_container_handler(self, container_type):
+        type_method_mapping = self.type_method_mapping
+
+        def handler(stream_object, state, game_state, read_data):
+            read_data.extend(container_type.read(stream_object, type_method_mapping, state, game_state=game_state))
+        return handler
+
+    def _interpreted_state_modifier_handler(self, state_modifier_type):
+        type_method_mapping = self.type_method_mapping
+
+        def handler(stream_object, state, game_state, read_data):
+            state_modifier_type.read(stream_object, type_method_mapping, state, game_state=game_state)
+        return handler
+
+    def read(self, raw_stream, initial_state, game_state={}):
+        state = {}
+        state.update(self.default_state)
+        state.update(initial_state)
+
+        read_data = []
+
+        dispatch = self._dispatch
+        dispatch_size = len(dispatch)
+        read_message_type_id = self._read_message_type_id
+
+        try:
+            stream_object = self.StreamClass(raw_stream)
+
+            while(not stream_object.empty()):
+                message_type_id = read_message_type_id(stream_object)
+
+                if 0 <= message_type_id < dispatch_size:
+                    handler = dispatch[message_type_id]
+                else:
+                    handler = self._negative_handlers.get(message_type_id)
+
+                if handler is None:
+                    logger.error("Unknown message: {}".format(self._debug_message_type_name(message_type_id)))
+                    raise UnknownMessageType(message_type_id)
+
+                handler(stream_object, state, game_state, read_data)
+            return read_data
+        except TypeError:
+            print((repr(raw_stream)))
+            raise
+
+def compile_stream_specification(stream_specification):
+    return CompiledStreamSpecification(stream_specification)
@@ -1,18 +1,13 @@
+from spyd.game.awards.counter_award import CounterAward
 from spyd.registry_manager import register
 
 
 @register('award')
-class Champion(object):
+class Champion(CounterAward):
     left_weight = 7
     award_text = "Champion"
-
-    @staticmethod
-    def is_client_eligible(client):
-        return client.state.flags > 0 and not client.state.is_spectator
-
-    @staticmethod
-    def get_stat_from_client(client):
-        return client.state.flags
+    eligible_counter = 'flags'
+    stat_counter = 'flags'
 
     @staticmethod
     def format_stat(stat):
@@ -1,18 +1,13 @@
+from spyd.game.awards.counter_award import CounterAward
 from spyd.registry_manager import register
 
 
 @register('award')
-class FragMonger(object):
+class FragMonger(CounterAward):
     left_weight = 10
     award_text = "Frag Monger"
-
-    @staticmethod
-    def is_client_eligible(client):
-        return client.state.frags > 0 and not client.state.is_spectator
-
-    @staticmethod
-    def get_stat_from_client(client):
-        return client.state.frags
+    eligible_counter = 'frags'
+    stat_counter = 'frags'
 
     @staticmethod
     def format_stat(stat):
@@ -1,19 +1,22 @@
+from spyd.game.awards.counter_award import CounterAward
 from spyd.registry_manager import register
 
 
 @register('award')
-class LoneWolf(object):
+class LoneWolf(CounterAward):
     left_weight = 8
     award_text = "Lone Wolf"
-
-    @staticmethod
-    def is_client_eligible(client):
-        return client.state.frags > 10 and not client.state.is_spectator
+    eligible_counter = 'frags'
+    eligible_above = 10
 
     @staticmethod
     def get_stat_from_client(client):
         return client.state.kpd
 
+    @staticmethod
+    def get_stat_column(table):
+        return table.kpd()
+
     @staticmethod
     def format_stat(stat):
         return str(stat)
@@ -1,18 +1,13 @@
+from spyd.game.awards.counter_award import CounterAward
 from spyd.registry_manager import register
 
 
 @register('award')
-class Pursuer(object):
+class Pursuer(CounterAward):
     left_weight = 6
     award_text = "Pursuer"
-
-    @staticmethod
-    def is_client_eligible(client):
-        return client.state.flag_returns > 0 and not client.state.is_spectator
-
-    @staticmethod
-    def get_stat_from_client(client):
-        return client.state.flag_returns
+    eligible_counter = 'flag_returns'
+    stat_counter = 'flag_returns'
 
     @staticmethod
     def format_stat(stat):
@@ -1,4 +1,5 @@
 from cube2common.colors import colors
+from spyd.game.room.room_stats import RoomStatsTable
 from spyd.game.server_message_formatter import smf, info, wrapper_function
 from spyd.registry_manager import RegistryManager
 from spyd.utils.import_all import import_all
@@ -28,22 +29,35 @@ def format_award(award, names, value):
     return smf.format("{award_text}: {winners} ({value#value})", award_text=award_text, winners=names, value=value)
 
 class AwardInstance(object):
-    def __init__(self, award, clients_iter):
+    def __init__(self, award, clients_iter, stats_table=None):
         self.award = award
         self.clients_iter = clients_iter
 
-        self.eligible_clients = [c for c in clients_iter() if award.is_client_eligible(c)]
+        if stats_table is None:
+            stats_table = RoomStatsTable(clients_iter())
+        self.stats_table = stats_table
+
+        # Awards which do not provide columns are computed one client at a time
+        if hasattr(award, 'get_eligible_column'):
+            eligible = award.get_eligible_column(stats_table)
+        else:
+            eligible = [award.is_client_eligible(c) for c in stats_table.players]
+
+        if hasattr(award, 'get_stat_column'):
+            self.stats = award.get_stat_column(stats_table)
+        else:
+            self.stats = [award.get_stat_from_client(c) for c in stats_table.players]
+
+        self.eligible_clients = [c for c, is_eligible in zip(stats_table.players, eligible) if is_eligible]
 
         self.left_weight = award.left_weight
 
     def get_winners(self, winning_stat_value):
-        winners = [c for c in self.clients_iter() if self.award.get_stat_from_client(c) == winning_stat_value]
+        winners = [c for c, stat in zip(self.stats_table.players, self.stats) if stat == winning_stat_value]
         return winners
 
     def get_winning_stat_value(self):
-        one_winner = max(self.clients_iter(), key=lambda c: self.award.get_stat_from_client(c))
-        winning_stat_value = self.award.get_stat_from_client(one_winner)
-        return winning_stat_value
+        return max(self.stats)
 
     @property
     def has_winner(self):
@@ -63,7 +77,9 @@ def display_awards(room):
 
     awards = [a for a in awards if a.is_valid_mode(mode_name)]
 
-    awards = [AwardInstance(a, room._players.to_iterator) for a in awards]
+    stats_table = room.stats_table()
+
+    awards = [AwardInstance(a, room._players.to_iterator, stats_table) for a in awards]
 
     awards = [a for a in awards if a.has_winner]
 
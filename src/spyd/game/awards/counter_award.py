@@ -0,0 +1,28 @@
+class CounterAward(object):
+    '''
+    Base for awards whose eligibility is a player counter above a threshold.
+
+    The rule is declared once, as eligible_counter and eligible_above, and both
+    the per client and the columnar methods are derived from it. Awards which
+    rank by a counter may also set stat_counter.
+    '''
+    eligible_counter = None
+    eligible_above = 0
+    stat_counter = None
+
+    @classmethod
+    def is_client_eligible(cls, client):
+        return getattr(client.state, cls.eligible_counter) > cls.eligible_above and not client.state.is_spectator
+
+    @classmethod
+    def get_eligible_column(cls, table):
+        return table.eligible(cls.eligible_counter, cls.eligible_above)
+
+    @classmethod
+    def get_stat_from_client(cls, client):
+        return getattr(client.state, cls.stat_counter)
+
+    @classmethod
+    def get_stat_column(cls, table):
+        return table.column(cls.stat_counter)
+
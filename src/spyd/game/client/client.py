@@ -18,7 +18,7 @@ from spyd.game.player.player import Player
 from spyd.game.room.exceptions import RoomEntryFailure
 from spyd.game.server_message_formatter import error, smf, denied, state_error, usage_error
 from spyd.permissions.functionality import Functionality
-from spyd.protocol import swh
+from spyd.protocol import swh, to_packet_data
 from spyd.utils.constrain import ConstraintViolation
 from spyd.utils.filtertext import filtertext
 from spyd.utils.ping_buffer import PingBuffer
@@ -170,13 +170,10 @@ class Client(object):
         return self._client_player_collection.player_iter()
 
     def send(self, channel, data, reliable, no_allocate=False):
-        if type(data) == memoryview:
-            data = data.tobytes()
-        elif type(data) == CubeDataStream:
-            data = memoryview(data.data).tobytes()
-        elif type(data) != str:
-            data = str(data)
-        self.protocol_wrapper.send(channel, data, reliable, no_allocate)
+        self.protocol_wrapper.send(channel, to_packet_data(data), reliable, no_allocate)
+
+    def send_shared(self, channel, shared_packet):
+        self.protocol_wrapper.send_shared(channel, shared_packet)
 
     @contextlib.contextmanager
     def sendbuffer(self, channel, reliable):
@@ -6,6 +6,10 @@ class ClientPermissions(object):
         self._permission_resolver = permission_resolver
         self._group_name_providers = []
 
+        # union of the providers whose group names do not change, rebuilt when a provider is added
+        self._static_group_names = frozenset()
+        self._dynamic_group_name_providers = []
+
     @property
     def privilege(self):
         group_names = self.get_group_names()
@@ -19,12 +23,18 @@ class ClientPermissions(object):
 
     def add_group_name_provider(self, group_name_provider):
         self._group_name_providers.append(group_name_provider)
+        if getattr(group_name_provider, 'dynamic', False):
+            self._dynamic_group_name_providers.append(group_name_provider)
+        else:
+            self._static_group_names = self._static_group_names.union(group_name_provider.get_group_names())
 
     def get_group_names(self):
-        group_names = set()
-        for group_name_provider in self._group_name_providers:
+        if not self._dynamic_group_name_providers:
+            return self._static_group_names
+        group_names = set(self._static_group_names)
+        for group_name_provider in self._dynamic_group_name_providers:
             group_names.update(group_name_provider.get_group_names())
-        return group_names
+        return frozenset(group_names)
 
     def allowed(self, functionality):
         group_names = self.get_group_names()
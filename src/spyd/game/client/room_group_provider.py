@@ -4,6 +4,9 @@ Returns 'local.room.master' group if the client is found in client.room.masters.
 Returns 'local.room.admin' group if the client is found in client.room.admins. 
 '''
 class RoomGroupProvider(object):
+    # group names change with the room state, so they are not cached by ClientPermissions
+    dynamic = True
+
     def __init__(self, client):
         self.client = client
 
@@ -2,6 +2,7 @@ from cube2common.constants import game_entity_types, RESETFLAGTIME, DMF
 from spyd.game.timing.expiry import Expiry
 from cube2common.vec import vec
 from spyd.game.map.flag import Flag
+from spyd.game.map.map_entity_lists import get_flag_list
 from spyd.game.map.team import Team
 from spyd.protocol import swh
 from spyd.game.gamemode.bases.teamplay_base import TeamplayBase, base_teams
@@ -22,12 +23,7 @@ class CtfBase(TeamplayBase):
         self.scores = [0, 0]
         
         if map_meta_data is not None:
-            flag_list = []
-            for ent in map_meta_data.get('ents', []):
-                if ent['type'] == game_entity_types.FLAG:
-                    flag_list.append({'x': int(ent['x']*DMF), 'y': int(ent['y']*DMF), 'z': int(ent['z']*DMF), 'team': ent['attrs'][1]})
-    
-            self._load_flag_list(flag_list)
+            self._load_flag_list(get_flag_list(map_meta_data))
 
     @property
     def got_flags(self):
@@ -1,6 +1,7 @@
 from spyd.protocol import swh
 from cube2common.constants import item_types
 from spyd.game.map.item import Item, UnusedItemSlot
+from spyd.game.map.map_entity_lists import get_item_list
 from spyd.game.gamemode.bases.mode_base import ModeBase
 
 # TODO: does not pickup
@@ -13,13 +14,7 @@ class ItemBase(ModeBase):
         self.items = None
 
         if map_meta_data is not None:
-            item_list = []
-            for ent in map_meta_data.get('ents', []):
-                if item_types.has_value(ent['type']):
-                    item_dict = {'item_type': ent['type'], 'item_index': ent['id']}
-                    item_list.append(item_dict)
-    
-            self._load_item_list(item_list)
+            self._load_item_list(get_item_list(map_meta_data))
             
         
     @property
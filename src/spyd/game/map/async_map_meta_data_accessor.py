@@ -1,60 +1,93 @@
-import pickle
 import os.path
-import sys
 
-from twisted.internet import defer, utils
-from spyd.utils.list_to_unicode import list_to_unicode
+from twisted.internet import defer, reactor
 
+from spyd.game.map.map_catalog import MapCatalog
+from spyd.game.map.map_data_worker_pool import MapDataWorkerPool
+from spyd.game.map.map_entity_lists import MapMetaData
 
-map_data_reader_filename = os.path.join(os.path.dirname(__file__), 'map_data_reader_process.py')
-
-def run_map_data_reader_process(args):
-    args.insert(0, map_data_reader_filename)
-    deferred = utils.getProcessOutput(sys.executable, args, env={'PYTHONPATH': os.environ.get('PYTHONPATH', '')})
-    deferred.addCallback(pickle.loads)
-    return deferred
-
-def get_map_names(map_glob_expression):
-    return run_map_data_reader_process(['-l', map_glob_expression])
-
-def get_map_data(map_path):
-    return run_map_data_reader_process(['-d', map_path])
 
 class AsyncMapMetaDataAccessor(object):
-    def __init__(self, package_dir):
+    def __init__(self, package_dir, worker_pool=None, map_catalog=None, catalog_save_delay=5.0):
         self.package_dir = package_dir
 
+        self._worker_pool = worker_pool or MapDataWorkerPool()
+
+        self._map_catalog = map_catalog or MapCatalog()
+        self._catalog_save_delay = catalog_save_delay
+        self._catalog_save_call = None
+
         self._cached_map_meta = {}
         self._map_name_cache = None
 
+        # map name: [deferred, ...] waiting on a read which is already in progress
+        self._pending_map_meta = {}
+
+    @property
+    def map_directory(self):
+        return os.path.join(self.package_dir, "base")
+
     def get_map_path(self, map_name):
         map_filename = "{}.ogz".format(map_name)
-        return os.path.join(self.package_dir, "base", map_filename)
+        return os.path.join(self.map_directory, map_filename)
 
     def get_map_data(self, map_name, default=None):
         if map_name in self._cached_map_meta:
             return defer.succeed(self._cached_map_meta.get(map_name))
-        else:
-            def cache_map_meta(map_meta_data):
-                self._cached_map_meta[map_name] = map_meta_data
-                return map_meta_data
 
-            deferred = get_map_data(self.get_map_path(map_name))
-            deferred.addCallback(cache_map_meta)
+        map_path = self.get_map_path(map_name)
 
+        catalog_entry = self._map_catalog.get(map_name, map_path)
+        if catalog_entry is not None:
+            map_meta_data = self._cached_map_meta[map_name] = MapMetaData(catalog_entry.meta_data)
+            return defer.succeed(map_meta_data)
+
+        deferred = defer.Deferred()
+
+        if map_name in self._pending_map_meta:
+            self._pending_map_meta[map_name].append(deferred)
             return deferred
 
-    def get_map_names(self):
-        if self._map_name_cache is not None:
-            return defer.succeed(self._map_name_cache)
-        else:
-            def cache_map_names(map_names):
-                self._map_name_cache = map_names
-                return self._map_name_cache
+        self._pending_map_meta[map_name] = [deferred]
 
-            map_glob_expression = os.path.join(self.package_dir, "base", "*.ogz")
+        def map_meta_read(map_meta_data):
+            if map_meta_data is not None:
+                # the catalog keeps the plain meta data, the cache also keeps the entity lists derived from it
+                self._map_catalog.update(map_name, map_path, map_meta_data)
+                self._schedule_catalog_save()
+                map_meta_data = MapMetaData(map_meta_data)
+            self._cached_map_meta[map_name] = map_meta_data
+            for waiting in self._pending_map_meta.pop(map_name):
+                waiting.callback(map_meta_data)
 
-            deferred = get_map_names(map_glob_expression)
-            deferred.addCallback(cache_map_names)
+        def map_meta_failed(failure):
+            for waiting in self._pending_map_meta.pop(map_name):
+                waiting.errback(failure)
 
-            return deferred
+        self._worker_pool.get_map_data(map_path).addCallbacks(map_meta_read, map_meta_failed)
+
+        return deferred
+
+    def get_map_names(self):
+        if self._map_name_cache is None:
+            self._map_name_cache = self._map_catalog.scan(self.map_directory)
+        return defer.succeed(self._map_name_cache)
+
+    def find_map_names(self, min_flags=0, min_bases=0):
+        "Returns the names of the catalogued maps with at least the given number of flags and bases."
+        return defer.succeed(self._map_catalog.find_map_names(min_flags, min_bases))
+
+    def _schedule_catalog_save(self):
+        if self._catalog_save_call is not None: return
+        self._catalog_save_call = reactor.callLater(self._catalog_save_delay, self._save_catalog)
+
+    def _save_catalog(self):
+        self._catalog_save_call = None
+        self._map_catalog.save()
+
+    def stop(self):
+        if self._catalog_save_call is not None:
+            self._catalog_save_call.cancel()
+            self._catalog_save_call = None
+        self._map_catalog.save()
+        self._worker_pool.stop()
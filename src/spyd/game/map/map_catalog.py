@@ -0,0 +1,141 @@
+import os
+import pickle
+import traceback
+
+from cube2common.constants import game_entity_types
+
+
+CATALOG_VERSION = 1
+
+class MapCatalogEntry(object):
+    __slots__ = ('path', 'mtime', 'size', 'meta_data', 'flag_count', 'base_count')
+
+    def __init__(self, path, mtime, size, meta_data):
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.meta_data = meta_data
+
+        ents = (meta_data or {}).get('ents', [])
+        self.flag_count = sum(1 for ent in ents if ent['type'] == game_entity_types.FLAG)
+        self.base_count = sum(1 for ent in ents if ent['type'] == game_entity_types.BASE)
+
+    def matches(self, path, stat_result):
+        return self.path == path and self.mtime == stat_result.st_mtime and self.size == stat_result.st_size
+
+    @property
+    def crc(self):
+        return (self.meta_data or {}).get('crc', 0)
+
+    @property
+    def worldsize(self):
+        return (self.meta_data or {}).get('worldsize', 0)
+
+    def __getstate__(self):
+        return (self.path, self.mtime, self.size, self.meta_data, self.flag_count, self.base_count)
+
+    def __setstate__(self, state):
+        self.path, self.mtime, self.size, self.meta_data, self.flag_count, self.base_count = state
+
+class MapCatalog(object):
+    '''
+    Persistent store of map meta data keyed by map name.
+
+    Each entry remembers the path, mtime and size of the map it was read from and
+    is ignored once the file changes. The whole catalog is read in one go by load
+    and written back by save. Without a catalog_path it is only kept in memory.
+    '''
+    def __init__(self, catalog_path=None):
+        self.catalog_path = catalog_path
+
+        # map name: MapCatalogEntry
+        self._entries = {}
+
+        # map name: os.stat_result of the maps found by the last scan, None until the first scan
+        self._scanned = None
+
+        self.dirty = False
+
+    def load(self):
+        if self.catalog_path is None: return
+        try:
+            with open(self.catalog_path, 'rb') as f:
+                version, entries = pickle.load(f)
+        except (IOError, OSError):
+            return
+        except:
+            print("Discarding unreadable map catalog {!r}.".format(self.catalog_path))
+            traceback.print_exc()
+            return
+
+        if version == CATALOG_VERSION:
+            self._entries = entries
+
+    def save(self):
+        if not self.dirty or self.catalog_path is None: return
+        temporary_path = "{}.tmp".format(self.catalog_path)
+        try:
+            with open(temporary_path, 'wb') as f:
+                pickle.dump((CATALOG_VERSION, self._entries), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self.catalog_path)
+            self.dirty = False
+        except (IOError, OSError) as e:
+            print("Could not save map catalog {!r}: {}".format(self.catalog_path, e))
+
+    def scan(self, map_directory):
+        "Lists the .ogz maps in the directory. Returns the map names."
+        scanned = {}
+        try:
+            for dir_entry in os.scandir(map_directory):
+                map_name, extension = os.path.splitext(dir_entry.name)
+                if extension == '.ogz' and dir_entry.is_file():
+                    scanned[map_name] = dir_entry.stat()
+        except (IOError, OSError):
+            pass
+        self._scanned = scanned
+        return list(scanned.keys())
+
+    def _stat(self, path):
+        try:
+            return os.stat(path)
+        except (IOError, OSError):
+            return None
+
+    def get(self, map_name, path):
+        "Returns the catalog entry for the map if it is current, otherwise None."
+        entry = self._entries.get(map_name)
+        if entry is None: return None
+
+        stat_result = self._stat(path)
+        if stat_result is None or not entry.matches(path, stat_result):
+            return None
+        return entry
+
+    def update(self, map_name, path, meta_data):
+        stat_result = self._stat(path)
+        if stat_result is None: return None
+
+        entry = MapCatalogEntry(path, stat_result.st_mtime, stat_result.st_size, meta_data)
+        self._entries[map_name] = entry
+        self.dirty = True
+        return entry
+
+    def entries(self):
+        """
+        Returns the map name and entry of each catalogued map which is unchanged.
+        Once the map directory has been scanned only the maps it contains are returned.
+        """
+        if self._scanned is None:
+            for map_name, entry in list(self._entries.items()):
+                stat_result = self._stat(entry.path)
+                if stat_result is not None and entry.matches(entry.path, stat_result):
+                    yield map_name, entry
+            return
+
+        for map_name, stat_result in self._scanned.items():
+            entry = self._entries.get(map_name)
+            if entry is not None and entry.mtime == stat_result.st_mtime and entry.size == stat_result.st_size:
+                yield map_name, entry
+
+    def find_map_names(self, min_flags=0, min_bases=0):
+        return [map_name for map_name, entry in self.entries() if entry.flag_count >= min_flags and entry.base_count >= min_bases]
@@ -1,27 +1,76 @@
 import glob
 import pickle
 import os
+import struct
 import sys
+import traceback
 
 from cube2map.read_map_meta_data import read_map_data
 
 
+frame_header = struct.Struct('!I')
+
 def map_filename_to_map_name(map_filename):
     return os.path.splitext(os.path.basename(map_filename))[0]
 
-if len(sys.argv) < 3 or sys.argv[1] not in ('-l', '-d'):
-    sys.exit(1)
+def read_map_names(map_glob_expression):
+    map_filenames = glob.glob(map_glob_expression)
+    return list(map(map_filename_to_map_name, map_filenames))
 
-if sys.argv[1] == '-d':
-    map_path = sys.argv[2]
+def read_map_data_if_exists(map_path):
     if os.path.exists(map_path):
-        result = read_map_data(map_path)
-        fp = os.fdopen(sys.stdout.fileno(), 'wb')
-        fp.write(pickle.dumps(result))
+        return read_map_data(map_path)
+    return None
 
-elif sys.argv[1] == '-l':
-    map_glob_expression = sys.argv[2]
-    map_filenames = glob.glob(map_glob_expression)
-    result = list(map(map_filename_to_map_name, map_filenames))
+commands = {
+    '-l': read_map_names,
+    '-d': read_map_data_if_exists,
+}
+
+def read_exactly(fp, n):
+    data = b''
+    while len(data) < n:
+        chunk = fp.read(n - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+def run_worker(stdin, stdout):
+    '''
+    Serves requests until stdin is closed. Each request and response is a pickle
+    prefixed with its length; requests are (command, argument) and responses are
+    (success, result or formatted exception).
+    '''
+    while True:
+        header = read_exactly(stdin, frame_header.size)
+        if header is None:
+            return
+        request = read_exactly(stdin, frame_header.unpack(header)[0])
+        if request is None:
+            return
+
+        command, argument = pickle.loads(request)
+        try:
+            response = (True, commands[command](argument))
+        except:
+            response = (False, traceback.format_exc())
+
+        data = pickle.dumps(response)
+        stdout.write(frame_header.pack(len(data)) + data)
+        stdout.flush()
+
+if __name__ == '__main__':
+    if len(sys.argv) == 2 and sys.argv[1] == '-w':
+        run_worker(os.fdopen(sys.stdin.fileno(), 'rb'), os.fdopen(sys.stdout.fileno(), 'wb'))
+        sys.exit(0)
+
+    if len(sys.argv) < 3 or sys.argv[1] not in commands:
+        sys.exit(1)
+
+    if sys.argv[1] == '-d' and not os.path.exists(sys.argv[2]):
+        sys.exit(0)
+
+    result = commands[sys.argv[1]](sys.argv[2])
     fp = os.fdopen(sys.stdout.fileno(), 'wb')
     fp.write(pickle.dumps(result))
@@ -0,0 +1,183 @@
+import collections
+import os
+import pickle
+import struct
+import sys
+
+from twisted.internet import defer, protocol, reactor
+from twisted.python.failure import Failure
+
+
+frame_header = struct.Struct('!I')
+
+map_data_reader_filename = os.path.join(os.path.dirname(__file__), 'map_data_reader_process.py')
+
+
+class WorkerError(Exception): pass
+class WorkerCrashed(WorkerError): pass
+class WorkerPoolStopped(WorkerError): pass
+
+class _Request(object):
+    __slots__ = ('command', 'argument', 'deferred')
+
+    def __init__(self, command, argument):
+        self.command = command
+        self.argument = argument
+        self.deferred = defer.Deferred()
+
+class MapDataWorkerProtocol(protocol.ProcessProtocol):
+    '''Talks to one map data reader worker process. Only one request is in flight at a time.'''
+    def __init__(self, pool):
+        self._pool = pool
+        self._buffer = b''
+        self.request = None
+        self.timeout_call = None
+        self.ended = False
+
+    def send_request(self, request):
+        self.request = request
+        data = pickle.dumps((request.command, request.argument))
+        self.transport.write(frame_header.pack(len(data)) + data)
+
+    def outReceived(self, data):
+        self._buffer += data
+        while len(self._buffer) >= frame_header.size:
+            length = frame_header.unpack_from(self._buffer)[0]
+            end = frame_header.size + length
+            if len(self._buffer) < end:
+                return
+            response = self._buffer[frame_header.size:end]
+            self._buffer = self._buffer[end:]
+            self._pool._response_received(self, pickle.loads(response))
+
+    def errReceived(self, data):
+        sys.stderr.write(data.decode('utf-8', 'replace'))
+
+    def processEnded(self, reason):
+        self.ended = True
+        self._pool._worker_ended(self, reason)
+
+    def kill(self):
+        if self.ended: return
+        try:
+            self.transport.signalProcess('KILL')
+        except Exception:
+            pass
+
+class MapDataWorkerPool(object):
+    '''
+    A pool of long lived map data reader processes.
+
+    Requests are queued and handed to idle workers, so at most size maps are
+    read at once. A worker which dies is replaced and a request which takes
+    longer than timeout seconds fails with a defer.TimeoutError and its worker
+    is restarted.
+    '''
+    def __init__(self, size=2, timeout=30.0, reactor=reactor):
+        self._reactor = reactor
+        self.size = size
+        self.timeout = timeout
+
+        self._workers = set()
+        self._idle_workers = []
+        self._queue = collections.deque()
+
+        self.restarts = 0
+        self._stopping = False
+
+    @property
+    def worker_count(self):
+        return len(self._workers)
+
+    @property
+    def queued_count(self):
+        return len(self._queue)
+
+    def submit(self, command, argument):
+        "Returns a deferred which fires with the result of running the command in a worker."
+        if self._stopping:
+            return defer.fail(WorkerPoolStopped("Map data worker pool stopped before reading {!r}.".format(argument)))
+        request = _Request(command, argument)
+        self._queue.append(request)
+        self._dispatch()
+        return request.deferred
+
+    def get_map_names(self, map_glob_expression):
+        return self.submit('-l', map_glob_expression)
+
+    def get_map_data(self, map_path):
+        return self.submit('-d', map_path)
+
+    def stop(self):
+        "Lets the workers finish their current request and fails the queued ones."
+        self._stopping = True
+        for worker in list(self._workers):
+            worker.transport.closeStdin()
+        while self._queue:
+            request = self._queue.popleft()
+            request.deferred.errback(WorkerPoolStopped("Map data worker pool stopped before reading {!r}.".format(request.argument)))
+
+    def _spawn_worker(self):
+        worker = MapDataWorkerProtocol(self)
+        args = [sys.executable, map_data_reader_filename, '-w']
+        self._reactor.spawnProcess(worker, sys.executable, args, env={'PYTHONPATH': os.environ.get('PYTHONPATH', '')})
+        self._workers.add(worker)
+        self._idle_workers.append(worker)
+
+    def _dispatch(self):
+        while self._queue and not self._stopping:
+            if not self._idle_workers:
+                if len(self._workers) >= self.size:
+                    return
+                self._spawn_worker()
+
+            worker = self._idle_workers.pop()
+            request = self._queue.popleft()
+            worker.send_request(request)
+            if self.timeout is not None:
+                worker.timeout_call = self._reactor.callLater(self.timeout, self._request_timed_out, worker)
+
+    def _finish_request(self, worker):
+        request = worker.request
+        worker.request = None
+        if worker.timeout_call is not None:
+            if worker.timeout_call.active():
+                worker.timeout_call.cancel()
+            worker.timeout_call = None
+        return request
+
+    def _response_received(self, worker, response):
+        request = self._finish_request(worker)
+        self._idle_workers.append(worker)
+
+        success, result = response
+        if success:
+            request.deferred.callback(result)
+        else:
+            request.deferred.errback(WorkerError(result))
+
+        self._dispatch()
+
+    def _request_timed_out(self, worker):
+        worker.timeout_call = None
+        request = self._finish_request(worker)
+        self._remove_worker(worker)
+        worker.kill()
+        request.deferred.errback(defer.TimeoutError("Map data request {!r} timed out.".format(request.argument)))
+        self._dispatch()
+
+    def _worker_ended(self, worker, reason):
+        if worker not in self._workers:
+            return
+        request = self._finish_request(worker)
+        self._remove_worker(worker)
+        if request is not None:
+            request.deferred.errback(Failure(WorkerCrashed("Map data worker exited while reading {!r}: {}".format(request.argument, reason.getErrorMessage()))))
+        self._dispatch()
+
+    def _remove_worker(self, worker):
+        self._workers.discard(worker)
+        if worker in self._idle_workers:
+            self._idle_workers.remove(worker)
+        if not self._stopping:
+            self.restarts += 1
@@ -0,0 +1,51 @@
+from cube2common.constants import game_entity_types, item_types, DMF
+
+
+class MapMetaData(dict):
+    '''
+    Map meta data as cached by the map meta data accessor.
+
+    The item and flag lists of the map are derived on first use and kept with the
+    meta data, so they live exactly as long as the accessor caches the map.
+    '''
+    __slots__ = ('entity_lists',)
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        # (item list, flag list)
+        self.entity_lists = None
+
+_no_entity_lists = ([], [])
+
+def _build_entity_lists(map_meta_data):
+    item_list = []
+    flag_list = []
+    for ent in map_meta_data.get('ents', []):
+        if item_types.has_value(ent['type']):
+            item_list.append({'item_type': ent['type'], 'item_index': ent['id']})
+        elif ent['type'] == game_entity_types.FLAG:
+            flag_list.append({'x': int(ent['x']*DMF), 'y': int(ent['y']*DMF), 'z': int(ent['z']*DMF), 'team': ent['attrs'][1]})
+    return item_list, flag_list
+
+def _get_entity_lists(map_meta_data):
+    if not map_meta_data.get('ents'):
+        return _no_entity_lists
+
+    if not isinstance(map_meta_data, MapMetaData):
+        return _build_entity_lists(map_meta_data)
+
+    if map_meta_data.entity_lists is None:
+        map_meta_data.entity_lists = _build_entity_lists(map_meta_data)
+    return map_meta_data.entity_lists
+
+def get_item_list(map_meta_data):
+    "Returns the item entities of the map. The list may be shared and must not be modified."
+    return _get_entity_lists(map_meta_data)[0]
+
+def get_flag_list(map_meta_data):
+    "Returns the flag entities of the map. The list may be shared and must not be modified."
+    return _get_entity_lists(map_meta_data)[1]
+
+def warm_entity_lists(map_meta_data):
+    if map_meta_data is not None:
+        _get_entity_lists(map_meta_data)
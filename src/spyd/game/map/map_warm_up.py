@@ -0,0 +1,74 @@
+import time
+
+from twisted.internet import defer
+
+
+def collect_map_names(map_rotations, map_lists=()):
+    "Returns the sorted names of every map referenced by the rotations and map lists."
+    map_names = set()
+    for map_rotation in map_rotations:
+        for rotation_map_names in map_rotation.map_rotation_dict.values():
+            map_names.update(rotation_map_names)
+    for map_list in map_lists:
+        map_names.update(map_list)
+    return sorted(map_names)
+
+class MapWarmUpReport(object):
+    def __init__(self):
+        # map name: seconds taken to read the map
+        self.timings = {}
+
+        # map name: reason the map could not be read
+        self.bad_maps = {}
+
+        self.elapsed = 0.0
+
+    def format_lines(self, slowest=10):
+        lines = ["Warmed up {} maps in {:.2f} seconds.".format(len(self.timings), self.elapsed)]
+        for map_name, seconds in sorted(self.timings.items(), key=lambda item: item[1], reverse=True)[:slowest]:
+            lines.append("    {:.3f}s {}".format(seconds, map_name))
+        if self.bad_maps:
+            lines.append("Could not read {} maps:".format(len(self.bad_maps)))
+            for map_name in sorted(self.bad_maps):
+                lines.append("    {}: {}".format(map_name, self.bad_maps[map_name]))
+        return lines
+
+class MapWarmUp(object):
+    '''
+    Reads the meta data of a set of maps into the accessor cache.
+
+    At most concurrency maps are requested at once so that each timing covers
+    the read itself rather than time spent queued for a worker.
+    '''
+    def __init__(self, map_meta_data_accessor, concurrency=2):
+        self._map_meta_data_accessor = map_meta_data_accessor
+        self._semaphore = defer.DeferredSemaphore(max(1, concurrency))
+
+    def warm_up(self, map_names):
+        "Returns a deferred which fires with a MapWarmUpReport once every map has been read or failed."
+        report = MapWarmUpReport()
+        start_time = time.perf_counter()
+
+        deferreds = [self._semaphore.run(self._read_map, map_name, report) for map_name in map_names]
+
+        def finished(_):
+            report.elapsed = time.perf_counter() - start_time
+            return report
+
+        return defer.gatherResults(deferreds).addCallback(finished)
+
+    def _read_map(self, map_name, report):
+        map_start_time = time.perf_counter()
+
+        def map_meta_read(map_meta_data):
+            if map_meta_data is None:
+                report.bad_maps[map_name] = "not found"
+            else:
+                report.timings[map_name] = time.perf_counter() - map_start_time
+
+        def map_meta_failed(failure):
+            # worker errors carry a whole traceback, the last line names the exception
+            message_lines = failure.getErrorMessage().strip().splitlines() or [failure.type.__name__]
+            report.bad_maps[map_name] = message_lines[-1]
+
+        return self._map_meta_data_accessor.get_map_data(map_name).addCallbacks(map_meta_read, map_meta_failed)
@@ -13,7 +13,11 @@ class Player(object):
     def __init__(self, client, playernum, name, playermodel):
         self.client = client
         self._pn = playernum
-        self.name = ''.join(name)
+
+        # The PlayerCollection which indexes this player by name and team
+        self.collection = None
+
+        self._name = ''.join(name)
         self.playermodel = playermodel
         self._team = NullTeam()
         self._isai = False
@@ -23,6 +27,9 @@ class Player(object):
 
         self._state = PlayerState()
 
+        # (room flush count, send ips, encoded ext info stats) kept by the LanInfoResponder
+        self.ext_info_stats = None
+
     @property
     def cn(self):
         return self._pn
@@ -56,13 +63,27 @@ class Player(object):
     def room(self):
         return self.client.room
 
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        old_name = self._name
+        self._name = name
+        if self.collection is not None:
+            self.collection.on_player_renamed(self, old_name)
+
     @property
     def team(self):
         return self._team
 
     @team.setter
     def team(self, team):
+        old_team = self._team
         self._team = team or NullTeam()
+        if self.collection is not None:
+            self.collection.on_player_team_changed(self, old_team)
 
     @property
     def team_name(self):
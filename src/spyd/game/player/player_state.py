@@ -1,3 +1,5 @@
+from array import array
+
 from cube2common.constants import client_states, weapon_types, armor_types, item_types, itemstats
 from cube2common.vec import vec
 from cube2protocol.cube_data_stream import CubeDataStream
@@ -7,11 +9,55 @@ from spyd.game.timing.timer import Timer
 from spyd.protocol import swh
 
 
+# Indexes into PlayerState._counters
+FRAGS, DEATHS, SUICIDES, TEAMKILLS, DAMAGE_DEALT, DAMAGE_SPENT, FLAGS, FLAG_RETURNS, HEALTH, MAXHEALTH, ARMOUR, ARMOURTYPE, GUNSELECT = range(13)
+
+counter_names = ('frags', 'deaths', 'suicides', 'teamkills', 'damage_dealt', 'damage_spent', 'flags', 'flag_returns',
+                 'health', 'maxhealth', 'armour', 'armourtype', 'gunselect')
+
+initial_counters = array('i', [0, 0, 0, 0, 0, 0, 0, 0, 100, 100, 0, armor_types.A_BLUE, weapon_types.GUN_PISTOL])
+initial_ammo = array('i', [0] * weapon_types.NUMGUNS)
+
+def _counter_property(index):
+    def get_counter(self):
+        return self._counters[index]
+
+    def set_counter(self, value):
+        self._counters[index] = value
+
+    return property(get_counter, set_counter)
+
 class PlayerState(object):
+    __slots__ = ('game_clock', 'messages', '_state', 'spectator_listener', 'lifesequence', '_counters', '_ammo', 'playing_timer', 'death_timer',
+                 'pos', '_quadexpiry', 'shotwait', 'spawnwait', '_pending_spawn', 'rockets', 'grenades', 'position')
+
+    frags = _counter_property(FRAGS)
+    deaths = _counter_property(DEATHS)
+    suicides = _counter_property(SUICIDES)
+    teamkills = _counter_property(TEAMKILLS)
+    damage_dealt = _counter_property(DAMAGE_DEALT)
+    damage_spent = _counter_property(DAMAGE_SPENT)
+    flags = _counter_property(FLAGS)
+    flag_returns = _counter_property(FLAG_RETURNS)
+    health = _counter_property(HEALTH)
+    maxhealth = _counter_property(MAXHEALTH)
+    armour = _counter_property(ARMOUR)
+    armourtype = _counter_property(ARMOURTYPE)
+    gunselect = _counter_property(GUNSELECT)
+
     def __init__(self):
         self.game_clock = None
         self.messages = CubeDataStream()
-        self.state = -1
+
+        # Called with the new value whenever the player starts or stops spectating
+        self.spectator_listener = None
+        self._state = -1
+        self._counters = array('i', initial_counters)
+        self._ammo = array('i', initial_ammo)
+        self.playing_timer = None
+        self.pos = vec(0, 0, 0)
+        self.rockets = {}
+        self.grenades = {}
         self.reset()
 
     def use_game_clock(self, game_clock):
@@ -57,6 +103,20 @@ class PlayerState(object):
             return self.spawnwait.is_expired
         return True
 
+    @property
+    def counters(self):
+        "The counters in the order of counter_names. Read only, use the named properties to change them."
+        return self._counters
+
+    @property
+    def ammo(self):
+        return self._ammo
+
+    @ammo.setter
+    def ammo(self, ammo):
+        # Copied into the fixed array so it stays the one the player owns, truncated like putint does
+        self._ammo[:] = array('i', map(int, ammo))
+
     @property
     def kpd(self):
         return KPD(self.frags, self.deaths)
@@ -90,9 +150,20 @@ class PlayerState(object):
         else:
             return 0.0
 
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, state):
+        was_spectator = self._state == client_states.CS_SPECTATOR
+        self._state = state
+        if self.spectator_listener is not None and was_spectator != (state == client_states.CS_SPECTATOR):
+            self.spectator_listener(not was_spectator)
+
     @property
     def is_alive(self):
-        return self.state == client_states.CS_ALIVE
+        return self._state == client_states.CS_ALIVE
 
     @property
     def millis_since_death(self):
@@ -109,7 +180,7 @@ class PlayerState(object):
 
     @property
     def is_spectator(self):
-        return self.state == client_states.CS_SPECTATOR
+        return self._state == client_states.CS_SPECTATOR
 
     @is_spectator.setter
     def is_spectator(self, value):
@@ -143,46 +214,37 @@ class PlayerState(object):
         self.pos.v = position
 
     def clear_flushed_state(self):
-        self.messages = CubeDataStream()
+        # The flushed messages have already been copied into the room buffer
+        del self.messages.data[:]
         self.position = None
 
     def map_change_reset(self):
         if self.state != client_states.CS_SPECTATOR:
             self.state = client_states.CS_DEAD
 
-        self.frags = 0
-        self.deaths = 0
-        self.suicides = 0
-        self.teamkills = 0
-        self.damage_dealt = 0
-        self.damage_spent = 0
-        self.flags = 0
-        self.flag_returns = 0
-        self.health = 100
-        self.maxhealth = 100
-        self.armour = 0
-        self.armourtype = armor_types.A_BLUE
-        self.gunselect = weapon_types.GUN_PISTOL
-        self.ammo = [0] * weapon_types.NUMGUNS
+        self._counters[:] = initial_counters
+        self._ammo[:] = initial_ammo
 
-        if self.game_clock is not None:
-            self.playing_timer = Timer(self.game_clock)
-        else:
+        if self.game_clock is None:
             self.playing_timer = None
+        elif self.playing_timer is not None and self.playing_timer.game_clock is self.game_clock:
+            self.playing_timer.reset()
+        else:
+            self.playing_timer = Timer(self.game_clock)
 
         self.death_timer = None
 
-        self.pos = vec(0, 0, 0)
+        self.pos.v = [0, 0, 0]
 
         self._quadexpiry = None
         self.shotwait = None
         self.spawnwait = None
         self._pending_spawn = False
 
-        self.rockets = {}
-        self.grenades = {}
+        self.rockets.clear()
+        self.grenades.clear()
 
-        self.messages.clear()
+        del self.messages.data[:]
         self.position = None
 
     def reset(self):
@@ -1,7 +1,7 @@
 import contextlib
 
 from cube2protocol.cube_data_stream import CubeDataStream
-from spyd.game.player.player import Player
+from spyd.protocol import SharedPacket
 
 
 class ClientCollection(object):
@@ -9,12 +9,23 @@ class ClientCollection(object):
         # cn: client
         self._clients = {}
 
+        # client or player: client
+        self._exclusion_index = {}
+
     def add(self, client):
         self._clients[client.cn] = client
 
+        self._exclusion_index[client] = client
+        for player in client.player_iter():
+            self._exclusion_index[player] = client
+
     def remove(self, client):
         del self._clients[client.cn]
 
+        self._exclusion_index.pop(client, None)
+        for player in client.player_iter():
+            self._exclusion_index.pop(player, None)
+
     @property
     def count(self):
         return len(self._clients)
@@ -28,15 +39,27 @@ class ClientCollection(object):
     def by_cn(self, cn):
         return self._clients[cn]
 
+    def _excluded_clients(self, exclude):
+        "Resolves a collection of clients and players to the set of clients which should not receive a broadcast."
+        exclusion_index = self._exclusion_index
+        excluded = set()
+        for v in exclude:
+            client = exclusion_index.get(v)
+            if client is None:
+                # Not in this collection; players refer to their owning client
+                client = getattr(v, 'client', v)
+            excluded.add(client)
+        return excluded
+
     def broadcast(self, channel, data, reliable=False, exclude=None, clients=None):
         clients = clients or iter(self._clients.values())
-        exclude = set(exclude or ())
-        for v in tuple(exclude):
-            if isinstance(v, Player):
-                exclude.add(v.client)
+        excluded = self._excluded_clients(exclude) if exclude else ()
+
+        shared_packet = SharedPacket(data, reliable)
+
         for client in clients:
-            if not client in exclude:
-                client.send(channel, data, reliable)
+            if not client in excluded:
+                client.send_shared(channel, shared_packet)
 
     @contextlib.contextmanager
     def broadcastbuffer(self, channel, reliable=False, exclude=[], clients=None):
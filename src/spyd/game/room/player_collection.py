@@ -3,16 +3,45 @@ class PlayerCollection(object):
         #pn: player
         self._players = {}
 
+        # team name: {player: None}, kept up to date as players change team
+        self._team_index = {}
+
+        # name: number of players using it
+        self._name_counts = {}
+
+        self._spectator_count = 0
+
     def add(self, player):
         self._players[player.pn] = player
 
+        self._index_team(player, player.team)
+        self._name_counts[player.name] = self._name_counts.get(player.name, 0) + 1
+        if player.state.is_spectator:
+            self._spectator_count += 1
+
+        player.collection = self
+        player.state.spectator_listener = self._on_spectator_changed
+
     def remove(self, player):
         del self._players[player.pn]
 
+        self._unindex_team(player, player.team)
+        self._uncount_name(player.name)
+        if player.state.is_spectator:
+            self._spectator_count -= 1
+
+        if player.collection is self:
+            player.collection = None
+            player.state.spectator_listener = None
+
     @property
     def count(self):
         return len(self._players)
 
+    @property
+    def playing_count(self):
+        return len(self._players) - self._spectator_count
+
     def to_list(self):
         return list(self._players.values())
 
@@ -20,24 +49,42 @@ class PlayerCollection(object):
         return iter(self._players.values())
 
     def by_team(self):
-        from itertools import groupby
-        from spyd.utils.groupby_utils import unroll_group
-
-        team_of = lambda p: p.team
+        return {next(iter(players)).team: list(players) for players in self._team_index.values()}
 
-        return dict(map(unroll_group,
-                        groupby(sorted(self.to_iterator(),
-                                       key=lambda p: team_of(p).name),
-                                key=team_of)))
+    def teams(self):
+        "Returns a dictionary of team name: (team, players)."
+        return {team_name: (next(iter(players)).team, list(players)) for team_name, players in self._team_index.items()}
 
     def by_pn(self, pn):
         return self._players[pn]
 
     def is_name_duplicate(self, name):
-        name_count = 0
-        for player in self._players.values():
-            if player.name == name:
-                name_count += 1
-                if name_count > 1:
-                    return True
-        return False
+        return self._name_counts.get(name, 0) > 1
+
+    def on_player_renamed(self, player, old_name):
+        self._uncount_name(old_name)
+        self._name_counts[player.name] = self._name_counts.get(player.name, 0) + 1
+
+    def on_player_team_changed(self, player, old_team):
+        self._unindex_team(player, old_team)
+        self._index_team(player, player.team)
+
+    def _on_spectator_changed(self, is_spectator):
+        self._spectator_count += 1 if is_spectator else -1
+
+    def _index_team(self, player, team):
+        self._team_index.setdefault(team.name, {})[player] = None
+
+    def _unindex_team(self, player, team):
+        players = self._team_index.get(team.name)
+        if players is None: return
+        players.pop(player, None)
+        if not players:
+            del self._team_index[team.name]
+
+    def _uncount_name(self, name):
+        name_count = self._name_counts.get(name, 0) - 1
+        if name_count > 0:
+            self._name_counts[name] = name_count
+        else:
+            self._name_counts.pop(name, None)
@@ -1,7 +1,7 @@
 import math
 import traceback
 
-from twisted.internet import reactor, defer
+from twisted.internet import defer
 
 from cube2common.constants import MAXROOMLEN, MAXSERVERDESCLEN, MAXSERVERLEN, mastermodes, privileges
 from cube2demo.no_op_demo_recorder import NoOpDemoRecorder
@@ -15,6 +15,7 @@ from spyd.game.room.room_broadcaster import RoomBroadcaster
 from spyd.game.room.room_demo_recorder import RoomDemoRecorder
 from spyd.game.room.room_entry_context import RoomEntryContext
 from spyd.game.room.room_map_mode_state import RoomMapModeState
+from spyd.game.room.room_stats import RoomStatsTable
 from spyd.game.server_message_formatter import smf
 from spyd.game.timing.game_clock import GameClock
 from spyd.permissions.functionality import Functionality
@@ -33,7 +34,7 @@ class Room(object):
     * Accessors to query the state of the room.
     * Setters to modify the state of the room.
     '''
-    def __init__(self, ready_up_controller_factory, metrics_service=None, room_name=None, room_manager=None, server_name_model=None, map_rotation=None, map_meta_data_accessor=None, command_executer=None, event_subscription_fulfiller=None, maxplayers=None, show_awards=True, demo_recorder=None):
+    def __init__(self, ready_up_controller_factory, metrics_service=None, room_name=None, room_manager=None, server_name_model=None, map_rotation=None, map_meta_data_accessor=None, command_executer=None, event_subscription_fulfiller=None, maxplayers=None, show_awards=True, demo_recorder=None, tick_scheduler=None, tick_rate=None):
         self._game_clock = GameClock()
         self._attach_game_clock_event_handlers()
 
@@ -45,6 +46,7 @@ class Room(object):
         self._name = ValueModel(room_name or "1234567")
         self._server_name_model.observe(self._on_name_changed)
         self._name.observe(self._on_name_changed)
+        self._lan_info_name = None
 
         self._flush_positions_execution_timer = ExecutionTimer(self._metrics_service, 'room.{}.flush_positions'.format(self.name), 1.0)
 
@@ -74,6 +76,9 @@ class Room(object):
 
         self.last_destination_room = None
 
+        # Incremented every tick, lets per tick caches like the ext info blobs tell when they are stale
+        self.flush_count = 0
+
         # Holds the client objects with each level of permissions
         self.masters = set()
         self.auths = set()
@@ -87,7 +92,12 @@ class Room(object):
         self._map_mode_state = RoomMapModeState(self, map_rotation, map_meta_data_accessor, self._game_clock, ready_up_controller_factory)
 
         self._broadcaster = RoomBroadcaster(self._clients, self._players, self.demo_recorder)
-        reactor.addSystemEventTrigger('before', 'flush_bindings', self._flush_messages)
+
+        # Rooms without clients hibernate; they are not ticked and their game clock is frozen
+        self._tick_scheduler = tick_scheduler
+        self._tick_rate = tick_rate
+        self._hibernating = True
+        self._pending_entries = 0
 
     ###########################################################################
     #######################        Accessors        ###########################
@@ -106,9 +116,10 @@ class Room(object):
 
     @property
     def lan_info_name(self):
-        server_name = truncate(self._server_name_model.value, MAXSERVERLEN)
-        room_title = smf.format("{server_name} #{room.name}", room=self, server_name=server_name)
-        return room_title
+        if self._lan_info_name is None:
+            server_name = truncate(self._server_name_model.value, MAXSERVERLEN)
+            self._lan_info_name = smf.format("{server_name} #{room.name}", room=self, server_name=server_name)
+        return self._lan_info_name
 
     def get_entry_context(self, client, player):
         '''
@@ -130,7 +141,7 @@ class Room(object):
     @property
     def teams_size(self):
         from spyd.game.gamemode.bases.teamplay_base import base_teams
-        teams = {team.name: (len(players), team, players) for team, players in self._players.by_team().items()}
+        teams = {team_name: (len(players), team, players) for team_name, (team, players) in self._players.teams().items()}
 
         # add base teams
         if 'good' not in teams:
@@ -143,11 +154,7 @@ class Room(object):
 
     @property
     def playing_count(self):
-        count = 0
-        for player in self.players:
-            if not player.state.is_spectator:
-                count += 1
-        return count
+        return self._players.playing_count
 
     @property
     def player_count(self):
@@ -163,6 +170,10 @@ class Room(object):
     def get_player(self, pn):
         return self._players.by_pn(pn)
 
+    @property
+    def is_hibernating(self):
+        return self._hibernating
+
     @property
     def is_paused(self):
         return self._game_clock.is_paused
@@ -187,6 +198,12 @@ class Room(object):
     def gamemillis(self):
         return int(self._game_clock.time_elapsed * 1000)
 
+    def time_snapshot(self):
+        return self._game_clock.time_snapshot()
+
+    def stats_table(self):
+        return RoomStatsTable(self._players.to_iterator())
+
     @property
     def gamemode(self):
         return self._map_mode_state.gamemode
@@ -222,27 +239,37 @@ class Room(object):
 
     @defer.inlineCallbacks
     def client_enter(self, entry_context):
-        yield self.await_map_mode_initialized()
+        self._wake()
+        self._pending_entries += 1
 
-        client = entry_context.client
-        player = client.get_player()
+        try:
+            yield self.await_map_mode_initialized()
 
-        player.state.use_game_clock(self._game_clock)
+            client = entry_context.client
+            player = client.get_player()
 
-        self._initialize_client(client)
-        self._broadcaster.client_connected(client)
+            player.state.use_game_clock(self._game_clock)
 
-        self._clients.add(client)
-        self._players.add(player)
+            self._initialize_client(client)
+            self._broadcaster.client_connected(client)
 
-        if not client.host in self._client_ips:
-            self._client_ips[client.host] = set()
-        self._client_ips[client.host].add(client)
+            self._clients.add(client)
+            self._players.add(player)
 
-        if client in self.admins or client in self.masters or client in self.auths:
-            self._update_current_masters()
+            if not client.host in self._client_ips:
+                self._client_ips[client.host] = set()
+                self.manager.on_room_client_ip_added(self, client.host)
+            self._client_ips[client.host].add(client)
 
-        self.gamemode.on_player_connected(player)
+            if client in self.admins or client in self.masters or client in self.auths:
+                self._update_current_masters()
+
+            self.gamemode.on_player_connected(player)
+        finally:
+            self._pending_entries -= 1
+            # an entry which failed may have woken the room for nobody
+            if self._clients.count == 0 and self._pending_entries == 0:
+                self._hibernate()
 
     def client_leave(self, client):
         self._clients.remove(client)
@@ -258,6 +285,7 @@ class Room(object):
         clients_with_ip.discard(client)
         if len(clients_with_ip) == 0:
             del self._client_ips[client.host]
+            self.manager.on_room_client_ip_removed(self, client.host)
 
         with client.sendbuffer(1, True) as cds:
             for remaining_client in self._clients.to_iterator():
@@ -267,6 +295,9 @@ class Room(object):
 
         self.manager.on_room_player_count_changed(self)
 
+        if self._clients.count == 0:
+            self._hibernate()
+
     def pause(self):
         self._game_clock.pause()
 
@@ -308,6 +339,11 @@ class Room(object):
     def server_message(self, message, exclude=()):
         self._broadcaster.server_message(message, exclude)
 
+    def flush_messages(self):
+        self.flush_count += 1
+        with self._flush_positions_execution_timer.measure(), self._game_clock.time_snapshot():
+            self._broadcaster.flush_messages()
+
     ###########################################################################
     #######################  Client event handling  ###########################
     ###########################################################################
@@ -375,12 +411,6 @@ class Room(object):
     #######################  Other private methods  ###########################
     ###########################################################################
 
-    def _flush_messages(self):
-        if not self.decommissioned:
-            reactor.callLater(0, reactor.addSystemEventTrigger, 'before', 'flush_bindings', self._flush_messages)
-        with self._flush_positions_execution_timer.measure():
-            self._broadcaster.flush_messages()
-
     def _initialize_client_match_data(self, cds, client):
         player = client.get_player()
 
@@ -419,6 +449,23 @@ class Room(object):
             swh.put_initclients(cds, existing_players)
             swh.put_resume(cds, existing_players)
 
+    def _wake(self):
+        if not self._hibernating: return
+        self._hibernating = False
+
+        if self._tick_scheduler is not None:
+            self._tick_scheduler.add_room(self, self._tick_rate)
+        self._game_clock.thaw()
+
+    def _hibernate(self):
+        if self._hibernating: return
+        self._hibernating = True
+
+        self._game_clock.freeze()
+        if self._tick_scheduler is not None:
+            self._tick_scheduler.remove_room(self)
+        self._flush_positions_execution_timer.stop()
+
     def _player_disconnected(self, player):
         self._players.remove(player)
         self._broadcaster.player_disconnected(player)
@@ -438,6 +485,7 @@ class Room(object):
             self._put_room_title(cds, client)
 
     def _on_name_changed(self, *args):
+        self._lan_info_name = None
         for client in self.clients:
             self._send_room_title(client)
 
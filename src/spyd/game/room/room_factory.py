@@ -11,7 +11,7 @@ class RoomFactory(object):
     If a room type is specified the room will be initialized according to that registered room type if it exists.
     Otherwise it will be initialized with the default settings.
     """
-    def __init__(self, config, room_manager, server_name_model, map_meta_data_accessor, command_executer, event_subscription_fulfiller, metrics_service):
+    def __init__(self, config, room_manager, server_name_model, map_meta_data_accessor, command_executer, event_subscription_fulfiller, metrics_service, tick_scheduler=None):
         self.config = config
         self.room_manager = room_manager
         self.room_manager.set_factory(self)
@@ -23,6 +23,7 @@ class RoomFactory(object):
         self.command_executer = command_executer
         self.event_subscription_fulfiller = event_subscription_fulfiller
         self.metrics_service = metrics_service
+        self.tick_scheduler = tick_scheduler
 
     def get_room_config(self, name, room_type='default'):
         room_config = {}
@@ -30,6 +31,12 @@ class RoomFactory(object):
         room_config.update(self.room_bindings.get(name, {}))
         return room_config
 
+    def get_map_rotations(self):
+        "Returns the map rotation of each configured room binding and room type."
+        room_configs = [self.get_room_config(name, binding.get('type', 'permanent')) for name, binding in self.room_bindings.items()]
+        room_configs.extend(self.get_room_config(None, room_type) for room_type in self.room_types)
+        return [MapRotation.from_dictionary(room_config.get('map_rotation', test_rotation_dict)) for room_config in room_configs]
+
     def build_room(self, name, room_type='default', map_rotation=None):
         room_config = self.get_room_config(name, room_type)
 
@@ -53,7 +60,9 @@ class RoomFactory(object):
                     event_subscription_fulfiller=self.event_subscription_fulfiller,
                     maxplayers=maxplayers,
                     metrics_service=self.metrics_service,
-                    demo_recorder=demo_recorder)
+                    demo_recorder=demo_recorder,
+                    tick_scheduler=self.tick_scheduler,
+                    tick_rate=room_config.get('tick_rate'))
 
         self.room_manager.add_room(room)
 
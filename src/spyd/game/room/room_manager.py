@@ -7,6 +7,9 @@ class RoomManager(object):
     def __init__(self):
         self.rooms = {}
         self.room_factory = None
+
+        # client ip: {room: None} of the rooms with a client connected from that ip
+        self._rooms_by_client_ip = {}
         
     def set_factory(self, room_factory):
         self.room_factory = room_factory
@@ -23,12 +26,23 @@ class RoomManager(object):
 
     def on_room_player_count_changed(self, room):
         if room.empty and room.temporary:
+            room.decommissioned = True
             del self.rooms[room.name]
 
+    def on_room_client_ip_added(self, room, client_ip):
+        self._rooms_by_client_ip.setdefault(client_ip, {})[room] = None
+
+    def on_room_client_ip_removed(self, room, client_ip):
+        rooms = self._rooms_by_client_ip.get(client_ip)
+        if rooms is None: return
+        rooms.pop(room, None)
+        if not rooms:
+            del self._rooms_by_client_ip[client_ip]
+
     def find_room_for_client_ip(self, client_ip):
-        for room in list(self.rooms.values()):
-            if room.contains_client_with_ip(client_ip):
-                return room
+        rooms = self._rooms_by_client_ip.get(client_ip)
+        if rooms:
+            return next(iter(rooms))
 
     @staticmethod
     def client_change_room(client, target_room, announce_follow=True):
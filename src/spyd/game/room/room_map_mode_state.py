@@ -3,11 +3,15 @@ from twisted.internet import defer
 from cube2common.constants import INTERMISSIONLEN
 from spyd.game.client.exceptions import GenericError
 from spyd.game.gamemode import gamemodes
+from spyd.game.map.map_entity_lists import warm_entity_lists
 from spyd.game.map.map_rotation import MapRotation
 from spyd.protocol import swh
 
 
 class RoomMapModeState(object):
+    # Fraction of a timed match which elapses before the next map in the rotation is read
+    prefetch_fraction = 0.5
+
     def __init__(self, room, map_rotation=None, map_meta_data_accessor=None, game_clock=None, ready_up_controller_factory=None):
         self.room = room
         self._map_name = ""
@@ -20,6 +24,11 @@ class RoomMapModeState(object):
         self._initializing = False
         self._initializing_deferreds = []
 
+        # (map name, map meta data) read ahead for the next rotation
+        self._prefetched = None
+        self._prefetch_token = 0
+        self._prefetch_scheduled_callback = None
+
     @property
     def initialized(self):
         return self._initialized
@@ -85,7 +94,13 @@ class RoomMapModeState(object):
 
         self._map_name = map_name
 
-        map_meta_data = yield self._map_meta_data_accessor.get_map_data(self._map_name)
+        prefetched = self._prefetched
+        self.cancel_prefetch()
+
+        if prefetched is not None and prefetched[0] == map_name:
+            map_meta_data = prefetched[1]
+        else:
+            map_meta_data = yield self._map_meta_data_accessor.get_map_data(self._map_name)
         map_meta_data = map_meta_data or {}
 
         self._gamemode = gamemodes[mode_name](room=self.room, map_meta_data=map_meta_data)
@@ -100,6 +115,7 @@ class RoomMapModeState(object):
 
             if self.gamemode.timed:
                 self._game_clock.start(self.gamemode.timeout, INTERMISSIONLEN)
+                self._schedule_prefetch()
             else:
                 self._game_clock.start_untimed()
 
@@ -127,3 +143,34 @@ class RoomMapModeState(object):
                         swh.put_spawnstate(cds, player)
 
         self.room._initialize_demo_recording()
+
+    def _schedule_prefetch(self):
+        self._prefetch_scheduled_callback = self._game_clock.schedule_callback(self.gamemode.timeout * self.prefetch_fraction)
+        self._prefetch_scheduled_callback.add_timeup_callback(self.prefetch_next_map_mode)
+
+    def prefetch_next_map_mode(self):
+        "Reads the meta data of the next map in the rotation so the map change does not wait on it."
+        self._prefetch_scheduled_callback = None
+        self._prefetched = None
+        self._prefetch_token += 1
+        token = self._prefetch_token
+
+        map_name, _ = self._map_rotation.next_map_mode(peek=True)
+
+        def map_meta_read(map_meta_data):
+            if token != self._prefetch_token: return
+            warm_entity_lists(map_meta_data)
+            self._prefetched = (map_name, map_meta_data)
+
+        def map_meta_failed(failure):
+            if token != self._prefetch_token: return
+            print("Could not prefetch map {!r}: {}".format(map_name, failure.getErrorMessage()))
+
+        return self._map_meta_data_accessor.get_map_data(map_name).addCallbacks(map_meta_read, map_meta_failed)
+
+    def cancel_prefetch(self):
+        self._prefetch_token += 1
+        self._prefetched = None
+        if self._prefetch_scheduled_callback is not None:
+            self._prefetch_scheduled_callback.cancel()
+            self._prefetch_scheduled_callback = None
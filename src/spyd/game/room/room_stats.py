@@ -0,0 +1,48 @@
+from array import array
+
+from spyd.game.player.kpd import KPD
+from spyd.game.player.player_state import counter_names
+
+
+counter_indexes = {name: index for index, name in enumerate(counter_names)}
+counter_count = len(counter_names)
+
+class RoomStatsTable(object):
+    '''
+    The counters of a set of players gathered into one array, one row per player.
+
+    Each PlayerState already keeps its counters packed, so building the table is
+    one array extend per player and reading a column is a single strided slice.
+    '''
+    def __init__(self, players):
+        self.players = list(players)
+
+        self._counters = array('i')
+        for player in self.players:
+            self._counters.extend(player.state.counters)
+
+        self.spectators = [player.state.is_spectator for player in self.players]
+
+    def __len__(self):
+        return len(self.players)
+
+    def column(self, name):
+        return self._counters[counter_indexes[name]::counter_count]
+
+    def row(self, slot):
+        start = slot * counter_count
+        return dict(zip(counter_names, self._counters[start:start + counter_count]))
+
+    def eligible(self, name, greater_than=0):
+        "Returns whether each player is playing and has the named counter above greater_than."
+        return [value > greater_than and not spectator for value, spectator in zip(self.column(name), self.spectators)]
+
+    def acc_percent(self):
+        return [Ellipsis if spent == 0 else (100 * dealt) / spent for dealt, spent in zip(self.column('damage_dealt'), self.column('damage_spent'))]
+
+    def kpd(self):
+        return [KPD(frags, deaths) for frags, deaths in zip(self.column('frags'), self.column('deaths'))]
+
+    def ranking(self, name):
+        "Returns the players ordered by the named counter, highest first."
+        return [player for _, player in sorted(zip(self.column(name), self.players), key=lambda item: item[0], reverse=True)]
@@ -1,9 +1,12 @@
+import contextlib
+
 from twisted.internet import reactor
 
 from cube2common.utils.enum import enum
 from spyd.game.timing.callback import Callback, call_all
 from spyd.game.timing.resume_countdown import ResumeCountdown
-from spyd.game.timing.scheduled_callback_wrapper import ScheduledCallbackWrapper, resume_all, pause_all
+from spyd.game.timing.game_timer_queue import GameTimerQueue
+from spyd.game.timing.scheduled_callback_wrapper import ScheduledCallbackWrapper
 
 
 states = enum('NOT_STARTED', 'RUNNING', 'PAUSED', 'RESUMING', 'INTERMISSION', 'ENDED')
@@ -25,6 +28,13 @@ class GameClock(object):
         self._resume_countdown = None
         
         self._timed = True
+
+        self._frozen = False
+        self._resume_on_thaw = False
+
+        # time_elapsed is read at most once inside a time_snapshot block
+        self._snapshot_depth = 0
+        self._time_elapsed_snapshot = None
         
         self._paused_callbacks = []
         self._resumed_callbacks = []
@@ -33,7 +43,8 @@ class GameClock(object):
         self._intermission_started_callbacks = []
         self._intermission_ended_callbacks = []
         
-        self._scheduled_callback_wrappers = []
+        # Every timer of the game, including the intermission ones, runs on game time
+        self._timer_queue = GameTimerQueue(self.clock)
         
     def _cancel_existing_scheduled_events(self):
         if self._intermission_end_scheduled_callback_wrapper is not None:
@@ -44,8 +55,7 @@ class GameClock(object):
             self._intermission_start_scheduled_callback_wrapper.cancel()
             self._intermission_start_scheduled_callback_wrapper = None
 
-        for scheduled_callback_wrapper in list(self._scheduled_callback_wrappers):
-            scheduled_callback_wrapper.cancel()
+        self._timer_queue.cancel_all()
 
     def cancel(self):
         '''Cancel the current game that is timed and start a new one.'''
@@ -59,25 +69,31 @@ class GameClock(object):
     
     def start(self, game_duration_seconds, intermission_duration_seconds):
         '''Set the game clock. If a game is currently underway, this will reset the time elapsed and set the amount of time left as specified.'''
+        self._invalidate_time_snapshot()
         self._assert_not_started()
 
         self._timed = True
+
+        # The game only starts counting down once the clock is resumed
+        self._timer_queue.pause()
             
         self._intermission_duration_seconds = intermission_duration_seconds
-        self._intermission_start_scheduled_callback_wrapper = ScheduledCallbackWrapper(game_duration_seconds)
+        self._intermission_start_scheduled_callback_wrapper = self.schedule_callback(game_duration_seconds)
         self._intermission_start_scheduled_callback_wrapper.add_timeup_callback(self._intermission_started)
         
-        self._intermission_end_scheduled_callback_wrapper = ScheduledCallbackWrapper(game_duration_seconds+intermission_duration_seconds)
+        self._intermission_end_scheduled_callback_wrapper = self.schedule_callback(game_duration_seconds+intermission_duration_seconds)
         self._intermission_end_scheduled_callback_wrapper.add_timeup_callback(self._intermission_ended)
         
         self._time_elapsed = 0.0
         
     def start_untimed(self):
+        self._invalidate_time_snapshot()
         self._assert_not_started()
 
         self._state = states.PAUSED
         self._timed = False
         self._time_elapsed = 0.0
+        self._timer_queue.pause()
     
     def add_paused_callback(self, f, *args, **kwargs):
         '''Add a callback function which will be called with the specified arguments each time the game is paused.'''
@@ -133,17 +149,42 @@ class GameClock(object):
         elif not self.is_paused:
             self._paused()
 
-    def _remove_scheduled_callback_wrapper(self, scheduled_callback_wrapper):
-        if scheduled_callback_wrapper in self._scheduled_callback_wrappers:
-            self._scheduled_callback_wrappers.remove(scheduled_callback_wrapper)
-    
+    def freeze(self):
+        '''Silently stop the clock and all scheduled callbacks until thaw is called. Used while a room has no clients.'''
+        self._invalidate_time_snapshot()
+        if self._frozen:
+            return
+        if self.is_resuming and self._resume_countdown is not None:
+            self._resume_countdown.cancel()
+            self._resume_countdown = None
+            self._resume_on_thaw = True
+        elif not self.is_paused:
+            self._time_elapsed = self.time_elapsed
+            self._last_resume_time = None
+            self._pause_scheduled_events()
+        self._frozen = True
+
+    def thaw(self):
+        '''Continue the clock from where it was frozen.'''
+        self._invalidate_time_snapshot()
+        if not self._frozen:
+            return
+        self._frozen = False
+        if self._resume_on_thaw:
+            self._resume_on_thaw = False
+            self._resumed()
+        elif not self.is_paused:
+            self._last_resume_time = self.clock.seconds()
+            self._resume_scheduled_events()
+
+    @property
+    def is_frozen(self):
+        return self._frozen
+
     def schedule_callback(self, seconds):
-        '''Schedule a callback after the specified number of seconds on the game clock. Returns a deferred.'''
-        scheduled_callback_wrapper = ScheduledCallbackWrapper(seconds)
-        scheduled_callback_wrapper.add_finished_callback(self._remove_scheduled_callback_wrapper, scheduled_callback_wrapper)
-        self._scheduled_callback_wrappers.append(scheduled_callback_wrapper)
-        if not self.is_paused:
-            scheduled_callback_wrapper.resume()
+        '''Schedule a callback after the specified number of seconds on the game clock. Returns a ScheduledCallbackWrapper.'''
+        scheduled_callback_wrapper = ScheduledCallbackWrapper(seconds, self._timer_queue)
+        scheduled_callback_wrapper.resume()
         return scheduled_callback_wrapper
     
     @property
@@ -187,7 +228,7 @@ class GameClock(object):
             self._timeleft_altered()
         else:
             self._cancel_existing_scheduled_events()
-            self._intermission_end_scheduled_callback_wrapper = ScheduledCallbackWrapper(self._intermission_duration_seconds)
+            self._intermission_end_scheduled_callback_wrapper = self.schedule_callback(self._intermission_duration_seconds)
             self._intermission_end_scheduled_callback_wrapper.add_timeup_callback(self._intermission_ended)
             self._timeleft_altered()
 
@@ -199,34 +240,66 @@ class GameClock(object):
         else:
             return 0.0
 
+    @contextlib.contextmanager
+    def time_snapshot(self):
+        '''Reuse a single reading of time_elapsed until the block exits. Used around a tick or a batch of client messages.'''
+        self._snapshot_depth += 1
+        try:
+            yield
+        finally:
+            self._snapshot_depth -= 1
+            if self._snapshot_depth == 0:
+                self._time_elapsed_snapshot = None
+
+    def get_time_elapsed(self, fresh=False):
+        '''Return how many seconds this game has been going for. With fresh the clock is read even inside a time_snapshot block.'''
+        if self._snapshot_depth == 0:
+            return self._read_time_elapsed()
+        if fresh or self._time_elapsed_snapshot is None:
+            self._time_elapsed_snapshot = self._read_time_elapsed()
+        return self._time_elapsed_snapshot
+
     @property
     def time_elapsed(self):
         '''Return how many seconds this game has been going for.'''
-        if self.is_paused:
+        return self.get_time_elapsed()
+
+    def _invalidate_time_snapshot(self):
+        self._time_elapsed_snapshot = None
+
+    def _read_time_elapsed(self):
+        if self.is_paused or self._frozen:
             return self._time_elapsed
         else:
             time_elapsed = self._time_elapsed or 0.0
-            last_resume_time = self._last_resume_time or self.clock.seconds()
+            last_resume_time = self._last_resume_time
+            if last_resume_time is None:
+                last_resume_time = self.clock.seconds()
             return time_elapsed + (self.clock.seconds() - last_resume_time)
 
+    def _pause_scheduled_events(self):
+        self._timer_queue.pause()
+
+    def _resume_scheduled_events(self):
+        self._timer_queue.resume()
+
     def _paused(self):
+        self._invalidate_time_snapshot()
         self._state = states.PAUSED
-        self._time_elapsed += self.clock.seconds() - self._last_resume_time
-        self._last_resume_time = None
-        if self._timed:
-            self._intermission_start_scheduled_callback_wrapper.pause()
-            self._intermission_end_scheduled_callback_wrapper.pause()
-        pause_all(self._scheduled_callback_wrappers)
+        if not self._frozen:
+            # A frozen clock has already accumulated its elapsed time and paused its events
+            self._time_elapsed += self.clock.seconds() - self._last_resume_time
+            self._last_resume_time = None
+            self._pause_scheduled_events()
         call_all(self._paused_callbacks)
 
     def _resumed(self):
+        self._invalidate_time_snapshot()
         self._state = states.RUNNING
-        self._last_resume_time = self.clock.seconds()
         self._resume_countdown = None
-        if self._timed:
-            self._intermission_start_scheduled_callback_wrapper.resume()
-            self._intermission_end_scheduled_callback_wrapper.resume()
-        resume_all(self._scheduled_callback_wrappers)
+        if not self._frozen:
+            self._last_resume_time = self.clock.seconds()
+            self._resume_scheduled_events()
         call_all(self._resumed_callbacks)
         
     def _resume_countdown_tick(self, seconds):
@@ -0,0 +1,121 @@
+import heapq
+
+from twisted.internet import reactor
+
+
+# Deadlines within this many seconds of the current game time are considered due
+DEADLINE_EPSILON = 1e-9
+
+class GameTimerQueue(object):
+    '''
+    Timers keyed by deadlines in game time, which only advances while the queue is running.
+
+    A single reactor call is kept for the earliest deadline, so pausing and resuming
+    does not touch the individual timers. Cancelled entries are left in the heap
+    and skipped when they reach the top.
+    '''
+    def __init__(self, clock=reactor):
+        self.clock = clock
+
+        # [deadline, sequence, handle] with handle set to None once cancelled
+        self._heap = []
+        self._sequence = 0
+        self._cancelled_count = 0
+
+        self._running = False
+        self._game_time = 0.0
+        self._resumed_at = None
+
+        self._delayed_call = None
+
+    @property
+    def running(self):
+        return self._running
+
+    def __len__(self):
+        return len(self._heap) - self._cancelled_count
+
+    def game_time(self):
+        if self._running:
+            return self._game_time + (self.clock.seconds() - self._resumed_at)
+        return self._game_time
+
+    def pause(self):
+        if not self._running: return
+        self._game_time = self.game_time()
+        self._running = False
+        self._resumed_at = None
+        if self._delayed_call is not None:
+            self._delayed_call.cancel()
+            self._delayed_call = None
+
+    def resume(self):
+        if self._running: return
+        self._running = True
+        self._resumed_at = self.clock.seconds()
+        self._schedule_next()
+
+    def schedule(self, handle, seconds):
+        "Adds a timer which calls handle._timeup after seconds of game time. Returns the entry to pass to discard."
+        self._sequence += 1
+        entry = [self.game_time() + seconds, self._sequence, handle]
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry:
+            self._schedule_next()
+        return entry
+
+    def discard(self, entry):
+        if entry[2] is None: return
+        entry[2] = None
+        self._cancelled_count += 1
+        if self._cancelled_count > 32 and self._cancelled_count * 2 > len(self._heap):
+            self._compact()
+
+    def timeleft(self, entry):
+        return max(0.0, entry[0] - self.game_time())
+
+    def cancel_all(self):
+        for entry in list(self._heap):
+            if entry[2] is not None:
+                entry[2].cancel()
+        self._heap = []
+        self._cancelled_count = 0
+        if self._delayed_call is not None:
+            self._delayed_call.cancel()
+            self._delayed_call = None
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if entry[2] is not None]
+        heapq.heapify(self._heap)
+        self._cancelled_count = 0
+
+    def _pop_cancelled(self):
+        heap = self._heap
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+            self._cancelled_count -= 1
+
+    def _schedule_next(self):
+        self._pop_cancelled()
+        if not self._running or not self._heap:
+            if self._delayed_call is not None:
+                self._delayed_call.cancel()
+                self._delayed_call = None
+            return
+
+        delay = max(0.0, self._heap[0][0] - self.game_time())
+        if self._delayed_call is None:
+            self._delayed_call = self.clock.callLater(delay, self._fire)
+        else:
+            self._delayed_call.reset(delay)
+
+    def _fire(self):
+        self._delayed_call = None
+        # timeup callbacks may pause the queue or cancel every timer, so the heap is looked up each time
+        while self._running and self._heap and self._heap[0][0] <= self.game_time() + DEADLINE_EPSILON:
+            _, _, handle = heapq.heappop(self._heap)
+            if handle is None:
+                self._cancelled_count -= 1
+                continue
+            handle._timeup()
+        self._schedule_next()
@@ -1,31 +1,37 @@
 from twisted.internet import reactor
 from spyd.game.timing.callback import Callback, call_all
+from spyd.game.timing.game_timer_queue import GameTimerQueue
 
 class ScheduledCallbackWrapper(object):
-    '''Holds a deferred and either delayed call or a delay seconds value.'''
+    '''Handle for a timer in a GameTimerQueue. Without a queue the wrapper keeps a running queue of its own.'''
 
     clock = reactor
 
-    def __init__(self, seconds):
+    def __init__(self, seconds, timer_queue=None):
         self._finished_callbacks = []
         self._timeup_callbacks = []
 
+        if timer_queue is None:
+            timer_queue = GameTimerQueue(self.clock)
+            timer_queue.resume()
+        self._timer_queue = timer_queue
+
         self._cancelled = False
-        self._delayed_call = None
+        self._entry = None
         self._delay_seconds = seconds
         self._finished = False
 
     def pause(self):
-        if self.is_paused or self._cancelled:
+        if self._entry is None or self._cancelled:
             return
-        self._delay_seconds = self.timeleft
-        self._delayed_call.cancel()
-        self._delayed_call = None
+        self._delay_seconds = self._timer_queue.timeleft(self._entry)
+        self._timer_queue.discard(self._entry)
+        self._entry = None
 
     def resume(self):
-        if not self.is_paused or self._cancelled:
+        if self._entry is not None or self._cancelled or self._finished:
             return
-        self._delayed_call = self.clock.callLater(self._delay_seconds, self._timeup)
+        self._entry = self._timer_queue.schedule(self, self._delay_seconds)
         self._delay_seconds = None
 
     def add_finished_callback(self, func, *args, **kwargs):
@@ -40,10 +46,11 @@ class ScheduledCallbackWrapper(object):
         self._finished = True
         self._timeup_callbacks = []
         self._finished_callbacks = []
-        self._delayed_call = None
+        self._entry = None
         self._delay_seconds = 0.0
 
     def _timeup(self):
+        self._entry = None
         call_all(self._finished_callbacks)
         if not self._cancelled:
             call_all(self._timeup_callbacks)
@@ -51,22 +58,24 @@ class ScheduledCallbackWrapper(object):
         self._finished_cleanup()
 
     def cancel(self):
+        if self._finished:
+            return
         call_all(self._finished_callbacks)
-        if self._delayed_call is not None and not self._delayed_call.called:
-            self._delayed_call.cancel()
+        if self._entry is not None:
+            self._timer_queue.discard(self._entry)
         self._cancelled = True
         self._finished_cleanup()
 
     @property
     def timeleft(self):
-        if self._delayed_call is None:
+        if self._entry is None:
             return self._delay_seconds
         else:
-            return max(0.0, self._delayed_call.getTime() - self.clock.seconds())
+            return self._timer_queue.timeleft(self._entry)
 
     @timeleft.setter
     def timeleft(self, seconds):
-        was_paused = self.is_paused
+        was_paused = self._entry is None
         if not was_paused:
             self.pause()
         self._delay_seconds = seconds
@@ -75,7 +84,7 @@ class ScheduledCallbackWrapper(object):
 
     @property
     def is_paused(self):
-        return self._delayed_call is None
+        return self._entry is None or not self._timer_queue.running
 
     @property
     def is_finished(self):
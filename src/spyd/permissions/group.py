@@ -1,6 +1,16 @@
+import re
+
+
 class GroupAllowsDeniesIntersection(Exception): pass
 
 
+def merge_patterns(patterns):
+    "Combines compiled patterns into a single alternation. Returns None if there are none."
+    if not patterns:
+        return None
+    return re.compile("|".join("(?:{})".format(pattern.pattern) for pattern in patterns))
+
+
 class Group(object):
     def __init__(self, name, inherits, priority, allows, denies):
         self.name = name
@@ -13,8 +23,21 @@ class Group(object):
         # denied functionality names
         self._denies = denies
 
+        self._allow_pattern = merge_patterns(allows)
+        self._deny_pattern = merge_patterns(denies)
+
+        # functionality name: True, None or False
+        self._allowed_cache = {}
+
     def allowed(self, functionality_name):
         'Returns True, None, or False'
+        try:
+            return self._allowed_cache[functionality_name]
+        except KeyError:
+            allowed = self._allowed_cache[functionality_name] = self._resolve_allowed(functionality_name)
+            return allowed
+
+    def _resolve_allowed(self, functionality_name):
         if self._search_is_denied(functionality_name):
             return False
         if self._search_is_allowed(functionality_name):
@@ -33,13 +56,7 @@ class Group(object):
         return inherited_allow
 
     def _search_is_allowed(self, functionality_name):
-        for allow in self._allows:
-            if allow.match(functionality_name):
-                return True
-        return False
+        return self._allow_pattern is not None and self._allow_pattern.match(functionality_name) is not None
 
     def _search_is_denied(self, functionality_name):
-        for deny in self._denies:
-            if deny.match(functionality_name):
-                return True
-        return False
+        return self._deny_pattern is not None and self._deny_pattern.match(functionality_name) is not None
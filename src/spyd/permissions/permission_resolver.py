@@ -16,12 +16,42 @@ def create_simple_pattern(pattern_string):
     pattern_string = "^{}$".format(pattern_string)
     return re.compile(pattern_string)
 
+# Decisions are forgotten all at once when the cache grows past this many entries
+MAX_CACHED_DECISIONS = 4096
+
 class PermissionResolver(object):
     def __init__(self):
         # group: Group
         self.groups = {}
 
+        # (frozenset of group names, functionality name): bool
+        self._decision_cache = {}
+
+        # bumped whenever the groups are replaced
+        self.version = 0
+
     def groups_allow(self, group_name_list, functionality):
+        if not isinstance(group_name_list, frozenset):
+            group_name_list = frozenset(group_name_list)
+
+        key = (group_name_list, functionality.name)
+        try:
+            return self._decision_cache[key]
+        except KeyError:
+            pass
+
+        allowed = self._resolve_groups_allow(group_name_list, functionality)
+
+        if len(self._decision_cache) >= MAX_CACHED_DECISIONS:
+            self._decision_cache.clear()
+        self._decision_cache[key] = allowed
+        return allowed
+
+    def invalidate(self):
+        self._decision_cache.clear()
+        self.version += 1
+
+    def _resolve_groups_allow(self, group_name_list, functionality):
         groups = self._group_names_to_groups(group_name_list)
         groups = [_f for _f in groups if _f]
         
@@ -45,8 +75,12 @@ class PermissionResolver(object):
     @staticmethod
     def from_dictionary(permission_dictionary):
         permission_resolver = PermissionResolver()
+        permission_resolver.load_dictionary(permission_dictionary)
+        return permission_resolver
 
-        groups = permission_resolver.groups
+    def load_dictionary(self, permission_dictionary):
+        "Replaces the groups with those declared in the permission dictionary and forgets every cached decision."
+        groups = {}
 
         def create_group(group_name, inheritance_path):
             if group_name in groups: return groups[group_name]
@@ -77,4 +111,5 @@ class PermissionResolver(object):
         for group_name in permission_dictionary:
             create_group(group_name, set())
 
-        return permission_resolver
+        self.groups = groups
+        self.invalidate()
@@ -1 +1,2 @@
 from .server_write_helper import swh
+from .shared_packet import SharedPacket, to_packet_data
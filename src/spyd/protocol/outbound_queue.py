@@ -0,0 +1,65 @@
+class _ChannelQueue(object):
+    __slots__ = ('message_count', 'chunks')
+
+    def __init__(self):
+        self.message_count = 0
+        self.chunks = [bytearray()]
+
+
+class OutboundQueue(object):
+    '''
+    Collects the reliable messages sent to one client during a tick and sends them as
+    as few packets as possible, each no larger than the mtu unless a single message is.
+
+    Messages are only appended so ordering within a channel is preserved.
+    '''
+    def __init__(self, send, mtu, on_pending=None):
+        self._send = send
+        self._mtu = mtu
+        self._on_pending = on_pending
+
+        # channel: _ChannelQueue
+        self._channels = {}
+
+    @property
+    def empty(self):
+        return not self._channels
+
+    def has_pending(self, channel):
+        return channel in self._channels
+
+    def queue(self, channel, data):
+        if not data: return
+
+        channel_queue = self._channels.get(channel)
+        if channel_queue is None:
+            if not self._channels and self._on_pending is not None:
+                self._on_pending(self)
+            channel_queue = self._channels[channel] = _ChannelQueue()
+
+        chunk = channel_queue.chunks[-1]
+        if chunk and len(chunk) + len(data) > self._mtu:
+            chunk = bytearray()
+            channel_queue.chunks.append(chunk)
+
+        chunk += data
+        channel_queue.message_count += 1
+
+    def flush_channel(self, channel):
+        "Sends the pending messages for the channel. Returns the number of packets saved by coalescing."
+        channel_queue = self._channels.pop(channel, None)
+        if channel_queue is None: return 0
+
+        for chunk in channel_queue.chunks:
+            self._send(channel, bytes(chunk), True)
+
+        return channel_queue.message_count - len(channel_queue.chunks)
+
+    def flush(self):
+        saved = 0
+        for channel in sorted(self._channels.keys()):
+            saved += self.flush_channel(channel)
+        return saved
+
+    def clear(self):
+        self._channels.clear()
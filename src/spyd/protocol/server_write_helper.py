@@ -6,23 +6,13 @@ class swh(object):
     def put_info_reply(cds, server_desc, numclients, maxclients, mode_num, map_name, seconds_left, mastermask, gamepaused, gamespeed):
         cds.putint(numclients)
         cds.putint(7)  # fields following
-        cds.putint(PROTOCOL_VERSION)
-        cds.putint(mode_num)
-        cds.putint(seconds_left)
-        cds.putint(maxclients)
-        cds.putint(mastermask)
-        cds.putint(1 if gamepaused else 0)
-        cds.putint(gamespeed)
+        cds.putints((PROTOCOL_VERSION, mode_num, seconds_left, maxclients, mastermask, 1 if gamepaused else 0, gamespeed))
         cds.putstring(map_name)
         cds.putstring(server_desc)
 
     @staticmethod
     def put_servinfo(data_stream, client, haspwd, description, domain):
-        data_stream.putint(message_types.N_SERVINFO)
-        data_stream.putint(client.cn)
-        data_stream.putint(PROTOCOL_VERSION)
-        data_stream.putint(id(client))
-        data_stream.putint(haspwd)
+        data_stream.putints((message_types.N_SERVINFO, client.cn, PROTOCOL_VERSION, id(client), haspwd))
         data_stream.putstring(description)
         data_stream.putstring(domain)
 
@@ -76,15 +66,11 @@ class swh(object):
 
     @staticmethod
     def put_pausegame(data_stream, paused, client=None):
-        data_stream.putint(message_types.N_PAUSEGAME)
-        data_stream.putint(paused)
-        data_stream.putint(client.cn if client is not None else -1)
+        data_stream.putints((message_types.N_PAUSEGAME, paused, client.cn if client is not None else -1))
 
     @staticmethod
     def put_spectator(data_stream, player):
-        data_stream.putint(message_types.N_SPECTATOR)
-        data_stream.putint(player.pn)
-        data_stream.putint(1 if player.state.is_spectator else 0)
+        data_stream.putints((message_types.N_SPECTATOR, player.pn, 1 if player.state.is_spectator else 0))
 
     @staticmethod
     def put_setteam(data_stream, client, reason):
@@ -95,12 +81,7 @@ class swh(object):
 
     @staticmethod
     def put_initai(data_stream, aiclient):
-        data_stream.putint(message_types.N_INITAI)
-        data_stream.putint(aiclient.cn)
-        data_stream.putint(aiclient.owner.cn)
-        data_stream.putint(aiclient.aitype)
-        data_stream.putint(aiclient.aiskill)
-        data_stream.putint(aiclient.playermodel)
+        data_stream.putints((message_types.N_INITAI, aiclient.cn, aiclient.owner.cn, aiclient.aitype, aiclient.aiskill, aiclient.playermodel))
         data_stream.putstring(aiclient.name)
         data_stream.putstring(aiclient.team)
 
@@ -122,27 +103,18 @@ class swh(object):
 
     @staticmethod
     def put_state(data_stream, player_state):
-        data_stream.putint(player_state.lifesequence)
-        data_stream.putint(player_state.health)
-        data_stream.putint(player_state.maxhealth)
-        data_stream.putint(player_state.armour)
-        data_stream.putint(player_state.armourtype)
-        data_stream.putint(player_state.gunselect)
+        data_stream.putints((player_state.lifesequence, player_state.health, player_state.maxhealth,
+                             player_state.armour, player_state.armourtype, player_state.gunselect))
 
     @staticmethod
     def put_ammo(data_stream, player_state):
-        for ammo_slot in player_state.ammo[weapon_types.GUN_SG:weapon_types.GUN_PISTOL + 1]:
-            data_stream.putint(ammo_slot)
+        data_stream.putints(player_state.ammo[weapon_types.GUN_SG:weapon_types.GUN_PISTOL + 1])
 
     @staticmethod
     def put_resume(data_stream, players):
         data_stream.putint(message_types.N_RESUME)
         for player in players:
-            data_stream.putint(player.pn)
-            data_stream.putint(player.state.state)
-            data_stream.putint(player.state.frags)
-            data_stream.putint(player.state.flags)
-            data_stream.putint(player.state.quadremaining)
+            data_stream.putints((player.pn, player.state.state, player.state.frags, player.state.flags, player.state.quadremaining))
 
             swh.put_state(data_stream, player.state)
             swh.put_ammo(data_stream, player.state)
@@ -151,9 +123,7 @@ class swh(object):
 
     @staticmethod
     def put_itemacc(data_stream, item, client):
-        data_stream.putint(message_types.N_ITEMACC)
-        data_stream.putint(item.index)
-        data_stream.putint(client.cn)
+        data_stream.putints((message_types.N_ITEMACC, item.index, client.cn))
 
     @staticmethod
     def put_announce(data_stream, item):
@@ -190,68 +160,38 @@ class swh(object):
 
         data_stream.putint(len(flags))
         for flag in flags:
-            data_stream.putint(flag.version)
-            data_stream.putint(flag.spawn)
-            data_stream.putint(flag.owner.cn if flag.owner is not None else -1)
-            data_stream.putint(flag.invisible)
+            data_stream.putints((flag.version, flag.spawn, flag.owner.cn if flag.owner is not None else -1, flag.invisible))
             if flag.owner is None:
                 data_stream.putint(flag.dropped)
                 if flag.dropped:
-                    data_stream.putint(flag.drop_location.x)
-                    data_stream.putint(flag.drop_location.y)
-                    data_stream.putint(flag.drop_location.z)
+                    data_stream.putints((flag.drop_location.x, flag.drop_location.y, flag.drop_location.z))
 
     @staticmethod
     def put_dropflag(data_stream, client, flag):
-        data_stream.putint(message_types.N_DROPFLAG)
-        data_stream.putint(client.cn)
-        data_stream.putint(flag.id)
-        data_stream.putint(flag.version)
-        data_stream.putint(flag.drop_location.x)
-        data_stream.putint(flag.drop_location.y)
-        data_stream.putint(flag.drop_location.z)
+        data_stream.putints((message_types.N_DROPFLAG, client.cn, flag.id, flag.version, flag.drop_location.x, flag.drop_location.y, flag.drop_location.z))
 
     @staticmethod
     def put_scoreflag(data_stream, client, relayflag, goalflag):
-        data_stream.putint(message_types.N_SCOREFLAG)
-        data_stream.putint(client.cn)
-        data_stream.putint(relayflag.id)
-        data_stream.putint(relayflag.version)
-        data_stream.putint(goalflag.id)
-        data_stream.putint(goalflag.version)
-        data_stream.putint(goalflag.spawn)
-        data_stream.putint(client.team.id + 1)
-        data_stream.putint(client.team.score)
-        data_stream.putint(client.state.flags)
+        data_stream.putints((message_types.N_SCOREFLAG, client.cn,
+                             relayflag.id, relayflag.version,
+                             goalflag.id, goalflag.version, goalflag.spawn,
+                             client.team.id + 1, client.team.score, client.state.flags))
 
     @staticmethod
     def put_returnflag(data_stream, client, flag):
-        data_stream.putint(message_types.N_RETURNFLAG)
-        data_stream.putint(client.cn)
-        data_stream.putint(flag.id)
-        data_stream.putint(flag.version)
+        data_stream.putints((message_types.N_RETURNFLAG, client.cn, flag.id, flag.version))
 
     @staticmethod
     def put_takeflag(data_stream, client, flag):
-        data_stream.putint(message_types.N_TAKEFLAG)
-        data_stream.putint(client.cn)
-        data_stream.putint(flag.id)
-        data_stream.putint(flag.version)
+        data_stream.putints((message_types.N_TAKEFLAG, client.cn, flag.id, flag.version))
 
     @staticmethod
     def put_resetflag(data_stream, flag, team):
-        data_stream.putint(message_types.N_RESETFLAG)
-        data_stream.putint(flag.id)
-        data_stream.putint(flag.version)
-        data_stream.putint(flag.spawn)
-        data_stream.putint(team.id)
-        data_stream.putint(team.score)
+        data_stream.putints((message_types.N_RESETFLAG, flag.id, flag.version, flag.spawn, team.id, team.score))
 
     @staticmethod
     def put_invisflag(data_stream, flag):
-        data_stream.putint(message_types.N_INVISFLAG)
-        data_stream.putint(flag.id)
-        data_stream.putint(flag.invisible)
+        data_stream.putints((message_types.N_INVISFLAG, flag.id, flag.invisible))
 
     @staticmethod
     def put_bases(data_stream, bases):
@@ -282,18 +222,12 @@ class swh(object):
 
     @staticmethod
     def put_repammo(data_stream, client, base):
-        data_stream.putint(message_types.N_REPAMMO)
-        data_stream.putint(client.cn)
-        data_stream.putint(base.ammotype)
+        data_stream.putints((message_types.N_REPAMMO, client.cn, base.ammotype))
 
     @staticmethod
     def put_baseregen(data_stream, client, base):
-        data_stream.putint(message_types.N_BASEREGEN)
-        data_stream.putint(client.cn)
-        data_stream.putint(client.state.health)
-        data_stream.putint(client.state.armour)
-        data_stream.putint(base.ammotype)
-        data_stream.putint(client.state.ammo[base.ammotype])
+        data_stream.putints((message_types.N_BASEREGEN, client.cn, client.state.health, client.state.armour,
+                             base.ammotype, client.state.ammo[base.ammotype]))
 
     @staticmethod
     def put_cdis(data_stream, client):
@@ -302,10 +236,7 @@ class swh(object):
 
     @staticmethod
     def put_died(data_stream, client, killer):
-        data_stream.putint(message_types.N_DIED)
-        data_stream.putint(client.cn)
-        data_stream.putint(killer.cn)
-        data_stream.putint(killer.state.frags)
+        data_stream.putints((message_types.N_DIED, client.cn, killer.cn, killer.state.frags))
         if killer.team is not None:
             data_stream.putint(killer.team.frags)
         else:
@@ -318,55 +249,29 @@ class swh(object):
 
     @staticmethod
     def put_jumppad(data_stream, client, jumppad):
-        data_stream.putint(message_types.N_JUMPPAD)
-        data_stream.putint(client.cn)
-        data_stream.putint(jumppad)
+        data_stream.putints((message_types.N_JUMPPAD, client.cn, jumppad))
 
     @staticmethod
     def put_teleport(data_stream, client, teleport, teledest):
-        data_stream.putint(message_types.N_TELEPORT)
-        data_stream.putint(client.cn)
-        data_stream.putint(teleport)
-        data_stream.putint(teledest)
+        data_stream.putints((message_types.N_TELEPORT, client.cn, teleport, teledest))
 
     @staticmethod
     def put_shotfx(data_stream, client, gun, shot_id, from_pos, to_pos):
-        data_stream.putint(message_types.N_SHOTFX)
-        data_stream.putint(client.cn)
-        data_stream.putint(gun)
-        data_stream.putint(shot_id)
-        data_stream.putint(from_pos.x)
-        data_stream.putint(from_pos.y)
-        data_stream.putint(from_pos.z)
-        data_stream.putint(to_pos.x)
-        data_stream.putint(to_pos.y)
-        data_stream.putint(to_pos.z)
+        data_stream.putints((message_types.N_SHOTFX, client.cn, gun, shot_id,
+                             from_pos.x, from_pos.y, from_pos.z,
+                             to_pos.x, to_pos.y, to_pos.z))
 
     @staticmethod
     def put_explodefx(data_stream, client, gun, explode_id):
-        data_stream.putint(message_types.N_EXPLODEFX)
-        data_stream.putint(client.cn)
-        data_stream.putint(gun)
-        data_stream.putint(explode_id)
+        data_stream.putints((message_types.N_EXPLODEFX, client.cn, gun, explode_id))
 
     @staticmethod
     def put_damage(data_stream, target, client, damage):
-        data_stream.putint(message_types.N_DAMAGE)
-        data_stream.putint(target.cn)
-        data_stream.putint(client.cn)
-        data_stream.putint(damage)
-        data_stream.putint(target.state.armour)
-        data_stream.putint(target.state.health)
+        data_stream.putints((message_types.N_DAMAGE, target.cn, client.cn, damage, target.state.armour, target.state.health))
 
     @staticmethod
     def put_hitpush(data_stream, target, gun, damage, v):
-        data_stream.putint(message_types.N_HITPUSH)
-        data_stream.putint(target.cn)
-        data_stream.putint(gun)
-        data_stream.putint(damage)
-        data_stream.putint(v.x)
-        data_stream.putint(v.y)
-        data_stream.putint(v.z)
+        data_stream.putints((message_types.N_HITPUSH, target.cn, gun, damage, v.x, v.y, v.z))
 
     @staticmethod
     def put_spawnstate(data_stream, player):
@@ -447,9 +352,7 @@ class swh(object):
 
     @staticmethod
     def put_vector(data_stream, v):
-        data_stream.putint(v.x)
-        data_stream.putint(v.y)
-        data_stream.putint(v.z)
+        data_stream.putints((v.x, v.y, v.z))
 
     @staticmethod
     def put_editmode(data_stream, editmode):
@@ -463,8 +366,7 @@ class swh(object):
         data_stream.putint(ent_id)
         swh.put_vector(data_stream, v)
         data_stream.putint(ent_type)
-        for attr in attrs:
-            data_stream.putint(attr)
+        data_stream.putints(attrs)
 
     '''
     common_edit_fields = [Field(name="sel_ox", type="int"),
@@ -496,10 +398,7 @@ class swh(object):
         data_stream.putint(sel_grid)
         data_stream.putint(sel_orient)
 
-        data_stream.putint(sel_cx)
-        data_stream.putint(sel_cxs)
-        data_stream.putint(sel_cy)
-        data_stream.putint(sel_cys)
+        data_stream.putints((sel_cx, sel_cxs, sel_cy, sel_cys))
 
         data_stream.putint(sel_corner)
 
@@ -516,10 +415,7 @@ class swh(object):
         data_stream.putint(sel_grid)
         data_stream.putint(sel_orient)
 
-        data_stream.putint(sel_cx)
-        data_stream.putint(sel_cxs)
-        data_stream.putint(sel_cy)
-        data_stream.putint(sel_cys)
+        data_stream.putints((sel_cx, sel_cxs, sel_cy, sel_cys))
 
         data_stream.putint(sel_corner)
 
@@ -536,9 +432,6 @@ class swh(object):
         data_stream.putint(sel_grid)
         data_stream.putint(sel_orient)
 
-        data_stream.putint(sel_cx)
-        data_stream.putint(sel_cxs)
-        data_stream.putint(sel_cy)
-        data_stream.putint(sel_cys)
+        data_stream.putints((sel_cx, sel_cxs, sel_cy, sel_cys))
 
         data_stream.putint(sel_corner)
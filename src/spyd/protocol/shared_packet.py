@@ -0,0 +1,25 @@
+from cube2protocol.cube_data_stream import CubeDataStream
+
+
+def to_packet_data(data):
+    "Converts the data passed to a send call to the bytes which go into a packet."
+    if type(data) == bytes:
+        return data
+    elif type(data) == CubeDataStream:
+        return bytes(data.data)
+    elif type(data) == str:
+        return data.encode('latin-1')
+    return bytes(data)
+
+class SharedPacket(object):
+    '''
+    A payload which is encoded once and sent to many clients.
+    The transport builds the underlying packet on the first send and reuses it for every following recipient.
+    '''
+    __slots__ = ('data', 'reliable', 'no_allocate', 'packet')
+
+    def __init__(self, data, reliable, no_allocate=False):
+        self.data = to_packet_data(data)
+        self.reliable = reliable
+        self.no_allocate = no_allocate
+        self.packet = None
@@ -0,0 +1,71 @@
+ADDRESS_BITS = 32
+ADDRESS_MASK = (1 << ADDRESS_BITS) - 1
+
+
+def prefix_length_of_mask(mask):
+    "Returns the prefix length of a network order mask, or None if the mask is not contiguous."
+    inverted = ~mask & ADDRESS_MASK
+    if inverted & (inverted + 1):
+        return None
+    return ADDRESS_BITS - inverted.bit_length()
+
+def mask_of_prefix_length(length):
+    return (ADDRESS_MASK << (ADDRESS_BITS - length)) & ADDRESS_MASK
+
+
+class CidrTable(object):
+    '''
+    Values keyed by network order IPv4 prefixes with longest prefix matching.
+
+    This is a binary trie compressed down to one hash table per prefix length in
+    use, so a lookup is at most one dictionary probe per distinct length (33 at
+    worst, usually 3 or 4) instead of a walk over up to 32 nodes.
+    '''
+    def __init__(self):
+        # prefix length: {prefix: value}
+        self._tables = {}
+        # (mask, table) with the longest prefix first
+        self._probes = []
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def insert(self, address, length, value):
+        table = self._tables.get(length)
+        if table is None:
+            table = self._tables[length] = {}
+            self._update_probes()
+        prefix = address & mask_of_prefix_length(length)
+        if prefix not in table:
+            self._count += 1
+        table[prefix] = value
+
+    def get(self, address, length):
+        "Returns the value stored for exactly this prefix."
+        table = self._tables.get(length)
+        if table is None: return None
+        return table.get(address & mask_of_prefix_length(length))
+
+    def remove(self, address, length):
+        "Removes the value stored for exactly this prefix and returns it."
+        table = self._tables.get(length)
+        if table is None: return None
+        value = table.pop(address & mask_of_prefix_length(length), None)
+        if value is None: return None
+
+        self._count -= 1
+        if not table:
+            del self._tables[length]
+            self._update_probes()
+        return value
+
+    def longest_match(self, address):
+        for mask, table in self._probes:
+            value = table.get(address & mask)
+            if value is not None:
+                return value
+        return None
+
+    def _update_probes(self):
+        self._probes = [(mask_of_prefix_length(length), self._tables[length]) for length in sorted(self._tables, reverse=True)]
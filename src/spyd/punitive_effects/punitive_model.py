@@ -1,42 +1,132 @@
-from spyd.utils.net import dottedQuadToLong, simpleMaskedIpToLongIpAndMask
+import heapq
+import time
+from socket import inet_aton, htonl
+from struct import unpack
+
+from spyd.punitive_effects.cidr_table import CidrTable, prefix_length_of_mask
+from spyd.punitive_effects.punitive_effect_info import TimedExpiryInfo
+
+
+def network_order_address(ip):
+    return unpack('!L', inet_aton(ip))[0]
+
+def parse_effect_desc(effect_desc):
+    "Returns the network order (ip, mask) described by a simple masked ip like '127.0' or an (ip, mask) tuple."
+    if type(effect_desc) is tuple:
+        long_ip, long_mask = effect_desc
+        if type(long_ip) == str:
+            return network_order_address(long_ip), network_order_address(long_mask)
+        # longs as produced by spyd.utils.net.dottedQuadToLong
+        return htonl(long_ip), htonl(long_mask)
+
+    parts = effect_desc.split('.')
+    long_ip = 0
+    for part in parts:
+        long_ip = (long_ip << 8) | int(part)
+    unmasked_bits = 8 * (4 - len(parts))
+    return long_ip << unmasked_bits, (0xFFFFFFFF << unmasked_bits) & 0xFFFFFFFF
 
 
 class PunitiveModel(object):
-    # effect_type: {mask: {masked_ip: effect_info}}
-    punitive_effects = {}
+    '''
+    Punitive effects like bans keyed by ip ranges.
 
-    def __init__(self):
+    Prefix ranges are kept in one CidrTable per effect type so finding the effect
+    for a connecting client is a longest prefix match, whatever the number of
+    ranges. Ranges with non contiguous masks fall back to a dictionary per mask.
+    Timed effects are forgotten once they expire.
+    '''
+    def __init__(self, clock=time.time):
+        self._clock = clock
         self.clear_effects()
 
     def clear_effects(self, effect_type=None):
         if effect_type is None:
+            # effect_type: CidrTable
             self.punitive_effects = {}
+            # effect_type: {mask: {masked_ip: effect_info}}
+            self._masked_effects = {}
+            # (expiry_time, sequence, effect_type, masked_ip, mask, effect_info)
+            self._expiry_heap = []
+            self._expiry_sequence = 0
         else:
-            self.punitive_effects[effect_type] = {}
+            self.punitive_effects.pop(effect_type, None)
+            self._masked_effects.pop(effect_type, None)
+            self._expiry_heap = [entry for entry in self._expiry_heap if entry[2] != effect_type]
+            heapq.heapify(self._expiry_heap)
 
     def get_effect(self, effect_type, client_ip):
-        client_ip = dottedQuadToLong(client_ip)
-        effects_of_type = self.punitive_effects.get(effect_type, {})
-        for mask, effects in effects_of_type.items():
+        self.purge_expired()
+
+        client_ip = network_order_address(client_ip)
+
+        cidr_table = self.punitive_effects.get(effect_type)
+        if cidr_table is not None:
+            effect_info = cidr_table.longest_match(client_ip)
+            if effect_info is not None:
+                return effect_info
+
+        for mask, effects in self._masked_effects.get(effect_type, {}).items():
             masked_ip = mask & client_ip
             if masked_ip in effects:
                 return effects[masked_ip]
         return None
 
     def add_effect(self, effect_type, effect_desc, effect_info):
-        if type(effect_desc) is tuple:
-            if type(effect_desc[0]) == str:
-                effect_desc = list(map(dottedQuadToLong, effect_desc))
-            long_ip, long_mask = effect_desc
-        else:
-            long_ip, long_mask = simpleMaskedIpToLongIpAndMask(effect_desc)
+        long_ip, long_mask = parse_effect_desc(effect_desc)
+        self._store_effect(effect_type, long_ip & long_mask, long_mask, effect_info)
+        self._schedule_expiry(effect_type, long_ip & long_mask, long_mask, effect_info, heapq.heappush)
+
+    def add_effects(self, effect_type, effects):
+        "Adds many (effect_desc, effect_info) pairs at once, heapifying their expiry times in one pass."
+        self.purge_expired()
+        scheduled_count = len(self._expiry_heap)
+        for effect_desc, effect_info in effects:
+            long_ip, long_mask = parse_effect_desc(effect_desc)
+            self._store_effect(effect_type, long_ip & long_mask, long_mask, effect_info)
+            self._schedule_expiry(effect_type, long_ip & long_mask, long_mask, effect_info, list.append)
+        if len(self._expiry_heap) != scheduled_count:
+            heapq.heapify(self._expiry_heap)
 
-        if effect_type not in self.punitive_effects:
-            self.punitive_effects[effect_type] = {}
+    def effect_count(self, effect_type):
+        count = len(self.punitive_effects.get(effect_type, ()))
+        for effects in self._masked_effects.get(effect_type, {}).values():
+            count += len(effects)
+        return count
 
-        if long_mask not in self.punitive_effects[effect_type]:
-            self.punitive_effects[effect_type][long_mask] = {}
+    def purge_expired(self):
+        heap = self._expiry_heap
+        if not heap: return
+        now = self._clock()
+        while heap and heap[0][0] < now:
+            _, _, effect_type, masked_ip, mask, effect_info = heapq.heappop(heap)
+            self._remove_effect(effect_type, masked_ip, mask, effect_info)
 
-        masked_ip = long_ip & long_mask
+    def _store_effect(self, effect_type, masked_ip, mask, effect_info):
+        prefix_length = prefix_length_of_mask(mask)
+        if prefix_length is not None:
+            cidr_table = self.punitive_effects.get(effect_type)
+            if cidr_table is None:
+                cidr_table = self.punitive_effects[effect_type] = CidrTable()
+            cidr_table.insert(masked_ip, prefix_length, effect_info)
+        else:
+            self._masked_effects.setdefault(effect_type, {}).setdefault(mask, {})[masked_ip] = effect_info
+
+    def _schedule_expiry(self, effect_type, masked_ip, mask, effect_info, push):
+        expiry_info = getattr(effect_info, 'expiry_info', None)
+        if not isinstance(expiry_info, TimedExpiryInfo):
+            return
+        self._expiry_sequence += 1
+        push(self._expiry_heap, (expiry_info.expiry_time, self._expiry_sequence, effect_type, masked_ip, mask, effect_info))
 
-        self.punitive_effects[effect_type][long_mask][masked_ip] = effect_info
+    def _remove_effect(self, effect_type, masked_ip, mask, effect_info):
+        # the range may have been given a new effect since this one was scheduled to expire
+        prefix_length = prefix_length_of_mask(mask)
+        if prefix_length is not None:
+            cidr_table = self.punitive_effects.get(effect_type)
+            if cidr_table is not None and cidr_table.get(masked_ip, prefix_length) is effect_info:
+                cidr_table.remove(masked_ip, prefix_length)
+        else:
+            effects = self._masked_effects.get(effect_type, {}).get(mask, {})
+            if effects.get(masked_ip) is effect_info:
+                del effects[masked_ip]
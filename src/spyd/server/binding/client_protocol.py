@@ -10,7 +10,7 @@ import enet
 
 
 class ClientProtocol(ENetClientProtocol):
-    def __init__(self, client_factory, message_processor, message_rate_limit, message_processing_execution_timer):
+    def __init__(self, client_factory, message_processor, message_rate_limit, message_processing_execution_timer, message_coalescer=None):
         self._client_factory = client_factory
         self._message_processor = message_processor
         self._message_processing_execution_timer = message_processing_execution_timer
@@ -20,6 +20,11 @@ class ClientProtocol(ENetClientProtocol):
         self._client = None
         self._disconnecting_later = None
 
+        self._message_coalescer = message_coalescer
+        self._outbound_queue = None
+        if message_coalescer is not None:
+            self._outbound_queue = message_coalescer.build_queue(self._send_now)
+
     def connectionMade(self):
         self._client = self._client_factory.build_client(self, self.transport.connected_port)
         self.factory.protocol_connected(self)
@@ -39,15 +44,18 @@ class ClientProtocol(ENetClientProtocol):
             self.disconnect(disconnect_types.DISC_MSGERR)
             return
 
-        for processed_message in processed_messages:
-            if not self._message_rate_limiter.check_drop():
-                self._client._message_received(*processed_message)
-            else:
-                self.disconnect(disconnect_types.DISC_OVERFLOW)
+        with self._client.room.time_snapshot():
+            for processed_message in processed_messages:
+                if not self._message_rate_limiter.check_drop():
+                    self._client._message_received(*processed_message)
+                else:
+                    self.disconnect(disconnect_types.DISC_OVERFLOW)
 
     def connectionLost(self, reason=connectionDone):
         self.factory.protocol_disconnected(self)
         self._client.disconnected()
+        if self._outbound_queue is not None:
+            self._message_coalescer.discard_queue(self._outbound_queue)
         ENetClientProtocol.connectionLost(self, reason=reason)
         if self._disconnecting_later is not None:
             self._disconnecting_later.cancel()
@@ -55,6 +63,8 @@ class ClientProtocol(ENetClientProtocol):
     def disconnect(self, disconnect_type):
         if self._disconnecting_later is not None:
             self._disconnecting_later = None
+        if self._outbound_queue is not None:
+            self._outbound_queue.flush()
         self.transport.disconnect(disconnect_type)
 
     def disconnect_with_message(self, disconnect_type, message=None, timeout=3.0):
@@ -62,5 +72,24 @@ class ClientProtocol(ENetClientProtocol):
             self._client.send_server_message(message or 'Goodbye')
         self._disconnecting_later = reactor.callLater(timeout, self.disconnect, disconnect_type)
 
+    def _send_now(self, channel, data, reliable, no_allocate=False):
+        return self.transport.send(channel, data, reliable, no_allocate)
+
     def send(self, channel, data, reliable, no_allocate=False):
+        outbound_queue = self._outbound_queue
+        if outbound_queue is not None:
+            if reliable:
+                return outbound_queue.queue(channel, data)
+            elif outbound_queue.has_pending(channel):
+                # Keep unreliable messages behind the reliable ones sent before them
+                outbound_queue.flush_channel(channel)
         return self.transport.send(channel, data, reliable, no_allocate)
+
+    def send_shared(self, channel, shared_packet):
+        outbound_queue = self._outbound_queue
+        if outbound_queue is not None:
+            if shared_packet.reliable:
+                return outbound_queue.queue(channel, shared_packet.data)
+            elif outbound_queue.has_pending(channel):
+                outbound_queue.flush_channel(channel)
+        return self.transport.send_shared(channel, shared_packet)
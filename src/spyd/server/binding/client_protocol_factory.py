@@ -5,11 +5,12 @@ from txENet.enet_peer_transport import ENetPeerTransport
 
 
 class ClientProtocolFactory(Factory):
-    def __init__(self, client_factory, message_processor, message_rate_limit, message_processing_execution_timer):
+    def __init__(self, client_factory, message_processor, message_rate_limit, message_processing_execution_timer, message_coalescer=None):
         self._client_factory = client_factory
         self._message_processor = message_processor
         self._message_rate_limit = message_rate_limit
         self._message_processing_execution_timer = message_processing_execution_timer
+        self._message_coalescer = message_coalescer
 
         self._connected_protocols = set()
 
@@ -17,7 +18,7 @@ class ClientProtocolFactory(Factory):
         peer = enet_connect_event.peer
 
         transport = ENetPeerTransport(peer)
-        protocol = ClientProtocol(self._client_factory, self._message_processor, self._message_rate_limit, self._message_processing_execution_timer)
+        protocol = ClientProtocol(self._client_factory, self._message_processor, self._message_rate_limit, self._message_processing_execution_timer, self._message_coalescer)
         protocol.factory = self
         protocol.makeConnection(transport)
         return protocol
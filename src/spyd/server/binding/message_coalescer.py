@@ -0,0 +1,45 @@
+import traceback
+
+from spyd.protocol.outbound_queue import OutboundQueue
+from spyd.server.metrics.rate_aggregator import RateAggregator
+
+
+class MessageCoalescer(object):
+    '''
+    Owns the per client outbound queues and flushes the ones with pending messages
+    when the bindings are flushed.
+    '''
+    def __init__(self, metrics_service, enabled=False, mtu=1200):
+        self.enabled = enabled
+        self.mtu = mtu
+
+        self._pending_queues = set()
+
+        self.packets_saved_rate_aggregator = RateAggregator(metrics_service, 'coalesced_packets_saved_rate', 1.0)
+
+    @staticmethod
+    def from_dictionary(metrics_service, config):
+        return MessageCoalescer(metrics_service, config.get('enabled', False), config.get('mtu', 1200))
+
+    def build_queue(self, send):
+        "Returns an OutboundQueue for a client or None if coalescing is disabled."
+        if not self.enabled: return None
+        return OutboundQueue(send, self.mtu, self._pending_queues.add)
+
+    def discard_queue(self, outbound_queue):
+        outbound_queue.clear()
+        self._pending_queues.discard(outbound_queue)
+
+    def flush(self):
+        pending_queues = self._pending_queues
+        self._pending_queues = set()
+
+        saved = 0
+        for outbound_queue in pending_queues:
+            try:
+                saved += outbound_queue.flush()
+            except:
+                traceback.print_exc()
+
+        if saved:
+            self.packets_saved_rate_aggregator.tick(saved)
@@ -1,4 +1,5 @@
 from spyd.game.player.player import Player
+from spyd.game.player.player_state import counter_names
 from spyd.permissions.functionality import Functionality
 from spyd.registry_manager import register
 
@@ -23,21 +24,9 @@ class SpydGetPlayerInfoMessageHandler(object):
             'is_spectator': state.is_spectator,
             'is_alive': state.is_alive,
             'has_quad': state.has_quad,
-            'frags': state.frags,
-            'deaths': state.deaths,
-            'suicides': state.suicides,
-            'teamkills': state.teamkills,
-            'damage_dealt': state.damage_dealt,
-            'damage_spent': state.damage_spent,
-            'flags': state.flags,
-            'flag_returns': state.flag_returns,
-            'health': state.health,
-            'maxhealth': state.maxhealth,
-            'armour': state.armour,
-            'armourtype': state.armourtype,
-            'gunselect': state.gunselect,
-            'ammo': state.ammo
         }
+        player_game_state.update(zip(counter_names, state.counters))
+        player_game_state['ammo'] = list(state.ammo)
 
         player_info = {
             'cn': player.cn,
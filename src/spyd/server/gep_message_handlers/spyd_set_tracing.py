@@ -0,0 +1,23 @@
+from spyd.permissions.functionality import Functionality
+from spyd.registry_manager import register
+from spyd.utils.tracing import tracer
+
+
+@register('gep_message_handler')
+class SpydSetTracingMessageHandler(object):
+    msgtype = 'set_tracing'
+    execute = Functionality(msgtype)
+
+    @classmethod
+    def handle_message(cls, spyd_server, gep_client, message):
+        target = message.get('target')
+        enabled = message.get('enabled', True)
+
+        if not enabled:
+            tracer.disable(target)
+        elif target is None:
+            raise Exception("A target is required to enable tracing.")
+        else:
+            tracer.enable(target, float(message.get('sample_rate', 1.0)))
+
+        gep_client.send({'msgtype': 'tracing', 'targets': tracer.targets, 'dropped': tracer.dropped}, message.get('reqid'))
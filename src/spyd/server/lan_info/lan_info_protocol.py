@@ -4,10 +4,12 @@ from cube2protocol.read_cube_data_stream import ReadCubeDataStream
 
 
 class LanInfoProtocol(DatagramProtocol):
-    def __init__(self, multicast=False, ext_info_enabled=True):
+    def __init__(self, multicast=False, ext_info_enabled=True, rate_limiter=None, dropped_rate_aggregator=None):
         self.lan_info_responders = []
         self.multicast = multicast
         self.ext_info_enabled = ext_info_enabled
+        self.rate_limiter = rate_limiter
+        self.dropped_rate_aggregator = dropped_rate_aggregator
         
     def startProtocol(self):
         if self.multicast:
@@ -17,6 +19,11 @@ class LanInfoProtocol(DatagramProtocol):
         self.lan_info_responders.append(lan_info_responder)
 
     def datagramReceived(self, data, address):
+        if self.rate_limiter is not None and not self.rate_limiter.allow(address[0]):
+            if self.dropped_rate_aggregator is not None:
+                self.dropped_rate_aggregator.tick()
+            return
+
         rcds = ReadCubeDataStream(data)
         millis = rcds.getint()
         if millis != 0:
@@ -1,4 +1,7 @@
+import weakref
+
 from cube2protocol.cube_data_stream import CubeDataStream
+from spyd.game.player.player_state import FRAGS, FLAGS, DEATHS, TEAMKILLS, HEALTH, ARMOUR, GUNSELECT
 from spyd.protocol import swh
 
 EXT_ACK = -1
@@ -21,6 +24,44 @@ def get_ext_info_reply_cds(rcds):
 
     return cds
 
+def encode_player_ids_body(players):
+    cds = CubeDataStream()
+    cds.putint(EXT_NO_ERROR)
+    cds.putint(EXT_PLAYERSTATS_RESP_IDS)
+    for player in players:
+        cds.putint(player.pn)
+    return bytes(cds)
+
+def encode_player_stats_body(player, send_ips):
+    cds = CubeDataStream()
+
+    cds.putint(EXT_NO_ERROR)
+
+    cds.putint(EXT_PLAYERSTATS_RESP_STATS)
+
+    state = player.state
+    counters = state.counters
+
+    cds.putint(player.pn)
+    cds.putint(player.ping)
+    cds.putstring(player.name)
+    cds.putstring(player.team_name)
+    cds.putints((counters[FRAGS], counters[FLAGS], counters[DEATHS], counters[TEAMKILLS], state.acc_percent_int,
+                 counters[HEALTH], counters[ARMOUR], counters[GUNSELECT]))
+    cds.putint(player.privilege)
+    cds.putint(state.state)
+
+    if send_ips:
+        ip = player.client.host
+        octs = ip.split('.')[:3]
+        for i in range(3):
+            cds.putbyte(int(octs[i]))
+    else:
+        for i in range(3):
+            cds.putbyte(0)
+
+    return bytes(cds)
+
 class LanInfoResponder(object):
     def __init__(self, room_manager, lan_info_protocol, room, ext_info_config):
         self.room_manager = room_manager
@@ -28,24 +69,31 @@ class LanInfoResponder(object):
         self.room = room
         self.config = ext_info_config
 
+        # room: (room flush count, encoded player ids)
+        self._player_ids_bodies = weakref.WeakKeyDictionary()
+
+        # the encoded info reply following the millis echo and the room values it was encoded from
+        self._info_reply_key = None
+        self._info_reply_body = None
+
     def info_request(self, address, millis):
         cds = CubeDataStream()
         cds.putint(millis)
-
-        swh.put_info_reply(
-            cds,
-            self.room.lan_info_name,
-            self.room.player_count,
-            self.room.maxplayers,
-            self.room.mode_num,
-            self.room.map_name,
-            self.room.timeleft,
-            self.room.mastermask,
-            self.room.is_paused,
-            100)
+        cds.write(self.get_info_reply_body())
 
         self.respond(bytes(cds), address)
 
+    def get_info_reply_body(self):
+        "Returns the encoded info reply, re-encoding it only when a value it carries has changed."
+        room = self.room
+        key = (room.lan_info_name, room.player_count, room.maxplayers, room.mode_num, room.map_name, room.timeleft, room.mastermask, room.is_paused)
+        if key != self._info_reply_key:
+            cds = CubeDataStream()
+            swh.put_info_reply(cds, *(key + (100,)))
+            self._info_reply_key = key
+            self._info_reply_body = bytes(cds)
+        return self._info_reply_body
+
     def ext_info_request(self, address, rcds):
         cmd = rcds.getint()
 
@@ -74,58 +122,34 @@ class LanInfoResponder(object):
         player = self.get_player(pn) if pn > 0 else None
 
         if player is None:
-            players = list(self.get_players(address))
+            room = self.get_room(address)
+            players = list(room.players)
+            ids_body = self.get_room_player_ids_body(room, players)
         else:
+            room = self.room
             players = [player]
+            ids_body = encode_player_ids_body(players)
 
-        self.ext_send_player_ids(address, rcds, players)
-        for player in players:
-            self.ext_send_player_stats(address, rcds, player)
-
-    def ext_send_player_ids(self, address, rcds, players):
-        cds = get_ext_info_reply_cds(rcds)
-
-        cds.putint(EXT_NO_ERROR)
-
-        cds.putint(EXT_PLAYERSTATS_RESP_IDS)
+        header = bytes(get_ext_info_reply_cds(rcds))
 
+        self.respond(header + ids_body, address)
         for player in players:
-            cds.putint(player.pn)
-
-        self.respond(bytes(cds), address)
-
-    def ext_send_player_stats(self, address, rcds, player):
-        cds = get_ext_info_reply_cds(rcds)
-
-        cds.putint(EXT_NO_ERROR)
-
-        cds.putint(EXT_PLAYERSTATS_RESP_STATS)
-
-        cds.putint(player.pn)
-        cds.putint(player.ping)
-        cds.putstring(player.name)
-        cds.putstring(player.team_name)
-        cds.putint(player.state.frags)
-        cds.putint(player.state.flags)
-        cds.putint(player.state.deaths)
-        cds.putint(player.state.teamkills)
-        cds.putint(player.state.acc_percent_int)
-        cds.putint(player.state.health)
-        cds.putint(player.state.armour)
-        cds.putint(player.state.gunselect)
-        cds.putint(player.privilege)
-        cds.putint(player.state.state)
-
-        if self.config.get('send_ips', True):
-            ip = player.client.host
-            octs = ip.split('.')[:3]
-            for i in range(3):
-                cds.putbyte(int(octs[i]))
-        else:
-            for i in range(3):
-                cds.putbyte(0)
-
-        self.respond(bytes(cds), address)
+            self.respond(header + self.get_player_stats_body(room, player), address)
+
+    def get_room_player_ids_body(self, room, players):
+        "Returns the encoded player ids of a room, re-encoding them at most once per room tick."
+        cached = self._player_ids_bodies.get(room)
+        if cached is None or cached[0] != room.flush_count:
+            cached = self._player_ids_bodies[room] = (room.flush_count, encode_player_ids_body(players))
+        return cached[1]
+
+    def get_player_stats_body(self, room, player):
+        "Returns the encoded stats of a player, re-encoding them at most once per room tick."
+        send_ips = self.config.get('send_ips', True)
+        cached = player.ext_info_stats
+        if cached is None or cached[0] != room.flush_count or cached[1] != send_ips:
+            cached = player.ext_info_stats = (room.flush_count, send_ips, encode_player_stats_body(player, send_ips))
+        return cached[2]
 
     def ext_team_stats_request(self, address, rcds):
         cds = get_ext_info_reply_cds(rcds)
@@ -154,12 +178,11 @@ class LanInfoResponder(object):
     def get_player(self, pn):
         return self.room.get_player(pn)
 
-    def get_players(self, address):
+    def get_room(self, address):
         """
         Find if there is a room containing a client with this address.
-        If there is then return the clients in that room. Otherwise,
-        return the clients in the room which is associated with this
-        responder.
+        If there is then return that room. Otherwise, return the room
+        which is associated with this responder.
         """
         room = None
 
@@ -169,4 +192,4 @@ class LanInfoResponder(object):
         if room is None:
             room = self.room
 
-        return room.players
+        return room
@@ -3,22 +3,33 @@ from twisted.internet import reactor
 
 from spyd.server.lan_info.lan_info_protocol import LanInfoProtocol
 from spyd.server.lan_info.lan_info_responder import LanInfoResponder
+from spyd.server.lan_info.source_rate_limiter import SourceRateLimiter
+from spyd.server.metrics.rate_aggregator import RateAggregator
 
 
 class LanInfoService(service.Service):
-    def __init__(self, room_manager, lan_findable, ext_info_config):
+    def __init__(self, room_manager, lan_findable, ext_info_config, metrics_service=None, rate_limit_config=None):
         self.room_manager = room_manager
         self.rooms_ports = {}
         self.ext_info_config = ext_info_config
+
+        # one limiter per port; a tracker polling every room sends a few requests to each port
+        self.rate_limit_config = None
+        self.dropped_rate_aggregator = None
+        if rate_limit_config is not None and rate_limit_config.get('enabled', True):
+            self.rate_limit_config = rate_limit_config
+            if metrics_service is not None:
+                self.dropped_rate_aggregator = RateAggregator(metrics_service, 'lan_info_dropped_rate', 1.0)
+
         self.broadcast_listener = None
         if lan_findable:
-            self.broadcast_listener = LanInfoProtocol(multicast=True, ext_info_enabled=self.ext_info_config['enabled'])
+            self.broadcast_listener = self._build_protocol(multicast=True)
 
         self._listeners = []
 
     def startService(self):
         for room, (interface, port) in self.rooms_ports.items():
-            lan_info_protocol = LanInfoProtocol(multicast=False, ext_info_enabled=self.ext_info_config['enabled'])
+            lan_info_protocol = self._build_protocol(multicast=False)
 
             lan_info_responder = LanInfoResponder(self.room_manager, lan_info_protocol, room, self.ext_info_config)
             lan_info_protocol.add_responder(lan_info_responder)
@@ -40,5 +51,11 @@ class LanInfoService(service.Service):
             listener.stopListening()
         service.Service.stopService(self)
 
+    def _build_protocol(self, multicast):
+        rate_limiter = None
+        if self.rate_limit_config is not None:
+            rate_limiter = SourceRateLimiter.from_dictionary(self.rate_limit_config)
+        return LanInfoProtocol(multicast=multicast, ext_info_enabled=self.ext_info_config['enabled'], rate_limiter=rate_limiter, dropped_rate_aggregator=self.dropped_rate_aggregator)
+
     def add_lan_info_for_room(self, room, interface, port):
         self.rooms_ports[room] = (interface, port + 1)
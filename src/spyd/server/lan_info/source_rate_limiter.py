@@ -0,0 +1,59 @@
+from collections import OrderedDict
+
+from twisted.internet import reactor
+
+
+class SourceRateLimiter(object):
+    '''
+    A token bucket per source ip.
+
+    Each source may send burst requests at once and then rate requests per second.
+    At most max_sources buckets are kept, in least recently used order. A new source
+first forgets the sources whose buckets have refilled and then, if the table is
+still full, the least recently seen one, so a flood of spoofed sources costs O(1)
+per datagram and a bounded amount of memory.
+    '''
+    def __init__(self, rate=4.0, burst=16, max_sources=4096, clock=reactor):
+        self.rate = rate
+        self.burst = burst
+        self.max_sources = max_sources
+        self.clock = clock
+
+        # ip: [tokens, last refill time], least recently seen first
+        self._buckets = OrderedDict()
+
+        self.allowed_count = 0
+        self.dropped_count = 0
+
+    @staticmethod
+    def from_dictionary(config, clock=reactor):
+        return SourceRateLimiter(config.get('rate', 4.0), config.get('burst', 16), config.get('max_sources', 4096), clock)
+
+    def allow(self, ip):
+        now = self.clock.seconds()
+
+        bucket = self._buckets.get(ip)
+        if bucket is None:
+            if len(self._buckets) >= self.max_sources:
+                self._forget_idle_sources(now)
+            bucket = self._buckets[ip] = [self.burst, now]
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            self._buckets.move_to_end(ip)
+
+        if bucket[0] < 1:
+            self.dropped_count += 1
+            return False
+
+        bucket[0] -= 1
+        self.allowed_count += 1
+        return True
+
+    def _forget_idle_sources(self, now):
+        buckets = self._buckets
+        refill_time = self.burst / self.rate
+        while buckets and now - next(iter(buckets.values()))[1] >= refill_time:
+            buckets.popitem(last=False)
+        if len(buckets) >= self.max_sources:
+            buckets.popitem(last=False)
@@ -23,6 +23,13 @@ class ExecutionTimer(object):
             self._looping_call.start(self._publish_interval)
             self._started = True
 
+    def stop(self):
+        "Publishes any pending measurements and stops publishing until the next measurement."
+        if self._started:
+            self._publish_metric()
+            self._looping_call.stop()
+            self._started = False
+
     @contextlib.contextmanager
     def measure(self):
         self._ensure_started()
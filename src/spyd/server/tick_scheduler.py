@@ -0,0 +1,145 @@
+import traceback
+
+from twisted.application import service
+from twisted.internet import reactor
+
+from spyd.server.metrics.rate_aggregator import RateAggregator
+
+
+class _RoomEntry(object):
+    __slots__ = ('room', 'interval', 'next_tick')
+
+    def __init__(self, room, interval, next_tick):
+        self.room = room
+        self.interval = interval
+        self.next_tick = next_tick
+
+
+class TickScheduler(service.Service):
+    '''
+    Drives the server tick. Each tick the registered rooms flush their messages,
+    in the order they were added, and then the flushers (bindings) are flushed.
+
+    Ticks are scheduled against an ideal timeline; when the scheduler falls behind
+    it catches up by running late ticks back to back, unless it is more than
+    max_catch_up_ticks behind in which case the missed ticks are skipped.
+
+    Rooms may have a lower tick rate than the server, in which case they are
+    flushed on the first server tick at or after their own tick is due.
+    '''
+    def __init__(self, metrics_service, tick_rate=30, max_catch_up_ticks=3, reactor=reactor):
+        self._reactor = reactor
+        self.interval = 1.0 / tick_rate
+        self.max_catch_up_ticks = max_catch_up_ticks
+
+        self._room_entries = []
+        self._flushers = []
+
+        self._next_tick = None
+        self._delayed_call = None
+
+        self._last_drift = None
+        self._drift_samples = []
+        self._jitter_samples = []
+
+        self.tick_rate_aggregator = RateAggregator(metrics_service, 'tick_rate', 1.0)
+        self.skipped_tick_rate_aggregator = RateAggregator(metrics_service, 'skipped_tick_rate', 1.0)
+        metrics_service.register_repeating_metric('tick_drift', 1.0, self._get_and_clear_drift)
+        metrics_service.register_repeating_metric('tick_jitter', 1.0, self._get_and_clear_jitter)
+
+    def add_room(self, room, tick_rate=None):
+        if self.has_room(room): return
+        interval = self.interval if tick_rate is None else max(self.interval, 1.0 / tick_rate)
+        self._room_entries.append(_RoomEntry(room, interval, self._reactor.seconds()))
+
+    def remove_room(self, room):
+        self._room_entries = [entry for entry in self._room_entries if entry.room is not room]
+
+    def has_room(self, room):
+        return any(entry.room is room for entry in self._room_entries)
+
+    @property
+    def rooms(self):
+        return [entry.room for entry in self._room_entries]
+
+    def add_flusher(self, flusher):
+        "Adds a callable which is called at the end of every tick after the rooms have been flushed."
+        self._flushers.append(flusher)
+
+    def startService(self):
+        self._next_tick = self._reactor.seconds()
+        self._schedule()
+        service.Service.startService(self)
+
+    def stopService(self):
+        if self._delayed_call is not None and self._delayed_call.active():
+            self._delayed_call.cancel()
+        self._delayed_call = None
+        service.Service.stopService(self)
+
+    def _schedule(self):
+        delay = max(0, self._next_tick - self._reactor.seconds())
+        self._delayed_call = self._reactor.callLater(delay, self._run)
+
+    def _run(self):
+        now = self._reactor.seconds()
+
+        drift = now - self._next_tick
+        self._drift_samples.append(drift)
+        if self._last_drift is not None:
+            self._jitter_samples.append(abs(drift - self._last_drift))
+        self._last_drift = drift
+
+        self.tick(now)
+
+        self._next_tick += self.interval
+
+        now = self._reactor.seconds()
+        late = now - self._next_tick
+        if late > self.max_catch_up_ticks * self.interval:
+            self.skipped_tick_rate_aggregator.tick(int(late / self.interval))
+            self._next_tick = now + self.interval
+
+        self._schedule()
+
+    def tick(self, now=None):
+        if now is None:
+            now = self._reactor.seconds()
+
+        decommissioned = False
+        for entry in self._room_entries:
+            room = entry.room
+            if room.decommissioned:
+                decommissioned = True
+                continue
+            # Allow half a server tick of slack so rooms at the server rate never miss a tick to rounding
+            if now + self.interval / 2 < entry.next_tick:
+                continue
+            entry.next_tick = max(entry.next_tick + entry.interval, now)
+            try:
+                room.flush_messages()
+            except:
+                traceback.print_exc()
+
+        if decommissioned:
+            self._room_entries = [entry for entry in self._room_entries if not entry.room.decommissioned]
+
+        for flusher in self._flushers:
+            try:
+                flusher()
+            except:
+                traceback.print_exc()
+
+        self.tick_rate_aggregator.tick()
+
+    def _get_and_clear_drift(self):
+        samples = self._drift_samples
+        self._drift_samples = []
+        if not samples: return 0
+        return sum(samples) / float(len(samples))
+
+    def _get_and_clear_jitter(self):
+        samples = self._jitter_samples
+        self._jitter_samples = []
+        if not samples: return 0
+        return max(samples)
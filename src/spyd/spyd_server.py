@@ -15,6 +15,9 @@ from spyd.game.client.client_factory import ClientFactory
 from spyd.game.client.client_number_provider import get_client_number_handle_provider
 from spyd.game.command.command_executer import CommandExecuter
 from spyd.game.map.async_map_meta_data_accessor import AsyncMapMetaDataAccessor
+from spyd.game.map.map_catalog import MapCatalog
+from spyd.game.map.map_data_worker_pool import MapDataWorkerPool
+from spyd.game.map.map_warm_up import MapWarmUp, collect_map_names
 from spyd.game.room.room_bindings import RoomBindings
 from spyd.game.room.room_factory import RoomFactory
 from spyd.game.room.room_manager import RoomManager
@@ -24,9 +27,12 @@ from spyd.punitive_effects.punitive_model import PunitiveModel
 from spyd.registry_manager import RegistryManager
 from spyd.server.binding.binding_service import BindingService
 from spyd.server.binding.client_protocol_factory import ClientProtocolFactory
+from spyd.server.binding.message_coalescer import MessageCoalescer
 import spyd.server.gep_message_handlers  # @UnusedImport
 from spyd.server.metrics import get_metrics_service
 from spyd.server.metrics.execution_timer import ExecutionTimer
+from spyd.server.tick_scheduler import TickScheduler
+from spyd.utils.tracing import tracer
 from spyd.utils.value_model import ValueModel
 
 
@@ -35,6 +41,9 @@ logger = logging.getLogger(__name__)
 def get_package_dir(config):
     return config.get('packages_directory', "{}/git/spyd/packages".format(os.environ['HOME']))
 
+def get_default_map_catalog_path(package_dir):
+    return os.path.join(os.path.dirname(os.path.normpath(package_dir)), 'spyd_map_catalog.pkl')
+
 class SpydServer(object):
     def __init__(self, config):
         self.root_service = service.MultiService()
@@ -46,15 +55,22 @@ class SpydServer(object):
         self.server_info_model = ValueModel(config.get('server_info', "An Spyd Server!"))
 
         sauerbraten_package_dir = get_package_dir(config)
-        map_meta_data_accessor = AsyncMapMetaDataAccessor(sauerbraten_package_dir)
+        map_worker_config = config.get('map_workers', {})
+        map_data_worker_pool = MapDataWorkerPool(map_worker_config.get('size', 2), map_worker_config.get('timeout', 30.0))
+        map_catalog = MapCatalog(config.get('map_catalog', get_default_map_catalog_path(sauerbraten_package_dir)))
+        map_catalog.load()
+        map_meta_data_accessor = AsyncMapMetaDataAccessor(sauerbraten_package_dir, map_data_worker_pool, map_catalog)
+        reactor.addSystemEventTrigger('before', 'shutdown', map_meta_data_accessor.stop)
         print("Using package directory; {!r}".format(sauerbraten_package_dir))
 
         self.event_subscription_fulfiller = EventSubscriptionFulfiller()
 
         command_executer = CommandExecuter(self)
 
+        self.tick_scheduler = TickScheduler(self.metrics_service, config.get('tick_rate', 30), config.get('max_catch_up_ticks', 3))
+
         self.room_manager = RoomManager()
-        self.room_factory = RoomFactory(config, self.room_manager, self.server_name_model, map_meta_data_accessor, command_executer, self.event_subscription_fulfiller, self.metrics_service)
+        self.room_factory = RoomFactory(config, self.room_manager, self.server_name_model, map_meta_data_accessor, command_executer, self.event_subscription_fulfiller, self.metrics_service, self.tick_scheduler)
         self.room_bindings = RoomBindings()
 
         self.permission_resolver = PermissionResolver.from_dictionary(config.get('permissions'))
@@ -71,17 +87,24 @@ class SpydServer(object):
         client_number_handle_provider = get_client_number_handle_provider(config)
         self.client_factory = ClientFactory(client_number_handle_provider, self.room_bindings, self.auth_world_view_factory, self.permission_resolver, self.event_subscription_fulfiller, self.connect_auth_domain, self.punitive_model)
 
-        self.client_protocol_factory = ClientProtocolFactory(self.client_factory, self.message_processor, config.get('client_message_rate_limit', 200), message_processing_execution_timer)
+        self.message_coalescer = MessageCoalescer.from_dictionary(self.metrics_service, config.get('message_coalescing', {}))
+
+        self.client_protocol_factory = ClientProtocolFactory(self.client_factory, self.message_processor, config.get('client_message_rate_limit', 200), message_processing_execution_timer, self.message_coalescer)
 
-        self.binding_service = BindingService(self.client_protocol_factory, self.metrics_service)
-        self.binding_service.setServiceParent(self.root_service)
+        self.binding_service = BindingService(self.client_protocol_factory, self.metrics_service, self.message_coalescer)
 
-        self.lan_info_service = LanInfoService(self.room_manager, config['lan_findable'], config['ext_info'])
+        self.tick_scheduler.add_flusher(self.binding_service.flush_all)
+        self.tick_scheduler.setServiceParent(self.root_service)
+
+        self.lan_info_service = LanInfoService(self.room_manager, config['lan_findable'], config['ext_info'], self.metrics_service, config.get('lan_info_rate_limit'))
         self.lan_info_service.setServiceParent(self.root_service)
 
         self._initialize_master_clients(config)
         self._initialize_rooms(config)
         self._initialize_gep_endpoints(config)
+        self._initialize_bindings(config, map_meta_data_accessor)
+
+        tracer.configure(config.get('tracing', {}))
 
         reactor.addSystemEventTrigger("before", "shutdown", self._before_shutdown, config)
 
@@ -105,6 +128,30 @@ class SpydServer(object):
             self.room_bindings.add_room(port, room, default_room)
             self.lan_info_service.add_lan_info_for_room(room, interface, port)
 
+    def _initialize_bindings(self, config, map_meta_data_accessor):
+        warm_up_config = config.get('map_warm_up', {})
+        if not warm_up_config.get('enabled', False):
+            self.binding_service.setServiceParent(self.root_service)
+            return
+
+        map_lists = warm_up_config.get('map_lists', {}).values()
+        map_names = collect_map_names(self.room_factory.get_map_rotations(), map_lists)
+        map_warm_up = MapWarmUp(map_meta_data_accessor, warm_up_config.get('concurrency', config.get('map_workers', {}).get('size', 2)))
+
+        def warmed_up(report):
+            for line in report.format_lines(warm_up_config.get('report_slowest', 10)):
+                print(line)
+
+        def start_bindings(_):
+            self.binding_service.setServiceParent(self.root_service)
+
+        # Clients are only accepted once the maps are cached, but a failed warm up should not keep the server closed
+        def warm_up():
+            print("Warming up {} maps.".format(len(map_names)))
+            map_warm_up.warm_up(map_names).addCallback(warmed_up).addErrback(lambda failure: failure.printTraceback()).addBoth(start_bindings)
+
+        reactor.callWhenRunning(warm_up)
+
     def _initialize_master_clients(self, config):
         for master_server_config in config['master_servers']:
             if not master_server_config.get('enabled', True): continue
@@ -122,10 +169,15 @@ class SpydServer(object):
             message_handlers[message_handler.msgtype] = message_handler
 
         gep_service_factory = txCascil.ServerServiceFactory()
-        for gep_config in config['gep_endpoints'].values():
+        for gep_name, gep_config in config['gep_endpoints'].items():
             gep_service = gep_service_factory.build_service(self, gep_config, message_handlers, self.permission_resolver, self.event_subscription_fulfiller)
             gep_service.setServiceParent(self.root_service)
 
+            send_queue_stats = gep_service.send_queue_stats
+            self.metrics_service.register_repeating_metric('gep.{}.events_dropped'.format(gep_name), 1.0, send_queue_stats.get_and_reset_dropped_count)
+            self.metrics_service.register_repeating_metric('gep.{}.send_queue_lag'.format(gep_name), 1.0, send_queue_stats.get_and_reset_max_lag)
+            self.metrics_service.register_repeating_metric('gep.{}.send_queue_pending'.format(gep_name), 1.0, lambda send_queue_stats=send_queue_stats: send_queue_stats.pending_count)
+
     def _before_shutdown(self, config):
         shutdown_countdown = config.get('shutdown_countdown', 3)
 
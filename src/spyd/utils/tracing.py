@@ -1,83 +1,193 @@
+import collections
+import functools
+import inspect
+import itertools
 import logging
+import random
+import time
+import traceback
+import types
+
+from twisted.internet import task
 
-logger = None
-indent = 0
-
-def setup_logger(filename):
-    global logger
-    assert logger is None
-
-    logging.basicConfig(level = logging.DEBUG)
-
-    console = logging.FileHandler(filename)
-    console.setLevel(logging.DEBUG)
-    # formatter = logging.Formatter('%(asctime)s | %(levelname)s: %(message)s')
-    formatter = logging.Formatter('%(message)s')
-    console.setFormatter(formatter)
-
-    logger = logging.getLogger('debug')
-    logger.addHandler(console)
-
-def started(f_id, func, args, kw):
-    global indent
-    indent += 2
-    bg = f"{' '*(indent-2)}|\n{' '*(indent-2)}+-> |START|{f_id}| "
-    printExecution(bg, func, f'{args}, {kw}')
-
-def ended(f_id, func):
-    global indent
-    indent -= 2
-    bg = f"{' '*(indent)}+{' '*(indent)} | END |{f_id}| "
-    printExecution(bg, func, '')
-
-def raised(f_id, func, e):
-    global indent
-    indent -= 2
-    bg = f"{' '*(indent)}+{' '*(indent)} | RAISE |{f_id}| "
-    printExecution(bg, func, '{'+str(e)+'}')
-
-def printExecution(beginStr, func, argStr):
-    assert logger is not None
-    logger.debug(f"{beginStr} {func}: {argStr}")
-
-def function_id(func, args, kwargs):
-    from hashlib import md5
-
-    data = f"{id(func)}|{args}|{kwargs}".encode('utf-8')
-    return md5(data).hexdigest()
-
-progressiveId = 0
-
-def tracer(func):
-    def dump_exception(fname, e):
-        from pickle import dump
-        with open(fname, 'wb') as fp:
-            dump(e, fp) # one at time, read it until eof
-
-    def inner(*args, **kwargs):
-        import traceback
-        # f_id = function_id(func, args, kwargs)
-        global progressiveId
-        progressiveId += 1
-        f_id = progressiveId
-        started(f_id, func, args, kwargs)
-        try:
-            res = func(*args, **kwargs)
-            ended(f_id, func)
-            return res
-        except Exception as e:
-            raised(f_id, func, e)
-            tb = traceback.format_exc()
-            dump_exception('tracing.pickle', (e, tb))
-            raise e
-    return inner
-
-def decorator_to_all_members(cls, dec):
-    import inspect
-    import types
-    for name, fn in inspect.getmembers(cls):
-        if isinstance(fn, types.FunctionType):
-            setattr(cls, name, dec(fn))
+
+_MISSING = object()
+
+TraceRecord = collections.namedtuple('TraceRecord', ['id', 'time', 'depth', 'event', 'name', 'detail'])
+
+
+class Tracer(object):
+    '''
+    Opt-in method call tracing.
+
+    Classes are registered with trace_class but are left untouched until tracing
+    is enabled for them, so there is no overhead while tracing is off.
+    Targets are either a class name or "ClassName.method_name", each with a
+    sampling rate. Trace records are appended to a bounded ring buffer and
+    written out periodically by the writer instead of being logged inline.
+    '''
+    def __init__(self, buffer_size=10000):
+        # class name: class
+        self._classes = {}
+
+        # target: sample rate
+        self._targets = {}
+
+        # (class, method name): previous value in the class __dict__
+        self._wrapped = {}
+
+        self.records = collections.deque(maxlen=buffer_size)
+        self.dropped = 0
+
+        self._ids = itertools.count(1)
+        self._depth = 0
+
+        self._writer_looping_call = None
+        self._logger = None
+
+    @property
+    def enabled(self):
+        return bool(self._targets)
+
+    @property
+    def targets(self):
+        return dict(self._targets)
+
+    def register_class(self, cls):
+        self._classes[cls.__name__] = cls
+        for target, sample_rate in self._targets.items():
+            if target.split('.')[0] == cls.__name__:
+                self._wrap_target(target, sample_rate)
+
+    def enable(self, target, sample_rate=1.0):
+        class_name = target.split('.')[0]
+        if class_name not in self._classes:
+            raise KeyError("Unknown trace target {!r}.".format(target))
+        self._targets[target] = sample_rate
+        self._rewrap()
+
+    def disable(self, target=None):
+        if target is None:
+            self._targets.clear()
+        else:
+            self._targets.pop(target, None)
+        self._rewrap()
+
+    def configure(self, config):
+        "Applies a tracing config dictionary; {'enabled': bool, 'buffer_size': int, 'log_file': str, 'flush_interval': float, 'targets': {target: sample_rate}}"
+        if 'buffer_size' in config:
+            self.records = collections.deque(self.records, maxlen=config['buffer_size'])
+
+        self.disable()
+        if not config.get('enabled', False):
+            return
+
+        # Classes which have not been imported yet are wrapped when they are registered
+        self._targets.update(config.get('targets', {}))
+        self._rewrap()
+
+        if config.get('log_file'):
+            self.start_writer(config['log_file'], config.get('flush_interval', 1.0))
+
+    def _rewrap(self):
+        for (cls, name), previous in list(self._wrapped.items()):
+            if previous is _MISSING:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, previous)
+        self._wrapped.clear()
+
+        for target, sample_rate in self._targets.items():
+            self._wrap_target(target, sample_rate)
+
+    def _wrap_target(self, target, sample_rate):
+        class_name, _, method_name = target.partition('.')
+        cls = self._classes.get(class_name)
+        if cls is None: return
+
+        for name, fn in inspect.getmembers(cls):
+            if method_name and name != method_name: continue
+            if not isinstance(fn, types.FunctionType): continue
+            if (cls, name) in self._wrapped: continue
+
+            self._wrapped[(cls, name)] = cls.__dict__.get(name, _MISSING)
+            setattr(cls, name, self._build_wrapper(getattr(fn, '__traced__', fn), "{}.{}".format(class_name, name), sample_rate))
+
+    def _build_wrapper(self, fn, name, sample_rate):
+        record = self._record
+
+        @functools.wraps(fn)
+        def traced(*args, **kwargs):
+            if sample_rate < 1.0 and random.random() >= sample_rate:
+                return fn(*args, **kwargs)
+
+            call_id = next(self._ids)
+            record(call_id, 'start', name, (args, kwargs))
+            self._depth += 1
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                self._depth -= 1
+                record(call_id, 'raise', name, traceback.format_exc())
+                raise
+            self._depth -= 1
+            record(call_id, 'end', name, None)
+            return result
+
+        traced.__traced__ = fn
+        return traced
+
+    def _record(self, call_id, event, name, detail):
+        records = self.records
+        if len(records) == records.maxlen:
+            self.dropped += 1
+        records.append(TraceRecord(call_id, time.time(), self._depth, event, name, detail))
+
+    def drain(self):
+        "Removes and returns the buffered records, oldest first."
+        records = []
+        while self.records:
+            records.append(self.records.popleft())
+        return records
+
+    def start_writer(self, filename, interval=1.0):
+        if self._writer_looping_call is not None: return
+
+        self._logger = logging.getLogger('spyd.trace')
+        self._logger.propagate = False
+        handler = logging.FileHandler(filename)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self._logger.addHandler(handler)
+        self._logger.setLevel(logging.DEBUG)
+
+        self._writer_looping_call = task.LoopingCall(self.write_records)
+        self._writer_looping_call.start(interval, now=False)
+
+    def stop_writer(self):
+        if self._writer_looping_call is None: return
+        self._writer_looping_call.stop()
+        self._writer_looping_call = None
+        self.write_records()
+
+    def write_records(self):
+        if self._logger is None: return
+        for trace_record in self.drain():
+            self._logger.debug(format_record(trace_record))
+
+def format_record(trace_record):
+    indent = ' ' * (trace_record.depth * 2)
+    if trace_record.event == 'start':
+        args, kwargs = trace_record.detail
+        detail = "{}, {}".format(args, kwargs)
+    elif trace_record.event == 'raise':
+        detail = trace_record.detail
+    else:
+        detail = ''
+    return "{:.6f} {}|{}|{}| {}: {}".format(trace_record.time, indent, trace_record.event.upper(), trace_record.id, trace_record.name, detail)
+
+tracer = Tracer()
 
 def trace_class(cls):
-    decorator_to_all_members(cls, tracer)
+    "Makes a class available for tracing. The class is not modified unless tracing is enabled for it."
+    tracer.register_class(cls)
+    return cls
@@ -11,6 +11,24 @@ class Subscription(object):
 class SubscriptionError(Exception): pass
 
 
+class PublishedEvent(object):
+    "An event as sent to subscribers, encoded at most once per protocol encoding."
+    def __init__(self, event_stream, data):
+        self.event_stream = event_stream
+        self.data = data
+        self.message = {"msgtype": "event", "event_stream": event_stream, "event_data": data}
+
+        # encoding key: encoded bytes
+        self._encoded = {}
+
+    def encoded(self, protocol):
+        encoding_key = protocol.encoding_key
+        encoded = self._encoded.get(encoding_key)
+        if encoded is None:
+            encoded = self._encoded[encoding_key] = protocol.encode(self.message)
+        return encoded
+
+
 class EventSubscriptionFulfiller(object):
     def __init__(self):
         # event_stream: set(handlers)
@@ -26,8 +44,13 @@ class EventSubscriptionFulfiller(object):
         self._subscriptions.get(event_stream, set()).discard(event_handler)
 
     def publish(self, event_stream, data):
-        for event_handler in self._subscriptions.get(event_stream, ()):
+        "Calls each handler subscribed to the event stream with one PublishedEvent shared by all of them."
+        event_handlers = self._subscriptions.get(event_stream)
+        if not event_handlers: return
+
+        published_event = PublishedEvent(event_stream, data)
+        for event_handler in list(event_handlers):
             try:
-                event_handler(event_stream, data)
+                event_handler(published_event)
             except SubscriptionError:
                 self.unsubscribe(event_stream, event_handler)
@@ -1 +1,3 @@
-class AuthenticationHardFailure(Exception): pass
\ No newline at end of file
+class AuthenticationHardFailure(Exception): pass
+
+class PackingError(Exception): pass
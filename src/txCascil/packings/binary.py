@@ -0,0 +1,213 @@
+'''
+A length prefixed binary packing of the json and edn data model.
+
+Every message starts with a magic byte and a format version so a peer configured
+with another packing fails on the first message instead of misreading it. Each
+value is a one byte tag followed by a fixed width payload, or a length and then
+the payload for strings and collections. Small ints, short strings and small
+collections use one byte lengths, with their headers precomputed.
+'''
+import decimal
+import struct
+
+from txCascil.exceptions import PackingError
+from txCascil.registry_manager import register
+
+
+MAGIC = 0xc5
+VERSION = 1
+HEADER = bytes((MAGIC, VERSION))
+
+NIL = ord('N')
+TRUE = ord('T')
+FALSE = ord('F')
+UINT8 = ord('b')
+INT32 = ord('i')
+INT64 = ord('q')
+BIG_INT = ord('I')
+FLOAT = ord('d')
+SHORT_STRING = ord('s')
+STRING = ord('S')
+KEYWORD = ord('k')
+DECIMAL = ord('M')
+SHORT_LIST = ord('l')
+LIST = ord('L')
+SHORT_MAP = ord('m')
+MAP = ord('D')
+SHORT_SET = ord('e')
+SET = ord('E')
+
+_int32 = struct.Struct('>bi')
+_int64 = struct.Struct('>bq')
+_float = struct.Struct('>bd')
+_length = struct.Struct('>bI')
+_unpack_int32 = struct.Struct('>i').unpack_from
+_unpack_int64 = struct.Struct('>q').unpack_from
+_unpack_float = struct.Struct('>d').unpack_from
+_unpack_length = struct.Struct('>I').unpack_from
+
+_INT32_MIN, _INT32_MAX = -2 ** 31, 2 ** 31 - 1
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+def _short_headers(tag):
+    return [bytes((tag, length)) for length in range(256)]
+
+_SMALL_INTS = _short_headers(UINT8)
+_SHORT_STRING_HEADERS = _short_headers(SHORT_STRING)
+_SHORT_LIST_HEADERS = _short_headers(SHORT_LIST)
+_SHORT_MAP_HEADERS = _short_headers(SHORT_MAP)
+_SHORT_SET_HEADERS = _short_headers(SHORT_SET)
+
+_NIL = bytes((NIL,))
+_TRUE = bytes((TRUE,))
+_FALSE = bytes((FALSE,))
+
+
+def _pack_int(value, append):
+    if 0 <= value < 256:
+        append(_SMALL_INTS[value])
+    elif _INT32_MIN <= value <= _INT32_MAX:
+        append(_int32.pack(INT32, value))
+    elif _INT64_MIN <= value <= _INT64_MAX:
+        append(_int64.pack(INT64, value))
+    else:
+        _pack_text(BIG_INT, str(value), append)
+
+def _pack_text(tag, text, append):
+    data = text.encode('ascii')
+    append(_length.pack(tag, len(data)))
+    append(data)
+
+def _pack_string(value, append):
+    data = value.encode('utf-8')
+    if len(data) < 256:
+        append(_SHORT_STRING_HEADERS[len(data)])
+    else:
+        append(_length.pack(STRING, len(data)))
+    append(data)
+
+def _pack_value(value, append):
+    value_type = type(value)
+
+    if value_type is str:
+        _pack_string(value, append)
+    elif value_type is int:
+        _pack_int(value, append)
+    elif value_type is bool:
+        append(_TRUE if value else _FALSE)
+    elif value is None:
+        append(_NIL)
+    elif value_type is float:
+        append(_float.pack(FLOAT, value))
+    elif isinstance(value, dict):
+        count = len(value)
+        append(_SHORT_MAP_HEADERS[count] if count < 256 else _length.pack(MAP, count))
+        for key, item in value.items():
+            _pack_value(key, append)
+            _pack_value(item, append)
+    elif isinstance(value, (list, tuple)):
+        count = len(value)
+        append(_SHORT_LIST_HEADERS[count] if count < 256 else _length.pack(LIST, count))
+        for item in value:
+            _pack_value(item, append)
+    elif isinstance(value, (set, frozenset)):
+        count = len(value)
+        append(_SHORT_SET_HEADERS[count] if count < 256 else _length.pack(SET, count))
+        for item in value:
+            _pack_value(item, append)
+    elif isinstance(value, bool):
+        append(_TRUE if value else _FALSE)
+    elif isinstance(value, int):
+        _pack_int(value, append)
+    elif isinstance(value, float):
+        append(_float.pack(FLOAT, value))
+    elif isinstance(value, decimal.Decimal):
+        _pack_text(DECIMAL, str(value), append)
+    else:
+        # like the text packings, anything else travels as its string form
+        _pack_string(str(value), append)
+
+def _unpack_items(data, offset, count):
+    items = []
+    append = items.append
+    for _ in range(count):
+        item, offset = _unpack_value(data, offset)
+        append(item)
+    return items, offset
+
+def _unpack_map(data, offset, count):
+    value = {}
+    for _ in range(count):
+        key, offset = _unpack_value(data, offset)
+        value[key], offset = _unpack_value(data, offset)
+    return value, offset
+
+def _unpack_set(data, offset, count):
+    items, offset = _unpack_items(data, offset, count)
+    try:
+        return set(items), offset
+    except TypeError:
+        return tuple(items), offset
+
+def _unpack_value(data, offset):
+    "Returns the value starting at offset and the offset following it."
+    tag = data[offset]
+
+    if tag == SHORT_STRING or tag == KEYWORD:
+        end = offset + 2 + data[offset + 1]
+        return data[offset + 2:end].decode('utf-8'), end
+    elif tag == UINT8:
+        return data[offset + 1], offset + 2
+    elif tag == SHORT_MAP:
+        return _unpack_map(data, offset + 2, data[offset + 1])
+    elif tag == SHORT_LIST:
+        return _unpack_items(data, offset + 2, data[offset + 1])
+    elif tag == TRUE:
+        return True, offset + 1
+    elif tag == FALSE:
+        return False, offset + 1
+    elif tag == NIL:
+        return None, offset + 1
+    elif tag == INT32:
+        return _unpack_int32(data, offset + 1)[0], offset + 5
+    elif tag == FLOAT:
+        return _unpack_float(data, offset + 1)[0], offset + 9
+    elif tag == STRING:
+        end = offset + 5 + _unpack_length(data, offset + 1)[0]
+        return data[offset + 5:end].decode('utf-8'), end
+    elif tag == SHORT_SET:
+        return _unpack_set(data, offset + 2, data[offset + 1])
+    elif tag == MAP:
+        return _unpack_map(data, offset + 5, _unpack_length(data, offset + 1)[0])
+    elif tag == LIST:
+        return _unpack_items(data, offset + 5, _unpack_length(data, offset + 1)[0])
+    elif tag == SET:
+        return _unpack_set(data, offset + 5, _unpack_length(data, offset + 1)[0])
+    elif tag == INT64:
+        return _unpack_int64(data, offset + 1)[0], offset + 9
+    elif tag == BIG_INT or tag == DECIMAL:
+        end = offset + 5 + _unpack_length(data, offset + 1)[0]
+        text = data[offset + 5:end].decode('ascii')
+        return (int(text) if tag == BIG_INT else decimal.Decimal(text)), end
+    raise PackingError("Unknown binary packing tag {!r} at offset {}.".format(chr(tag), offset))
+
+
+@register('packing', 'binary')
+class BinaryPacking(object):
+    @staticmethod
+    def pack(message):
+        parts = [HEADER]
+        _pack_value(message, parts.append)
+        return b''.join(parts)
+
+    @staticmethod
+    def unpack(data):
+        if data[:2] != HEADER:
+            raise PackingError("Message is not in binary packing version {}.".format(VERSION))
+        try:
+            value, offset = _unpack_value(data, 2)
+        except (IndexError, struct.error, UnicodeDecodeError):
+            raise PackingError("Truncated or corrupt binary packed message.")
+        if offset != len(data):
+            raise PackingError("Binary packed message length does not match its contents.")
+        return value
@@ -1,13 +1,12 @@
-
 from txCascil.registry_manager import register
-import clj
+from txCascil.utils import edn_codec
 
 @register('packing', 'edn')
 class EdnPacking(object):
     @staticmethod
     def pack(message):
-        return clj.dumps(message)
+        return edn_codec.dumps(message)
 
     @staticmethod
     def unpack(data):
-        return clj.loads(data)
+        return edn_codec.loads(data)
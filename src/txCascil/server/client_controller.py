@@ -80,5 +80,5 @@ class ClientController(object):
         if event_subscription is None: raise SubscriptionError("Not subscribed")
         event_subscription.unsubscribe()
 
-    def _on_subscribed_event(self, event_stream, data):
-        self.send({"msgtype": "event", "event_stream": event_stream, "event_data": data})
+    def _on_subscribed_event(self, published_event):
+        self._protocol.send_event(published_event)
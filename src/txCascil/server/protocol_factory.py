@@ -1,12 +1,19 @@
 from twisted.internet.protocol import Factory
 
+from txCascil.transports.send_queue import SendQueueStats
+
+
 class ProtocolFactory(Factory):
-    def __init__(self, TransportProtocol, packing, client_controller_factory, authentication_controller_factory):
+    def __init__(self, TransportProtocol, packing, client_controller_factory, authentication_controller_factory, send_queue_options=None):
         self._TransportProtocol = TransportProtocol
         self._packing = packing
         self._client_controller_factory = client_controller_factory
         self._authentication_controller_factory = authentication_controller_factory
 
+        # keyword arguments for the SendQueue of each connection
+        self.send_queue_options = send_queue_options or {}
+        self.send_queue_stats = SendQueueStats()
+
     def buildProtocol(self, addr):
         protocol = self._TransportProtocol(self._packing)
         authentication_controller = self._authentication_controller_factory.build_authentication_controller(protocol)
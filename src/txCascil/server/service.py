@@ -10,6 +10,10 @@ class Service(service.Service):
         
         self._listener = None
 
+    @property
+    def send_queue_stats(self):
+        return self._protocol_factory.send_queue_stats
+
     def startService(self):
         self._listener = reactor.listenTCP(interface=self._interface, port=self._port, factory=self._protocol_factory)
 
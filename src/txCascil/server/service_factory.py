@@ -35,7 +35,7 @@ class ServerServiceFactory(object):
 
         client_controller_factory = ClientControllerFactory(context, message_handlers, permission_resolver, event_subscription_fulfiller)
 
-        factory = ProtocolFactory(TransportProtocol, packing, client_controller_factory, authentication_controller_factory)
+        factory = ProtocolFactory(TransportProtocol, packing, client_controller_factory, authentication_controller_factory, config.get('send_queue'))
 
         interface = config['interface']
         port = config['port']
@@ -2,26 +2,51 @@ from twisted.internet.protocol import connectionDone
 from twisted.protocols.basic import NetstringReceiver
 
 from txCascil.registry_manager import register
+from txCascil.transports.send_queue import SendQueue
 
 
 @register('transport', 'netstring')
 class NetstringProtocol(NetstringReceiver):
     def __init__(self, packing):
         self._packing = packing
+        self.send_queue = None
+
+    @property
+    def encoding_key(self):
+        "Protocols with equal keys produce the same bytes for the same message."
+        return (NetstringProtocol, self._packing)
+
+    def encode(self, message):
+        data = self._packing.pack(message)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return b''.join((str(len(data)).encode('ascii'), b':', data, b','))
 
     def stringReceived(self, data):
         message = self._packing.unpack(data)
         self.controller.receive(message)
 
     def send(self, message):
-        data = self._packing.pack(message)
-        self.sendString(data)
+        self.send_encoded(self.encode(message))
+
+    def send_event(self, published_event):
+        "Sends an event encoded once for every subscriber with the same encoding key. It may be dropped if this connection lags."
+        self.send_encoded(published_event.encoded(self), droppable=True)
+
+    def send_encoded(self, frame, droppable=False):
+        if self.send_queue is not None:
+            self.send_queue.write(frame, droppable)
+        else:
+            self.transport.write(frame)
 
     def disconnect(self):
         self.transport.loseConnection()
 
     def connectionMade(self):
         NetstringReceiver.connectionMade(self)
+        send_queue_options = getattr(self.factory, 'send_queue_options', None)
+        if send_queue_options is not None:
+            self.send_queue = SendQueue(self.transport, stats=self.factory.send_queue_stats, **send_queue_options)
         self.controller.connection_established()
 
     def connectionLost(self, reason=connectionDone):
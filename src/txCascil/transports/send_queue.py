@@ -0,0 +1,118 @@
+import collections
+
+from twisted.internet import reactor
+from twisted.internet.interfaces import IPushProducer
+from zope.interface import implementer
+
+
+OVERFLOW_DROP_OLDEST = 'drop_oldest'
+OVERFLOW_DISCONNECT = 'disconnect'
+
+
+class SendQueueStats(object):
+    "Counters shared by the send queues of one protocol factory."
+    def __init__(self):
+        self.queues = set()
+        self.dropped_count = 0
+        self.disconnected_count = 0
+        self.max_lag = 0.0
+
+    @property
+    def pending_count(self):
+        return sum(len(send_queue) for send_queue in self.queues)
+
+    def get_and_reset_dropped_count(self):
+        dropped_count = self.dropped_count
+        self.dropped_count = 0
+        return dropped_count
+
+    def get_and_reset_max_lag(self):
+        "Returns the longest time a frame waited in any queue since the last call."
+        max_lag = max([self.max_lag] + [send_queue.lag for send_queue in self.queues])
+        self.max_lag = 0.0
+        return max_lag
+
+
+@implementer(IPushProducer)
+class SendQueue(object):
+    '''
+    Holds the frames for a transport while it has asked its producer to pause.
+
+    At most max_pending frames are held. Beyond that the oldest droppable frame is
+    discarded, or the connection is closed if overflow is 'disconnect'. Frames which
+    are not droppable, like responses to requests, are never discarded.
+    '''
+    def __init__(self, transport, max_pending=1000, overflow=OVERFLOW_DROP_OLDEST, stats=None, clock=reactor):
+        if overflow not in (OVERFLOW_DROP_OLDEST, OVERFLOW_DISCONNECT):
+            raise Exception("Unknown send queue overflow policy {!r}.".format(overflow))
+
+        self.transport = transport
+        self.max_pending = max_pending
+        self.overflow = overflow
+        self.stats = stats or SendQueueStats()
+        self.clock = clock
+
+        # (frame, droppable, time queued)
+        self._pending = collections.deque()
+        self._paused = False
+        self._stopped = False
+
+        self.stats.queues.add(self)
+        transport.registerProducer(self, True)
+
+    def __len__(self):
+        return len(self._pending)
+
+    @property
+    def lag(self):
+        if not self._pending:
+            return 0.0
+        return self.clock.seconds() - self._pending[0][2]
+
+    def write(self, frame, droppable=False):
+        if self._stopped: return
+
+        if not self._paused and not self._pending:
+            self.transport.write(frame)
+            return
+
+        if len(self._pending) >= self.max_pending and not self._make_room(droppable):
+            return
+
+        self._pending.append((frame, droppable, self.clock.seconds()))
+
+    def pauseProducing(self):
+        self._paused = True
+
+    def resumeProducing(self):
+        self._paused = False
+        pending = self._pending
+        # writing may pause us again once the transport buffer fills up
+        while pending and not self._paused and not self._stopped:
+            frame, _, queued_at = pending.popleft()
+            self.stats.max_lag = max(self.stats.max_lag, self.clock.seconds() - queued_at)
+            self.transport.write(frame)
+
+    def stopProducing(self):
+        self._stopped = True
+        self._pending.clear()
+        self.stats.queues.discard(self)
+
+    def _make_room(self, droppable):
+        "Returns whether the new frame should still be queued."
+        if self.overflow == OVERFLOW_DISCONNECT:
+            self.stats.disconnected_count += 1
+            self.stopProducing()
+            self.transport.loseConnection()
+            return False
+
+        for index, entry in enumerate(self._pending):
+            if entry[1]:
+                del self._pending[index]
+                self.stats.dropped_count += 1
+                return True
+
+        if droppable:
+            self.stats.dropped_count += 1
+            return False
+        return True
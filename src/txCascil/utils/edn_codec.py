@@ -0,0 +1,181 @@
+'''
+An EDN encoder and decoder producing the same values and text as clj.py.
+
+Decoding tokenizes with one compiled regex and hands strings to the json
+module's scanstring; encoding dispatches on the exact type of each value
+and escapes strings with the json module's ascii escaping.
+'''
+import decimal
+import json
+import re
+import uuid
+from datetime import datetime
+
+import pyrfc3339
+import pytz
+
+
+class EdnDecodeError(ValueError): pass
+
+
+# Every token in one pass; exactly one group is non empty for each match.
+_TOKENS = re.compile(r'''
+  [\s,]*(?:
+    ("[^"\\]*(?:\\.[^"\\]*)*")            # string
+  | (\#\{|\#:[^\s,{]*\{|[\[({])             # collection opener
+  | ([\])}])                                # collection closer
+  | :([^\s,\[\](){}]+)                      # keyword
+  | (-?\d[\d.eE+\-M]*)                      # number
+  | (true|false|nil)
+  | \#(inst|uuid)
+  | \\([^\s,\[\](){}]+)                     # character
+  | ([^\s,])                                # anything else is an error
+  )
+''', re.VERBOSE)
+
+_COLLECTION_CLOSERS = {'[': ']', '(': ')', '{': '}'}
+
+_ATOMS = {'true': True, 'false': False, 'nil': None}
+
+_scanstring = json.decoder.scanstring
+
+
+def _number(text):
+    if text.isdigit():
+        return int(text)
+    if text.endswith('M'):
+        return decimal.Decimal(text[:-1])
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+def _close_collection(opener, items):
+    if opener == '[' or opener == '(':
+        return items
+    if opener == '#{':
+        try:
+            return set(items)
+        except TypeError:
+            return tuple(items)
+
+    # '{' or '#:namespace{'
+    namespace = opener[2:-1] if opener != '{' else None
+    keys = items[0::2]
+    if namespace:
+        keys = ['%s/%s' % (namespace, key) for key in keys]
+    return dict(zip(keys, items[1::2]))
+
+def loads(text):
+    "Returns the first value in the EDN text."
+    if isinstance(text, bytes):
+        text = text.decode('utf-8')
+
+    # (opener, closing char, items)
+    stack = []
+    pending_tag = None
+
+    for string, opener, closer, keyword, number, atom, tag, char, error in _TOKENS.findall(text):
+        if keyword:
+            value = keyword
+        elif number:
+            value = _number(number)
+        elif string:
+            value = _scanstring(string, 1, False)[0] if '\\' in string else string[1:-1]
+        elif opener:
+            stack.append((opener, _COLLECTION_CLOSERS.get(opener[-1], '}'), []))
+            continue
+        elif closer:
+            if not stack or stack[-1][1] != closer:
+                raise EdnDecodeError("Unexpected char: %r" % closer)
+            opener, _, items = stack.pop()
+            value = _close_collection(opener, items)
+        elif atom:
+            value = _ATOMS[atom]
+        elif tag:
+            pending_tag = tag
+            continue
+        elif char:
+            value = char
+        else:
+            raise EdnDecodeError("Unexpected char: %r" % error)
+
+        if pending_tag is not None:
+            if not isinstance(value, str):
+                raise EdnDecodeError('Str expected, but got %s' % str(value))
+            value = pyrfc3339.parse(value) if pending_tag == 'inst' else uuid.UUID(value)
+            pending_tag = None
+
+        if not stack:
+            return value
+        stack[-1][2].append(value)
+
+    raise EdnDecodeError("Unexpected EOF")
+
+
+_encode_string = json.encoder.encode_basestring_ascii
+
+def _encode_datetime(value, parts):
+    if not value.tzinfo:
+        value = value.replace(tzinfo=pytz.utc)
+    parts.append('#inst "%s"' % pyrfc3339.generate(value))
+
+def _encode_value(value, parts, active):
+    value_type = type(value)
+
+    if value_type is str:
+        parts.append(_encode_string(value))
+    elif value_type is int or value_type is float:
+        parts.append(str(value))
+    elif value_type is bool:
+        parts.append('true' if value else 'false')
+    elif value is None:
+        parts.append('nil')
+    elif isinstance(value, str):
+        parts.append(_encode_string(value))
+    elif isinstance(value, bool):
+        parts.append('true' if value else 'false')
+    elif isinstance(value, (int, float)):
+        parts.append(str(value))
+    elif isinstance(value, decimal.Decimal):
+        parts.append(str(value) + 'M')
+    elif isinstance(value, (dict, list, tuple, set)):
+        _encode_collection(value, parts, active)
+    elif isinstance(value, datetime):
+        _encode_datetime(value, parts)
+    elif isinstance(value, uuid.UUID):
+        parts.append('#uuid "%s"' % value)
+    else:
+        parts.append(_encode_string(str(value)))
+
+def _encode_collection(value, parts, active):
+    value_id = id(value)
+    if value_id in active:
+        raise ValueError('Circular reference detected')
+    active.add(value_id)
+
+    if isinstance(value, dict):
+        parts.append('{')
+        separator = ''
+        for key, item in value.items():
+            parts.append(separator)
+            _encode_value(key, parts, active)
+            parts.append(' ')
+            _encode_value(item, parts, active)
+            separator = ' '
+        parts.append('}')
+    else:
+        parts.append('#{' if isinstance(value, set) else '[')
+        separator = ''
+        for item in value:
+            parts.append(separator)
+            _encode_value(item, parts, active)
+            separator = ' '
+        parts.append('}' if isinstance(value, set) else ']')
+
+    active.discard(value_id)
+
+def dumps(value):
+    parts = []
+    _encode_value(value, parts, set())
+    return ''.join(parts)
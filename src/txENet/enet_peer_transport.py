@@ -5,11 +5,26 @@ class ENetPeerTransport(object):
     def __init__(self, enet_peer):
         self._enet_peer = enet_peer
 
-    def send(self, channel, data, reliable, no_allocate=False):
+    @staticmethod
+    def build_packet(data, reliable, no_allocate=False):
         flags = 0
         if reliable: flags |= enet.PACKET_FLAG_RELIABLE
         if no_allocate: flags |= enet.PACKET_FLAG_NO_ALLOCATE
-        packet = enet.Packet(data, flags)
+        return enet.Packet(data, flags)
+
+    def send(self, channel, data, reliable, no_allocate=False):
+        packet = self.build_packet(data, reliable, no_allocate)
+        return self._enet_peer.send(channel, packet)
+
+    def send_shared(self, channel, shared_packet):
+        """
+        Sends a packet which is shared between many peers. ENet packets are
+        reference counted so the same packet can be queued on every peer.
+        """
+        packet = shared_packet.packet
+        if packet is None:
+            packet = self.build_packet(shared_packet.data, shared_packet.reliable, shared_packet.no_allocate)
+            shared_packet.packet = packet
         return self._enet_peer.send(channel, packet)
 
     def disconnect(self, reason):
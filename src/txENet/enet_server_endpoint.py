@@ -38,6 +38,7 @@ class ENetServerEndpoint(object):
         self._reactor.addReader(self._enet_host)
 
     def flush(self):
+        if self._enet_host is None: return
         return self._enet_host.flush()
     
     def _getLogPrefix(self):
@@ -0,0 +1,209 @@
+import gzip
+import os
+import shutil
+import struct
+import tempfile
+import time
+import unittest
+import zlib
+
+from cube2common.constants import cs_id_types, MAXENTS
+from cube2map import read_map_meta_data
+from cube2map.read_map_meta_data import read_map_data
+
+
+# The previous implementation which read each field from the gzip file separately and decompressed the file a second time for the crc.
+def reference_read_map_data(map_filename):
+    meta_data = {'vars': {}, 'ents': []}
+    
+    with gzip.open(map_filename) as f:
+        magic, version, headersize, worldsize, numents, numpvs, lightmaps = struct.unpack("4s6i", f.read(28))
+        
+        meta_data['version'] = version
+        meta_data['worldsize'] = worldsize
+        
+        if version <= 28:
+            lightprecision, lighterror, lightlod = struct.unpack("3i", f.read(12))
+            
+            ambient         = struct.unpack("B",   f.read(1))
+            watercolor      = struct.unpack("3B",  f.read(3))
+            blendmap        = struct.unpack("B",   f.read(1))
+            lerpangle       = struct.unpack("B",   f.read(1))
+            lerpsubdiv      = struct.unpack("B",   f.read(1))
+            lerpsubdivsize  = struct.unpack("B",   f.read(1))
+            bumperror       = struct.unpack("B",   f.read(1))
+            skylight        = struct.unpack("3B",  f.read(3))
+            lavacolor       = struct.unpack("3B",  f.read(3))
+            waterfallcolor  = struct.unpack("3B",  f.read(3))
+            reserved        = struct.unpack("10B", f.read(10))
+            
+            maptitle = struct.unpack("128s", f.read(128))
+            
+            meta_data['vars']['maptitle'] = maptitle
+        else:
+            if version <= 29:
+                blendmap, numvars = struct.unpack("2i", f.read(8))
+            else:
+                blendmap, numvars, numvslots = struct.unpack("3i", f.read(12))
+           
+        if version <= 28:
+            numvars = 0
+    
+        if version <= 29:
+            numvslots = 0
+    
+        for i in range(numvars):
+            var_type = struct.unpack("b", f.read(1))[0]
+            ilen     = struct.unpack("<H", f.read(2))[0]
+            var_name = f.read(ilen)
+            if var_type == cs_id_types.ID_VAR:
+                var_value = struct.unpack("i", f.read(4))[0]
+            elif var_type == cs_id_types.ID_FVAR:
+                var_value = struct.unpack("f", f.read(4))[0]
+            elif var_type == cs_id_types.ID_SVAR:
+                slen = struct.unpack("H", f.read(2))[0]
+                var_value = f.read(slen)
+                
+            #print "{:.8}: {:.32s} = {}".format(cs_id_types.by_value(var_type), var_name, var_value)
+            
+            meta_data['vars'][var_name] = var_value
+            
+        if version >= 16:
+            gt_len = struct.unpack("b", f.read(1))[0]
+            game_type = f.read(gt_len+1)
+        else:
+            game_type = 'fps'
+            
+        meta_data['gametype'] = game_type
+
+        if version >= 16:
+            eif = struct.unpack("H", f.read(2))[0]
+            extra_size = struct.unpack("H", f.read(2))[0]
+            f.read(extra_size)
+    
+        if version < 14:
+            f.read(256)
+        else:
+            nummru = struct.unpack("H", f.read(2))[0]
+            f.read(nummru*2)
+            
+        for i in range(min(numents, MAXENTS)):
+            x, y, z = struct.unpack("3f", f.read(12))
+            attrs = struct.unpack('5h', f.read(10))
+            ent_type, reserved = struct.unpack('2B', f.read(2))
+            
+            #if game_entity_types.by_value(ent_type) == "FLAG":
+            #    print x, y, z, attrs, game_entity_types.by_value(ent_type), reserved
+                
+            ent = {'id': i, 'type': ent_type, 'x': x, 'y': y, 'z': z, 'attrs': attrs, 'reserved': reserved}
+            meta_data['ents'].append(ent)
+    
+    try:
+        with gzip.open(map_filename) as f:
+            meta_data['crc'] = zlib.crc32(f.read()) & 0xffffffff
+    except IOError:
+        meta_data['crc'] = 0
+
+    return meta_data
+
+
+def build_map(version=33, ents=(), variables=(), gametype=b'fps', worldsize=1024, trailer=b'', maptitle=b'title'):
+    data = struct.pack("4s6i", b'OCTA', version, 40, worldsize, len(ents), 0, 0)
+    if version <= 28:
+        data += struct.pack("3i", 0, 0, 0) + bytes(28) + struct.pack("128s", maptitle)
+    elif version <= 29:
+        data += struct.pack("2i", 0, len(variables))
+    else:
+        data += struct.pack("3i", 0, len(variables), 0)
+
+    if version > 28:
+        for var_type, name, value in variables:
+            data += struct.pack("<bH", var_type, len(name)) + name
+            if var_type == cs_id_types.ID_VAR:
+                data += struct.pack("i", value)
+            elif var_type == cs_id_types.ID_FVAR:
+                data += struct.pack("f", value)
+            else:
+                data += struct.pack("H", len(value)) + value
+
+    if version >= 16:
+        data += struct.pack("b", len(gametype)) + gametype + b'\x00'
+        data += struct.pack("HH", 0, 3) + b'ext'
+
+    if version < 14:
+        data += bytes(256)
+    else:
+        data += struct.pack("H", 2) + struct.pack("2H", 1, 2)
+
+    for i, (ent_type, x, y, z, attrs) in enumerate(ents):
+        data += struct.pack("3f5h2B", x, y, z, *(list(attrs) + [ent_type, i % 3]))
+
+    return data + trailer
+
+def build_ents(count):
+    return [(i % 20, i * 1.5, -i * 0.25, 512.0, (i, -i, 2 * i, 0, 7)) for i in range(count)]
+
+class TestReadMapMetaData(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_map(self, data, name='test'):
+        path = os.path.join(self.directory, "{}.ogz".format(name))
+        with gzip.open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def assert_same_as_reference(self, data):
+        path = self.write_map(data)
+        meta_data = read_map_data(path, use_numpy=False)
+        self.assertEqual(meta_data, reference_read_map_data(path))
+        self.assertEqual(meta_data['crc'], zlib.crc32(data) & 0xffffffff)
+        if read_map_meta_data.numpy is not None:
+            self.assertEqual(read_map_data(path, use_numpy=True), meta_data)
+        return meta_data
+
+    def test_current_version(self):
+        variables = [(cs_id_types.ID_VAR, b'skylight', 5), (cs_id_types.ID_FVAR, b'fogdomeheight', 0.5), (cs_id_types.ID_SVAR, b'skybox', b'skyboxes/remus/sky01')]
+        meta_data = self.assert_same_as_reference(build_map(ents=build_ents(50), variables=variables, trailer=os.urandom(200000)))
+        self.assertEqual(len(meta_data['ents']), 50)
+        self.assertEqual(meta_data['vars'][b'skybox'], b'skyboxes/remus/sky01')
+
+    def test_version_29(self):
+        self.assert_same_as_reference(build_map(version=29, ents=build_ents(3), variables=[(cs_id_types.ID_VAR, b'a', 1)]))
+
+    def test_version_28(self):
+        meta_data = self.assert_same_as_reference(build_map(version=28, ents=build_ents(3)))
+        self.assertEqual(meta_data['vars']['maptitle'], (struct.pack("128s", b'title'),))
+
+    def test_old_version(self):
+        self.assert_same_as_reference(build_map(version=13, ents=build_ents(3)))
+
+    def test_no_ents(self):
+        self.assert_same_as_reference(build_map())
+
+    def test_entity_limit(self):
+        meta_data = self.assert_same_as_reference(build_map(ents=build_ents(MAXENTS + 5)))
+        self.assertEqual(len(meta_data['ents']), MAXENTS)
+
+    def test_truncated_ents(self):
+        path = self.write_map(build_map(ents=build_ents(10))[:-30])
+        self.assertRaises(struct.error, read_map_data, path)
+
+    def test_timing(self):
+        path = self.write_map(build_map(ents=build_ents(3000), trailer=os.urandom(2000000)))
+        iterations = 10
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            reference_read_map_data(path)
+        reference_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            read_map_data(path)
+        new_time = time.perf_counter() - start
+
+        print("\nread_map_data: reference {:.1f} ms, single pass {:.1f} ms per map ({:.1f}x)".format(reference_time / iterations * 1000, new_time / iterations * 1000, reference_time / new_time))
@@ -0,0 +1,149 @@
+import collections.abc
+import struct
+import time
+import unittest
+
+from cube2protocol.cube_data_stream import CubeDataStream
+
+
+class ReferenceCubeDataStream(object):
+    "The original byte at a time encoder, used to check the output is unchanged."
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        if isinstance(data, collections.abc.Iterable):
+            self.data.extend(data)
+        else:
+            self.data.append(data)
+
+    def putint(self, i):
+        i = int(i)
+        if -127 < i and i < 128:
+            self.write(i & 0xFF)
+        elif -0x8000 < i and i < 0x8000 :
+            self.write(0x80)
+            self.write(i & 0xFF)
+            self.write(i >> 8 & 0xFF)
+        else:
+            self.write(0x81)
+            self.write(i & 0xFF)
+            self.write((i >> 8) & 0xFF)
+            self.write((i >> 16) & 0xFF)
+            self.write((i >> 24) & 0xFF)
+
+    def putuint(self, n):
+        n = int(n)
+        if(n < 0 or n >= (1 << 21)):
+            self.write(0x80 | (n & 0x7F))
+            self.write(0x80 | ((n >> 7) & 0x7F))
+            self.write(0x80 | ((n >> 14) & 0x7F))
+            self.write(n >> 21)
+        elif(n < (1 << 7)):
+            self.write(n)
+        elif(n < (1 << 14)):
+            self.write(0x80 | (n & 0x7F))
+            self.write(n >> 7)
+        else:
+            self.write(0x80 | (n & 0x7F))
+            self.write(0x80 | ((n >> 7) & 0x7F))
+            self.write(n >> 14)
+
+    def putfloat(self, f):
+        self.write(bytearray(list(struct.pack('<f', float(f)))))
+
+    def putstring(self, s):
+        self.write(bytearray(list(map(ord, s))))
+        self.write(0)
+
+int_values = [0, 1, -1, 126, 127, 128, -126, -127, -128, 255, 1000, -1000, 0x7FFF, -0x7FFF, 0x8000, -0x8000, 70000, -70000, 2 ** 31 - 1, -2 ** 31, 5.7]
+uint_values = [0, 1, 127, 128, 1000, (1 << 14) - 1, 1 << 14, 100000, (1 << 21) - 1, 1 << 21, 100000000]
+
+class TestCubeDataStream(unittest.TestCase):
+    def test_putint_matches_reference(self):
+        for value in int_values:
+            cds = CubeDataStream()
+            reference = ReferenceCubeDataStream()
+            cds.putint(value)
+            reference.putint(value)
+            self.assertEqual(bytes(cds), bytes(reference.data), value)
+
+    def test_putints_matches_reference(self):
+        cds = CubeDataStream()
+        reference = ReferenceCubeDataStream()
+        cds.putints(int_values)
+        for value in int_values:
+            reference.putint(value)
+        self.assertEqual(bytes(cds), bytes(reference.data))
+
+    def test_putuint_matches_reference(self):
+        for value in uint_values:
+            cds = CubeDataStream()
+            reference = ReferenceCubeDataStream()
+            cds.putuint(value)
+            reference.putuint(value)
+            self.assertEqual(bytes(cds), bytes(reference.data), value)
+
+    def test_putfloat_matches_reference(self):
+        for value in [0.0, 1.5, -3.25, 1e10]:
+            cds = CubeDataStream()
+            reference = ReferenceCubeDataStream()
+            cds.putfloat(value)
+            reference.putfloat(value)
+            self.assertEqual(bytes(cds), bytes(reference.data), value)
+
+    def test_putstring_matches_reference(self):
+        for value in ["", "hello", "\f3colored\f7 text", "caf\xe9"]:
+            cds = CubeDataStream()
+            reference = ReferenceCubeDataStream()
+            cds.putstring(value)
+            reference.putstring(value)
+            self.assertEqual(bytes(cds), bytes(reference.data), value)
+
+    def test_putstring_bytes(self):
+        cds = CubeDataStream()
+        cds.putstring_bytes(b"hello")
+        self.assertEqual(bytes(cds), b"hello\x00")
+
+    def test_write(self):
+        cds = CubeDataStream()
+        cds.write(1)
+        cds.write(b"\x02\x03")
+        cds.write(memoryview(b"\x04"))
+        cds.write(CubeDataStream(b"\x05"))
+        cds.write([6, 7])
+        self.assertEqual(bytes(cds), b"\x01\x02\x03\x04\x05\x06\x07")
+
+    def test_getters_round_trip(self):
+        cds = CubeDataStream()
+        cds.putints((5, -1000, 70000))
+        cds.putfloat(1.5)
+        cds.putstring("hello")
+        self.assertEqual(cds.getint(), 5)
+        self.assertEqual(cds.getint(), -1000)
+        self.assertEqual(cds.getint(), 70000)
+        self.assertEqual(cds.getfloat(), 1.5)
+        self.assertEqual(cds.getstring(), "hello")
+        self.assertTrue(cds.empty())
+
+    def test_timing(self):
+        values = [5, 1000, -70000, 12, 0, 300, -2, 64] * 1000
+
+        start = time.perf_counter()
+        reference = ReferenceCubeDataStream()
+        for value in values:
+            reference.putint(value)
+        reference_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cds = CubeDataStream()
+        for value in values:
+            cds.putint(value)
+        putint_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cds = CubeDataStream()
+        cds.putints(values)
+        putints_time = time.perf_counter() - start
+
+        print("reference: {:.0f} ints/s, putint: {:.0f} ints/s, putints: {:.0f} ints/s".format(len(values) / reference_time, len(values) / putint_time, len(values) / putints_time))
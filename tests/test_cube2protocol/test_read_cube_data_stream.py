@@ -0,0 +1,101 @@
+import struct
+import time
+import unittest
+
+from cube2protocol.read_cube_data_stream import ReadCubeDataStream
+
+
+class TestReadCubeDataStream(unittest.TestCase):
+    def test_getint_single_byte(self):
+        rcds = ReadCubeDataStream(b"\x05\xfb")
+        self.assertEqual(rcds.getint(), 5)
+        self.assertEqual(rcds.getint(), -5)
+        self.assertTrue(rcds.empty())
+
+    def test_getint_short(self):
+        rcds = ReadCubeDataStream(b"\x80" + struct.pack('<h', -1000))
+        self.assertEqual(rcds.getint(), -1000)
+        self.assertTrue(rcds.empty())
+
+    def test_getint_long(self):
+        rcds = ReadCubeDataStream(b"\x81" + struct.pack('<i', 70000))
+        self.assertEqual(rcds.getint(), 70000)
+        self.assertTrue(rcds.empty())
+
+    def test_getint_peek(self):
+        rcds = ReadCubeDataStream(b"\x80" + struct.pack('<h', 300))
+        self.assertEqual(rcds.getint(peek=True), 300)
+        self.assertEqual(len(rcds), 3)
+
+    def test_getuint(self):
+        rcds = ReadCubeDataStream(b"\x05\x81\x01\x80\x80\x01")
+        self.assertEqual(rcds.getuint(), 5)
+        self.assertEqual(rcds.getuint(), 129)
+        self.assertEqual(rcds.getuint(), 1 << 14)
+        self.assertTrue(rcds.empty())
+
+    def test_getfloat(self):
+        rcds = ReadCubeDataStream(struct.pack('<f', 1.5))
+        self.assertEqual(rcds.getfloat(), 1.5)
+        self.assertTrue(rcds.empty())
+
+    def test_getstring(self):
+        rcds = ReadCubeDataStream(b"hello\x00world\x00")
+        self.assertEqual(rcds.getstring(peek=True), "hello")
+        self.assertEqual(rcds.getstring(), "hello")
+        self.assertEqual(rcds.getstring(), "world")
+        self.assertTrue(rcds.empty())
+
+    def test_getstring_unterminated(self):
+        rcds = ReadCubeDataStream(b"hello")
+        self.assertRaises(IndexError, rcds.getstring)
+
+    def test_read_shares_buffer(self):
+        data = bytearray(b"\x01\x02\x03\x04")
+        rcds = ReadCubeDataStream(data)
+        rcds.getbyte()
+        view = rcds.read(2)
+        self.assertEqual(bytes(view), b"\x02\x03")
+        self.assertIs(view.obj, data)
+        self.assertEqual(len(rcds), 1)
+
+    def test_read_past_end(self):
+        rcds = ReadCubeDataStream(b"\x01")
+        self.assertRaises(IndexError, rcds.read, 2)
+
+    def test_sub_stream_from_view(self):
+        rcds = ReadCubeDataStream(b"\x01a\x00\x02")
+        rcds.getbyte()
+        sub_rcds = ReadCubeDataStream(rcds.read(2))
+        self.assertEqual(sub_rcds.getstring(), "a")
+        self.assertTrue(sub_rcds.empty())
+
+    def test_getints(self):
+        rcds = ReadCubeDataStream(b"\x01\x80" + struct.pack('<h', 500) + b"\xff")
+        self.assertEqual(rcds.getints(3), [1, 500, -1])
+        self.assertTrue(rcds.empty())
+
+    def test_getrecord(self):
+        record_struct = struct.Struct('<HB')
+        rcds = ReadCubeDataStream(struct.pack('<HB', 1000, 7) + b"\x09")
+        self.assertEqual(rcds.getrecord(record_struct), (1000, 7))
+        self.assertEqual(rcds.getbyte(), 9)
+
+    def test_copy(self):
+        rcds = ReadCubeDataStream(b"\x01\x02")
+        rcds.getbyte()
+        rcds_copy = rcds.copy()
+        self.assertEqual(rcds_copy.getbyte(), 2)
+        self.assertEqual(len(rcds), 1)
+
+    def test_timing(self):
+        data = (b"\x05\x80" + struct.pack('<h', 1000) + b"\x81" + struct.pack('<i', 100000) + b"name\x00") * 2000
+        start = time.perf_counter()
+        rcds = ReadCubeDataStream(data)
+        while not rcds.empty():
+            rcds.getint()
+            rcds.getint()
+            rcds.getint()
+            rcds.getstring()
+        end = time.perf_counter()
+        print("{:.0f} fields/s".format(8000 / (end - start)))
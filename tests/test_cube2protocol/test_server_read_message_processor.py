@@ -0,0 +1,29 @@
+import unittest
+
+from cube2common.constants import message_types
+from cube2protocol.sauerbraten.collect.server_read_message_processor import ServerReadMessageProcessor
+
+
+class TestServerReadMessageProcessor(unittest.TestCase):
+    def setUp(self):
+        self.message_processor = ServerReadMessageProcessor()
+
+    def test_position(self):
+        # cn, physstate, flags (z uses 3 bytes), x, y, z, dir, roll, mag, vel dir
+        data = bytes([message_types.N_POS, 3, 0, 1 << 2, 0x10, 0x02, 0x20, 0x03, 0x00, 0x00, 0x80, 0, 0, 0, 10, 0, 0])
+        messages = self.message_processor.process(0, data)
+        self.assertEqual(messages, [('N_POS', {'clientnum': 3, 'position': [0x210, 0x320, -0x800000], 'raw_position': data})])
+
+    def test_truncated_position(self):
+        data = bytes([message_types.N_POS, 3, 0, 0, 0x10, 0x02, 0x20, 0x03, 0x00, 0x00])
+        self.assertRaises(IndexError, self.message_processor.process, 0, data)
+
+    def test_teleport(self):
+        data = bytes([message_types.N_TELEPORT, 2, 5, 6])
+        messages = self.message_processor.process(0, data)
+        self.assertEqual(messages, [('N_TELEPORT', {'aiclientnum': 2, 'teleport': 5, 'teledest': 6})])
+
+    def test_channel_1(self):
+        data = bytes([message_types.N_PING, 42])
+        messages = self.message_processor.process(1, data)
+        self.assertEqual(messages, [('N_PING', {'cmillis': 42, 'aiclientnum': -1})])
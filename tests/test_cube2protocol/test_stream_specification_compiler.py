@@ -0,0 +1,88 @@
+import struct
+import time
+import unittest
+
+from cube2common.constants import message_types, cs_id_types
+from cube2protocol.sauerbraten.collect import client_read_stream_protocol, server_read_stream_protocol
+from cube2protocol.stream_specification_compiler import compile_stream_specification
+
+
+def pack(*values):
+    "Encode ints and strings the way the cube 2 client puts them on the wire."
+    data = bytearray()
+    for value in values:
+        if isinstance(value, str):
+            data.extend(value.encode('utf-8'))
+            data.append(0)
+        elif -127 < value < 128:
+            data.append(value & 0xFF)
+        elif -0x8000 < value < 0x8000:
+            data.append(0x80)
+            data.extend(struct.pack('<h', value))
+        else:
+            data.append(0x81)
+            data.extend(struct.pack('<i', value))
+    return bytes(data)
+
+server_packets = [
+    pack(message_types.N_CONNECT, "player", 3, "", "localhost", "chasm"),
+    pack(message_types.N_SHOOT, 15, 2, 512, -4000, 70000, 10, 20, 30, 2, 1, 0, 300, 1, 4, 5, 6, 3, 2, 1000, 3, -7, -8, -9),
+    pack(message_types.N_FROMAI, 12, message_types.N_SPAWN, 3, 1, message_types.N_TEXT, "hello world"),
+    pack(message_types.N_ITEMLIST, 0, 8, 1, 9, 2, 10, -1, message_types.N_TRYSPAWN),
+    pack(message_types.N_EDITVAR, 1, cs_id_types.ID_VAR, "fog", 4000),
+    pack(message_types.N_EDITVAR, 1, cs_id_types.ID_SVAR, "skybox", "skyboxes/remus/sky01"),
+    pack(message_types.N_EDITVAR, 1, cs_id_types.ID_COMMAND, "foo"),
+    pack(message_types.N_EDITENT, 4, 100, 200, 300, 3, 1, 2, 3, 4, 5),
+    pack(message_types.N_CLIPBOARD, 0, 10, 3, 7, 8, 9),
+    pack(message_types.N_PING, 1234567, message_types.N_CLIENTPING, 50, message_types.N_GUNSELECT, 4),
+]
+
+client_packets = [
+    pack(message_types.N_SERVINFO, 0, 259, 12345, 0, "server", "domain"),
+    pack(message_types.N_INITFLAGS, 3, 1, 3, 1, 0, -1, 0, 0, 5, 0, -1, 0, 1, 10, 20, 30, 2, 1, 4, 0),
+    pack(message_types.N_TEAMINFO, "good", 10, "evil", 12, ""),
+    pack(message_types.N_CLIENT, 4, 6, message_types.N_TEXT, "hi", message_types.N_SOUND, 3),
+    pack(message_types.N_CURRENTMASTER, 2, 0, 1, 3, 2, -1),
+]
+
+class TestStreamSpecificationCompiler(unittest.TestCase):
+    def setUp(self):
+        self.server_spec = server_read_stream_protocol.sauerbraten_stream_spec
+        self.client_spec = client_read_stream_protocol.sauerbraten_stream_spec
+
+    def assertSameDecoding(self, stream_spec, packets):
+        compiled_stream_spec = compile_stream_specification(stream_spec)
+        for packet in packets:
+            self.assertEqual(compiled_stream_spec.read(packet, {'aiclientnum':-1}), stream_spec.read(packet, {'aiclientnum':-1}))
+
+    def test_server_messages_match_interpreter(self):
+        self.assertSameDecoding(self.server_spec, server_packets)
+
+    def test_client_messages_match_interpreter(self):
+        self.assertSameDecoding(self.client_spec, client_packets)
+
+    def test_state_modifier_applies_to_following_messages(self):
+        compiled_stream_spec = compile_stream_specification(self.server_spec)
+        messages = compiled_stream_spec.read(server_packets[2], {'aiclientnum':-1})
+        self.assertEqual(messages, [('N_SPAWN', {'lifesequence': 3, 'gunselect': 1, 'aiclientnum': 12}),
+                                    ('N_TEXT', {'text': 'hello world', 'aiclientnum': 12})])
+
+    def test_unknown_message_raises(self):
+        compiled_stream_spec = compile_stream_specification(self.server_spec)
+        self.assertRaises(Exception, compiled_stream_spec.read, pack(-100), {'aiclientnum':-1})
+
+    def test_timing(self):
+        compiled_stream_spec = compile_stream_specification(self.server_spec)
+        packets = server_packets * 200
+
+        start = time.perf_counter()
+        for packet in packets:
+            self.server_spec.read(packet, {'aiclientnum':-1})
+        interpreted_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for packet in packets:
+            compiled_stream_spec.read(packet, {'aiclientnum':-1})
+        compiled_time = time.perf_counter() - start
+
+        print("interpreted: {:.0f} packets/s, compiled: {:.0f} packets/s, speedup: {:.1f}x".format(len(packets) / interpreted_time, len(packets) / compiled_time, interpreted_time / compiled_time))
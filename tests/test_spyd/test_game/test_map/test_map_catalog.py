@@ -0,0 +1,155 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import Mock
+from twisted.internet import defer
+
+from cube2common.constants import game_entity_types
+from spyd.game.map.async_map_meta_data_accessor import AsyncMapMetaDataAccessor
+from spyd.game.map.map_catalog import MapCatalog
+from spyd.game.map.map_entity_lists import MapMetaData
+
+
+def ctf_meta_data():
+    ents = [{'id': 0, 'type': game_entity_types.FLAG}, {'id': 1, 'type': game_entity_types.FLAG}, {'id': 2, 'type': game_entity_types.PLAYERSTART}]
+    return {'vars': {}, 'ents': ents, 'crc': 1234, 'worldsize': 1024}
+
+class TestMapCatalog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.map_directory = os.path.join(self.directory, 'base')
+        os.mkdir(self.map_directory)
+        self.catalog_path = os.path.join(self.directory, 'catalog.pkl')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_map(self, map_name, data=b'map'):
+        path = os.path.join(self.map_directory, "{}.ogz".format(map_name))
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_persisted(self):
+        path = self.write_map('forge')
+        map_catalog = MapCatalog(self.catalog_path)
+        map_catalog.update('forge', path, ctf_meta_data())
+        map_catalog.save()
+
+        map_catalog = MapCatalog(self.catalog_path)
+        map_catalog.load()
+        entry = map_catalog.get('forge', path)
+        self.assertEqual(entry.meta_data, ctf_meta_data())
+        self.assertEqual(entry.flag_count, 2)
+        self.assertEqual(entry.base_count, 0)
+        self.assertEqual(entry.crc, 1234)
+
+    def test_invalidated_by_size(self):
+        path = self.write_map('forge')
+        map_catalog = MapCatalog(self.catalog_path)
+        map_catalog.update('forge', path, ctf_meta_data())
+
+        self.write_map('forge', b'changed map')
+        self.assertIsNone(map_catalog.get('forge', path))
+
+    def test_invalidated_by_mtime(self):
+        path = self.write_map('forge')
+        map_catalog = MapCatalog(self.catalog_path)
+        map_catalog.update('forge', path, ctf_meta_data())
+
+        stat_result = os.stat(path)
+        os.utime(path, (stat_result.st_atime, stat_result.st_mtime + 10))
+        self.assertIsNone(map_catalog.get('forge', path))
+
+    def test_missing_map(self):
+        map_catalog = MapCatalog(self.catalog_path)
+        self.assertIsNone(map_catalog.update('missing', os.path.join(self.map_directory, 'missing.ogz'), {}))
+        self.assertFalse(map_catalog.dirty)
+
+    def test_unreadable_catalog_ignored(self):
+        with open(self.catalog_path, 'wb') as f:
+            f.write(b'garbage')
+        map_catalog = MapCatalog(self.catalog_path)
+        map_catalog.load()
+        self.assertEqual(list(map_catalog.entries()), [])
+
+    def test_scan_and_find(self):
+        self.write_map('forge')
+        self.write_map('complex')
+        self.write_map('unread')
+        with open(os.path.join(self.map_directory, 'readme.txt'), 'w') as f:
+            f.write('not a map')
+
+        map_catalog = MapCatalog()
+        self.assertEqual(sorted(map_catalog.scan(self.map_directory)), ['complex', 'forge', 'unread'])
+
+        map_catalog.update('forge', os.path.join(self.map_directory, 'forge.ogz'), ctf_meta_data())
+        map_catalog.update('complex', os.path.join(self.map_directory, 'complex.ogz'), {'ents': []})
+
+        self.assertEqual(sorted(map_catalog.find_map_names()), ['complex', 'forge'])
+        self.assertEqual(map_catalog.find_map_names(min_flags=2), ['forge'])
+        self.assertEqual(map_catalog.find_map_names(min_bases=1), [])
+
+    def test_find_before_scan(self):
+        forge_path = self.write_map('forge')
+        removed_path = self.write_map('removed')
+        map_catalog = MapCatalog(self.catalog_path)
+        map_catalog.update('forge', forge_path, ctf_meta_data())
+        map_catalog.update('removed', removed_path, ctf_meta_data())
+        map_catalog.save()
+        os.remove(removed_path)
+
+        map_catalog = MapCatalog(self.catalog_path)
+        map_catalog.load()
+        self.assertEqual(map_catalog.find_map_names(min_flags=2), ['forge'])
+
+    def test_accessor_find_map_names(self):
+        path = self.write_map('forge')
+        map_catalog = MapCatalog(self.catalog_path)
+        map_catalog.update('forge', path, ctf_meta_data())
+
+        accessor = AsyncMapMetaDataAccessor(self.directory, Mock(), map_catalog)
+
+        results = []
+        accessor.find_map_names(min_flags=2).addCallback(results.append)
+        accessor.find_map_names(min_bases=1).addCallback(results.append)
+        self.assertEqual(results, [['forge'], []])
+
+    def test_accessor_uses_catalog(self):
+        path = self.write_map('forge')
+        map_catalog = MapCatalog(self.catalog_path)
+        map_catalog.update('forge', path, ctf_meta_data())
+
+        worker_pool = Mock()
+        accessor = AsyncMapMetaDataAccessor(self.directory, worker_pool, map_catalog)
+
+        results = []
+        accessor.get_map_data('forge').addCallback(results.append)
+        accessor.get_map_names().addCallback(results.append)
+        self.assertEqual(results, [ctf_meta_data(), ['forge']])
+        self.assertEqual(worker_pool.get_map_data.call_count, 0)
+
+    def test_accessor_updates_catalog(self):
+        self.write_map('forge')
+        map_catalog = MapCatalog(self.catalog_path)
+
+        read = defer.Deferred()
+        worker_pool = Mock()
+        worker_pool.get_map_data.return_value = read
+        accessor = AsyncMapMetaDataAccessor(self.directory, worker_pool, map_catalog)
+
+        results = []
+        accessor.get_map_data('forge').addCallback(results.append)
+        accessor.get_map_data('forge').addCallback(results.append)
+        self.assertEqual(worker_pool.get_map_data.call_count, 1)
+
+        read.callback(ctf_meta_data())
+        self.assertEqual(results, [ctf_meta_data(), ctf_meta_data()])
+        self.assertIsInstance(results[0], MapMetaData)
+        self.assertIs(results[0], results[1])
+        self.assertNotIsInstance(map_catalog.get('forge', os.path.join(self.map_directory, 'forge.ogz')).meta_data, MapMetaData)
+
+        accessor.stop()
+        self.assertTrue(os.path.exists(self.catalog_path))
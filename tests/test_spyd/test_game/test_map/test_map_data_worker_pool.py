@@ -0,0 +1,137 @@
+import io
+import pickle
+import unittest
+
+from mock import Mock
+from twisted.internet import defer, task
+from twisted.python.failure import Failure
+
+from spyd.game.map.map_data_reader_process import run_worker
+from spyd.game.map.map_data_worker_pool import MapDataWorkerPool, WorkerCrashed, WorkerError, WorkerPoolStopped, frame_header
+
+
+def frame(value):
+    data = pickle.dumps(value)
+    return frame_header.pack(len(data)) + data
+
+def unframe(data):
+    values = []
+    while data:
+        length = frame_header.unpack_from(data)[0]
+        values.append(pickle.loads(data[frame_header.size:frame_header.size + length]))
+        data = data[frame_header.size + length:]
+    return values
+
+class FakeReactor(task.Clock):
+    def __init__(self):
+        task.Clock.__init__(self)
+        self.workers = []
+
+    def spawnProcess(self, process_protocol, executable, args, env=None):
+        process_protocol.transport = Mock()
+        self.workers.append(process_protocol)
+
+def written_requests(worker):
+    return unframe(b''.join(call[0][0] for call in worker.transport.write.call_args_list))
+
+class TestMapDataWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.reactor = FakeReactor()
+        self.pool = MapDataWorkerPool(size=2, timeout=5.0, reactor=self.reactor)
+
+    def results(self, deferred):
+        results = []
+        deferred.addBoth(results.append)
+        return results
+
+    def test_request_response(self):
+        results = self.results(self.pool.get_map_data('/maps/complex.ogz'))
+
+        worker = self.reactor.workers[0]
+        self.assertEqual(written_requests(worker), [('-d', '/maps/complex.ogz')])
+
+        worker.outReceived(frame((True, {'ents': []}))[:3])
+        self.assertEqual(results, [])
+        worker.outReceived(frame((True, {'ents': []}))[3:])
+        self.assertEqual(results, [{'ents': []}])
+
+    def test_workers_reused(self):
+        for i in range(3):
+            self.pool.get_map_names('*.ogz')
+            self.reactor.workers[0].outReceived(frame((True, [])))
+        self.assertEqual(len(self.reactor.workers), 1)
+
+    def test_concurrency_limited_to_pool_size(self):
+        deferreds = [self.pool.get_map_data(str(i)) for i in range(5)]
+        self.assertEqual(len(self.reactor.workers), 2)
+        self.assertEqual(self.pool.queued_count, 3)
+
+        results = self.results(deferreds[2])
+        worker = self.reactor.workers[0]
+        worker.outReceived(frame((True, 0)))
+        self.assertEqual(self.pool.queued_count, 2)
+        worker.outReceived(frame((True, 2)))
+        self.assertEqual(results, [2])
+
+    def test_worker_error(self):
+        results = self.results(self.pool.get_map_data('bad'))
+        self.reactor.workers[0].outReceived(frame((False, 'Traceback...')))
+        self.assertTrue(results[0].check(WorkerError))
+        self.assertEqual(self.pool.worker_count, 1)
+
+    def test_timeout_restarts_worker(self):
+        results = self.results(self.pool.get_map_data('slow'))
+        self.reactor.advance(5.0)
+
+        self.assertTrue(results[0].check(defer.TimeoutError))
+        self.reactor.workers[0].transport.signalProcess.assert_called_once_with('KILL')
+        self.assertEqual(self.pool.worker_count, 0)
+
+        self.pool.get_map_data('next')
+        self.assertEqual(len(self.reactor.workers), 2)
+        self.assertEqual(written_requests(self.reactor.workers[1]), [('-d', 'next')])
+
+    def test_crash_fails_request_and_restarts(self):
+        self.pool.size = 1
+        results = self.results(self.pool.get_map_data('crash'))
+        queued = self.results(self.pool.get_map_data('queued'))
+
+        self.reactor.workers[0].processEnded(Failure(Exception("exit 1")))
+        self.assertTrue(results[0].check(WorkerCrashed))
+        self.assertEqual(self.pool.restarts, 1)
+
+        # The queued request is served by a replacement worker
+        self.assertEqual(len(self.reactor.workers), 2)
+        self.reactor.workers[1].outReceived(frame((True, 'ok')))
+        self.assertEqual(queued, ['ok'])
+
+    def test_stop_fails_queued_requests(self):
+        results = [self.results(self.pool.get_map_data('/maps/{}.ogz'.format(name))) for name in ('complex', 'forge', 'ot')]
+        self.pool.stop()
+
+        self.assertEqual(results[0] + results[1], [])
+        self.assertIsInstance(results[2][0].value, WorkerPoolStopped)
+        for worker in self.reactor.workers:
+            worker.transport.closeStdin.assert_called_once_with()
+
+        worker = self.reactor.workers[0]
+        worker.outReceived(frame((True, {'ents': []})))
+        self.assertEqual(len(results[0]) + len(results[1]), 1)
+
+    def test_submit_after_stop(self):
+        self.pool.stop()
+        results = self.results(self.pool.get_map_data('/maps/complex.ogz'))
+        self.assertIsInstance(results[0].value, WorkerPoolStopped)
+        self.assertEqual(self.reactor.workers, [])
+
+class TestMapDataReaderWorker(unittest.TestCase):
+    def test_run_worker(self):
+        stdin = io.BytesIO(frame(('-d', '/does/not/exist.ogz')) + frame(('-x', None)))
+        stdout = io.BytesIO()
+
+        run_worker(stdin, stdout)
+
+        responses = unframe(stdout.getvalue())
+        self.assertEqual(responses[0], (True, None))
+        self.assertFalse(responses[1][0])
+        self.assertIn('KeyError', responses[1][1])
@@ -0,0 +1,32 @@
+import unittest
+
+from cube2common.constants import game_entity_types, item_types, DMF
+from spyd.game.map.map_entity_lists import MapMetaData, get_flag_list, get_item_list
+
+
+def meta_data():
+    ents = [{'id': 0, 'type': item_types.I_SHELLS, 'x': 1.0, 'y': 2.0, 'z': 3.0, 'attrs': (0, 0, 0, 0, 0)},
+            {'id': 1, 'type': game_entity_types.FLAG, 'x': 1.0, 'y': 2.0, 'z': 3.0, 'attrs': (0, 2, 0, 0, 0)},
+            {'id': 2, 'type': game_entity_types.PLAYERSTART, 'x': 1.0, 'y': 2.0, 'z': 3.0, 'attrs': (0, 0, 0, 0, 0)}]
+    return {'ents': ents}
+
+class TestMapEntityLists(unittest.TestCase):
+    def test_lists(self):
+        map_meta_data = meta_data()
+        self.assertEqual(get_item_list(map_meta_data), [{'item_type': item_types.I_SHELLS, 'item_index': 0}])
+        self.assertEqual(get_flag_list(map_meta_data), [{'x': int(DMF), 'y': int(2*DMF), 'z': int(3*DMF), 'team': 2}])
+
+    def test_cached_per_meta_data(self):
+        map_meta_data = MapMetaData(meta_data())
+        self.assertIs(get_item_list(map_meta_data), get_item_list(map_meta_data))
+        self.assertIsNot(get_flag_list(map_meta_data), get_flag_list(MapMetaData(meta_data())))
+        self.assertEqual(map_meta_data, meta_data())
+
+    def test_plain_meta_data_not_cached(self):
+        map_meta_data = meta_data()
+        self.assertEqual(get_item_list(map_meta_data), get_item_list(map_meta_data))
+        self.assertIsNot(get_item_list(map_meta_data), get_item_list(map_meta_data))
+
+    def test_no_ents(self):
+        self.assertEqual(get_item_list({}), [])
+        self.assertEqual(get_flag_list({}), [])
@@ -0,0 +1,48 @@
+import unittest
+
+from mock import Mock
+from twisted.internet import defer
+
+from spyd.game.map.map_data_worker_pool import WorkerError
+from spyd.game.map.map_rotation import MapRotation
+from spyd.game.map.map_warm_up import MapWarmUp, collect_map_names
+
+
+class TestCollectMapNames(unittest.TestCase):
+    def test_collect(self):
+        map_rotation = MapRotation.from_dictionary({'rotations': {'ffa': ['complex', 'ot'], 'ctf': ['forge']}, 'modes': ['ffa', 'ctf']})
+        map_names = collect_map_names([map_rotation], [['ot', 'urban_c']])
+        self.assertEqual(map_names, ['complex', 'forge', 'ot', 'urban_c'])
+
+class TestMapWarmUp(unittest.TestCase):
+    def setUp(self):
+        self.pending = {}
+        self.accessor = Mock()
+        self.accessor.get_map_data.side_effect = self.get_map_data
+
+    def get_map_data(self, map_name):
+        deferred = defer.Deferred()
+        self.pending[map_name] = deferred
+        return deferred
+
+    def test_concurrency_limited(self):
+        map_warm_up = MapWarmUp(self.accessor, concurrency=2)
+        map_warm_up.warm_up(['complex', 'forge', 'ot'])
+        self.assertEqual(sorted(self.pending), ['complex', 'forge'])
+
+        self.pending.pop('complex').callback({})
+        self.assertEqual(sorted(self.pending), ['forge', 'ot'])
+
+    def test_report(self):
+        reports = []
+        map_warm_up = MapWarmUp(self.accessor, concurrency=3)
+        map_warm_up.warm_up(['complex', 'missing', 'broken']).addCallback(reports.append)
+
+        self.pending['complex'].callback({})
+        self.pending['missing'].callback(None)
+        self.pending['broken'].errback(WorkerError("Traceback...\nstruct.error: unpack requires a buffer of 40 bytes"))
+
+        report, = reports
+        self.assertEqual(list(report.timings), ['complex'])
+        self.assertEqual(report.bad_maps, {'missing': "not found", 'broken': "struct.error: unpack requires a buffer of 40 bytes"})
+        self.assertIn("    broken: struct.error: unpack requires a buffer of 40 bytes", report.format_lines())
@@ -0,0 +1,154 @@
+import sys
+import time
+import unittest
+
+from mock import Mock
+
+from cube2common.constants import armor_types, item_types, weapon_types
+from cube2common.vec import vec
+from cube2protocol.cube_data_stream import CubeDataStream
+from spyd.game.player.player_state import PlayerState
+from spyd.protocol import swh
+
+
+class ReferencePlayerState(object):
+    "The dictionary backed PlayerState allocation pattern, kept for the benchmark."
+    def __init__(self):
+        self.game_clock = None
+        self.messages = CubeDataStream()
+        self.state = -1
+        self.map_change_reset()
+        self.lifesequence = -1
+
+    def clear_flushed_state(self):
+        self.messages = CubeDataStream()
+        self.position = None
+
+    def map_change_reset(self):
+        self.frags = 0
+        self.deaths = 0
+        self.suicides = 0
+        self.teamkills = 0
+        self.damage_dealt = 0
+        self.damage_spent = 0
+        self.flags = 0
+        self.flag_returns = 0
+        self.health = 100
+        self.maxhealth = 100
+        self.armour = 0
+        self.armourtype = armor_types.A_BLUE
+        self.gunselect = weapon_types.GUN_PISTOL
+        self.ammo = [0] * weapon_types.NUMGUNS
+        self.playing_timer = None
+        self.death_timer = None
+        self.pos = vec(0, 0, 0)
+        self._quadexpiry = None
+        self.shotwait = None
+        self.spawnwait = None
+        self._pending_spawn = False
+        self.rockets = {}
+        self.grenades = {}
+        self.messages.clear()
+        self.position = None
+
+def reference_size(player_state):
+    return sys.getsizeof(player_state) + sys.getsizeof(player_state.__dict__) + sys.getsizeof(player_state.ammo)
+
+def size(player_state):
+    return sys.getsizeof(player_state) + sys.getsizeof(player_state._counters) + sys.getsizeof(player_state._ammo)
+
+class TestPlayerState(unittest.TestCase):
+    def test_defaults(self):
+        player_state = PlayerState()
+        self.assertEqual((player_state.frags, player_state.health, player_state.maxhealth, player_state.armourtype, player_state.gunselect),
+                         (0, 100, 100, armor_types.A_BLUE, weapon_types.GUN_PISTOL))
+        self.assertEqual(list(player_state.ammo), [0] * weapon_types.NUMGUNS)
+
+    def test_map_change_reset(self):
+        player_state = PlayerState()
+        player_state.frags += 3
+        player_state.receive_damage(50)
+        player_state.ammo[weapon_types.GUN_SG] = 10
+        player_state.rockets[1] = weapon_types.GUN_RL
+        swh.put_sound(player_state.messages, 1)
+
+        player_state.map_change_reset()
+        self.assertEqual((player_state.frags, player_state.health), (0, 100))
+        self.assertEqual(player_state.ammo[weapon_types.GUN_SG], 0)
+        self.assertEqual(player_state.rockets, {})
+        self.assertTrue(player_state.messages.empty())
+
+    def test_ammo_assignment_copies(self):
+        spawnammo = [0] * weapon_types.NUMGUNS
+        spawnammo[weapon_types.GUN_PISTOL] = 40
+        player_state = PlayerState()
+        player_state.ammo = spawnammo
+        player_state.ammo[weapon_types.GUN_PISTOL] -= 1
+        self.assertEqual(spawnammo[weapon_types.GUN_PISTOL], 40)
+        self.assertEqual(player_state.ammo[weapon_types.GUN_PISTOL], 39)
+
+    def test_float_ammo_assignment(self):
+        # tactics modes compute their spawn ammo with true division
+        spawnammo = [0] * weapon_types.NUMGUNS
+        spawnammo[weapon_types.GUN_SG] = 20 / 3
+        spawnammo[weapon_types.GUN_RL] = 10.0
+        player_state = PlayerState()
+        player_state.ammo = spawnammo
+        self.assertEqual(player_state.ammo[weapon_types.GUN_SG], 6)
+        self.assertEqual(player_state.ammo[weapon_types.GUN_RL], 10)
+
+    def test_protocol_output_unchanged(self):
+        player_state = PlayerState()
+        reference = ReferencePlayerState()
+        for state in (player_state, reference):
+            state.lifesequence = 3
+            state.health = 75
+            state.ammo = [1, 2, 3, 4, 5, 6, 7]
+
+        data = [CubeDataStream(), CubeDataStream()]
+        for cds, state in zip(data, (player_state, reference)):
+            swh.put_state(cds, state)
+            swh.put_ammo(cds, state)
+        self.assertEqual(bytes(data[0]), bytes(data[1]))
+
+    def test_messages_buffer_reused(self):
+        player_state = PlayerState()
+        messages = player_state.messages
+        swh.put_sound(messages, 1)
+        player_state.clear_flushed_state()
+        self.assertIs(player_state.messages, messages)
+        self.assertTrue(messages.empty())
+
+    def test_quad_pickup(self):
+        player_state = PlayerState()
+        player_state.use_game_clock(Mock(time_elapsed=0.0))
+        self.assertTrue(player_state.pickup_item(item_types.I_QUAD))
+        self.assertTrue(player_state.has_quad)
+
+    def test_timing(self):
+        count = 1000
+        iterations = 100
+
+        print("\nPlayerState size: reference {} bytes, slots {} bytes".format(reference_size(ReferencePlayerState()), size(PlayerState())))
+
+        reference_states = [ReferencePlayerState() for _ in range(count)]
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for state in reference_states:
+                swh.put_sound(state.messages, 1)
+                state.clear_flushed_state()
+            for state in reference_states:
+                state.map_change_reset()
+        reference_time = time.perf_counter() - start
+
+        states = [PlayerState() for _ in range(count)]
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for state in states:
+                swh.put_sound(state.messages, 1)
+                state.clear_flushed_state()
+            for state in states:
+                state.map_change_reset()
+        new_time = time.perf_counter() - start
+
+        print("PlayerState flush and reset: reference {:.1f} ms, slots {:.1f} ms ({:.1f}x)".format(reference_time * 1000, new_time * 1000, reference_time / new_time))
@@ -0,0 +1,60 @@
+import unittest
+
+from mock import Mock
+
+from cube2protocol.cube_data_stream import CubeDataStream
+from spyd.game.room.client_collection import ClientCollection
+
+
+def build_client(cn):
+    client = Mock(cn=cn)
+    player = Mock(client=client, cn=cn)
+    client.player_iter.return_value = iter([player])
+    client.player = player
+    return client
+
+class TestClientCollection(unittest.TestCase):
+    def setUp(self):
+        self.client_collection = ClientCollection()
+        self.clients = [build_client(cn) for cn in range(4)]
+        for client in self.clients:
+            self.client_collection.add(client)
+
+    def sent_packets(self, client):
+        return [call[0][1] for call in client.send_shared.call_args_list]
+
+    def test_broadcast_shares_one_packet(self):
+        cds = CubeDataStream()
+        cds.putint(5)
+        self.client_collection.broadcast(1, cds, True)
+
+        packets = [self.sent_packets(client)[0] for client in self.clients]
+        self.assertTrue(all(packet is packets[0] for packet in packets))
+        self.assertEqual(packets[0].data, b"\x05")
+        self.assertTrue(packets[0].reliable)
+
+    def test_broadcast_exclude_client(self):
+        self.client_collection.broadcast(1, b"\x05", True, exclude=[self.clients[1]])
+        self.assertEqual(self.sent_packets(self.clients[1]), [])
+        self.assertEqual(len(self.sent_packets(self.clients[0])), 1)
+
+    def test_broadcast_exclude_player(self):
+        self.client_collection.broadcast(1, b"\x05", True, exclude=[self.clients[2].player])
+        self.assertEqual(self.sent_packets(self.clients[2]), [])
+        self.assertEqual(len(self.sent_packets(self.clients[3])), 1)
+
+    def test_broadcast_exclude_player_not_in_collection(self):
+        client = build_client(10)
+        self.client_collection.broadcast(1, b"\x05", True, exclude=[client.player], clients=[client])
+        self.assertEqual(self.sent_packets(client), [])
+
+    def test_removed_client_not_sent(self):
+        self.client_collection.remove(self.clients[0])
+        self.client_collection.broadcast(1, b"\x05", True)
+        self.assertEqual(self.sent_packets(self.clients[0]), [])
+
+    def test_broadcastbuffer(self):
+        with self.client_collection.broadcastbuffer(1, True, [self.clients[0]]) as cds:
+            cds.putint(7)
+        self.assertEqual(self.sent_packets(self.clients[0]), [])
+        self.assertEqual(self.sent_packets(self.clients[1])[0].data, b"\x07")
@@ -0,0 +1,75 @@
+import unittest
+
+from mock import Mock
+
+from spyd.game.map.team import Team
+from spyd.game.player.player import Player
+from spyd.game.room.player_collection import PlayerCollection
+
+
+class TestPlayerCollection(unittest.TestCase):
+    def setUp(self):
+        self.player_collection = PlayerCollection()
+        self.good = Team(0, 'good')
+        self.evil = Team(1, 'evil')
+
+    def tearDown(self):
+        Player.instances_by_uuid.clear()
+
+    def add_player(self, pn, name, team=None):
+        player = Player(Mock(), pn, name, 0)
+        player.team = team
+        self.player_collection.add(player)
+        return player
+
+    def test_name_duplicates(self):
+        first = self.add_player(0, 'bob')
+        self.assertFalse(self.player_collection.is_name_duplicate('bob'))
+
+        second = self.add_player(1, 'bob')
+        self.assertTrue(self.player_collection.is_name_duplicate('bob'))
+
+        second.name = 'alice'
+        self.assertFalse(self.player_collection.is_name_duplicate('bob'))
+
+        self.player_collection.remove(first)
+        second.name = 'bob'
+        self.assertFalse(self.player_collection.is_name_duplicate('bob'))
+
+    def test_teams(self):
+        first = self.add_player(0, 'a', self.good)
+        self.add_player(1, 'b', self.good)
+        self.add_player(2, 'c', self.evil)
+
+        first.team = self.evil
+        teams = self.player_collection.teams()
+        self.assertEqual(len(teams['good'][1]), 1)
+        self.assertEqual(len(teams['evil'][1]), 2)
+        self.assertIs(teams['evil'][0], self.evil)
+
+        self.player_collection.remove(first)
+        self.assertEqual(len(self.player_collection.by_team()[self.evil]), 1)
+
+    def test_playing_count(self):
+        first = self.add_player(0, 'a')
+        second = self.add_player(1, 'b')
+        self.assertEqual(self.player_collection.playing_count, 2)
+
+        first.state.is_spectator = True
+        self.assertEqual(self.player_collection.playing_count, 1)
+
+        first.state.state = 0
+        self.assertEqual(self.player_collection.playing_count, 2)
+
+        second.state.is_spectator = True
+        self.player_collection.remove(second)
+        self.assertEqual(self.player_collection.playing_count, 1)
+
+    def test_removed_player_not_tracked(self):
+        player = self.add_player(0, 'a')
+        self.player_collection.remove(player)
+        player.name = 'b'
+        player.team = self.good
+        player.state.is_spectator = True
+        self.assertEqual(self.player_collection.teams(), {})
+        self.assertEqual(self.player_collection.playing_count, 0)
@@ -0,0 +1,69 @@
+import unittest
+
+from mock import MagicMock, Mock
+from twisted.internet import defer
+
+from spyd.game.room.exceptions import RoomEntryFailure
+from spyd.game.room.room import Room
+from spyd.server.metrics.get_metrics_service import NoOpMetricService
+
+
+def build_client(cn):
+    client = MagicMock(cn=cn, host='127.0.0.1')
+    client.player_iter.return_value = []
+    return client
+
+class TestRoomHibernation(unittest.TestCase):
+    def setUp(self):
+        self.tick_scheduler = Mock()
+        self.room = Room(Mock(), NoOpMetricService(None), room_manager=Mock(), tick_scheduler=self.tick_scheduler, tick_rate=10)
+        self.room.ready_up_controller = Mock()
+        self.room._game_clock = Mock()
+
+    def test_new_room_hibernates(self):
+        self.assertTrue(self.room.is_hibernating)
+        self.assertEqual(self.tick_scheduler.add_room.call_count, 0)
+
+    def test_wake(self):
+        self.room._wake()
+        self.assertFalse(self.room.is_hibernating)
+        self.tick_scheduler.add_room.assert_called_once_with(self.room, 10)
+        self.room._game_clock.thaw.assert_called_once_with()
+
+    def test_hibernate_when_last_client_leaves(self):
+        self.room._wake()
+        clients = [build_client(cn) for cn in range(2)]
+        for client in clients:
+            self.room._clients.add(client)
+            self.room._client_ips.setdefault(client.host, set()).add(client)
+
+        self.room.client_leave(clients[0])
+        self.assertFalse(self.room.is_hibernating)
+
+        self.room.client_leave(clients[1])
+        self.assertTrue(self.room.is_hibernating)
+        self.tick_scheduler.remove_room.assert_called_once_with(self.room)
+        self.room._game_clock.freeze.assert_called_once_with()
+
+    def test_hibernate_when_entry_fails(self):
+        map_mode_initialized = defer.Deferred()
+        self.room.await_map_mode_initialized = Mock(return_value=map_mode_initialized)
+
+        failures = []
+        self.room.client_enter(Mock(client=build_client(0))).addErrback(failures.append)
+        self.assertFalse(self.room.is_hibernating)
+
+        map_mode_initialized.errback(RoomEntryFailure("Map failed to load."))
+        self.assertEqual(len(failures), 1)
+        self.assertTrue(self.room.is_hibernating)
+        self.tick_scheduler.remove_room.assert_called_once_with(self.room)
+
+    def test_awake_while_another_entry_is_pending(self):
+        entries = [defer.Deferred(), defer.Deferred()]
+        self.room.await_map_mode_initialized = Mock(side_effect=entries)
+
+        self.room.client_enter(Mock(client=build_client(0))).addErrback(lambda failure: None)
+        self.room.client_enter(Mock(client=build_client(1)))
+
+        entries[0].errback(RoomEntryFailure("Map failed to load."))
+        self.assertFalse(self.room.is_hibernating)
@@ -54,11 +54,17 @@ class TestRoomManager(unittest.TestCase):
             self.assertEqual(room_manager.rooms, condition['rooms'])
 
     def test_find_room_for_client_ip_failure(self):
-        self.room.contains_client_with_ip = Mock(return_value=False)
         self.room_manager.add_room(self.room)
+        self.room_manager.on_room_client_ip_added(self.room, '127.0.0.2')
         self.assertEqual(self.room_manager.find_room_for_client_ip('127.0.0.1'), None)
 
     def test_find_room_for_client_ip_success(self):
-        self.room.contains_client_with_ip = Mock(return_value=True)
         self.room_manager.add_room(self.room)
+        self.room_manager.on_room_client_ip_added(self.room, '127.0.0.1')
         self.assertEqual(self.room_manager.find_room_for_client_ip('127.0.0.1'), self.room)
+
+    def test_find_room_for_client_ip_removed(self):
+        self.room_manager.add_room(self.room)
+        self.room_manager.on_room_client_ip_added(self.room, '127.0.0.1')
+        self.room_manager.on_room_client_ip_removed(self.room, '127.0.0.1')
+        self.assertEqual(self.room_manager.find_room_for_client_ip('127.0.0.1'), None)
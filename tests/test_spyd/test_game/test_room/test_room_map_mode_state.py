@@ -0,0 +1,49 @@
+import unittest
+
+from mock import Mock, patch
+from twisted.internet import defer
+
+from spyd.game.map.map_rotation import MapRotation
+from spyd.game.room.room_map_mode_state import RoomMapModeState
+
+
+rotation_dict = {'rotations': {'ffa': ['complex', 'ot']}, 'modes': ['ffa']}
+
+class TestRoomMapModeStatePrefetch(unittest.TestCase):
+    def setUp(self):
+        self.accessor = Mock()
+        self.accessor.get_map_data.side_effect = lambda map_name: defer.succeed({'ents': [], 'name': map_name})
+        self.map_mode_state = RoomMapModeState(Mock(), map_rotation=MapRotation.from_dictionary(rotation_dict), map_meta_data_accessor=self.accessor, game_clock=Mock())
+        self.map_mode_state._new_map_mode_initialize = Mock()
+
+        self.gamemodes_patch = patch.dict('spyd.game.room.room_map_mode_state.gamemodes', {'ffa': Mock()})
+        self.gamemodes_patch.start()
+
+    def tearDown(self):
+        self.gamemodes_patch.stop()
+
+    def test_prefetched_map_used_on_rotation(self):
+        self.map_mode_state.prefetch_next_map_mode()
+        self.assertEqual(self.map_mode_state._prefetched[0], 'complex')
+        self.accessor.get_map_data.reset_mock()
+
+        self.map_mode_state.rotate_map_mode()
+        self.assertEqual(self.accessor.get_map_data.call_count, 0)
+        self.assertIsNone(self.map_mode_state._prefetched)
+
+    def test_manual_change_ignores_prefetch(self):
+        self.map_mode_state.prefetch_next_map_mode()
+        self.accessor.get_map_data.reset_mock()
+
+        self.map_mode_state.change_map_mode('ot', 'ffa')
+        self.accessor.get_map_data.assert_called_once_with('ot')
+        self.assertIsNone(self.map_mode_state._prefetched)
+
+    def test_cancelled_prefetch_discards_late_result(self):
+        deferred = defer.Deferred()
+        self.accessor.get_map_data.side_effect = lambda map_name: deferred
+        self.map_mode_state.prefetch_next_map_mode()
+        self.map_mode_state.cancel_prefetch()
+
+        deferred.callback({'ents': []})
+        self.assertIsNone(self.map_mode_state._prefetched)
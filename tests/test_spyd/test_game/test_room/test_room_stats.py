@@ -0,0 +1,97 @@
+import time
+import unittest
+
+from mock import Mock
+
+from cube2common.constants import client_states
+from spyd.game.awards import AwardInstance
+from spyd.game.awards.Champion import Champion
+from spyd.game.awards.DeadEye import DeadEye
+from spyd.game.awards.FragMonger import FragMonger
+from spyd.game.player.player_state import PlayerState
+from spyd.game.room.room_stats import RoomStatsTable
+from spyd.registry_manager import RegistryManager
+
+
+def build_player(frags=0, deaths=0, flags=0, flag_returns=0, damage_dealt=0, damage_spent=0, spectator=False):
+    state = PlayerState()
+    state.frags = frags
+    state.deaths = deaths
+    state.flags = flags
+    state.flag_returns = flag_returns
+    state.damage_dealt = damage_dealt
+    state.damage_spent = damage_spent
+    if spectator:
+        state.state = client_states.CS_SPECTATOR
+    return Mock(state=state)
+
+class PerClientAward(object):
+    "Wraps an award so only its per client methods are visible."
+    def __init__(self, award):
+        self.left_weight = award.left_weight
+        self.is_client_eligible = award.is_client_eligible
+        self.get_stat_from_client = award.get_stat_from_client
+
+class TestRoomStatsTable(unittest.TestCase):
+    def setUp(self):
+        self.players = [build_player(frags=5, deaths=2, flags=1), build_player(frags=12, damage_dealt=50, damage_spent=200), build_player(frags=20, spectator=True)]
+        self.table = RoomStatsTable(self.players)
+
+    def test_columns(self):
+        self.assertEqual(list(self.table.column('frags')), [5, 12, 20])
+        self.assertEqual(list(self.table.column('health')), [100, 100, 100])
+        self.assertEqual(self.table.row(0)['deaths'], 2)
+
+    def test_eligible(self):
+        self.assertEqual(self.table.eligible('frags', 10), [False, True, False])
+
+    def test_acc_percent(self):
+        self.assertEqual(self.table.acc_percent(), [Ellipsis, 25.0, Ellipsis])
+
+    def test_ranking(self):
+        self.assertEqual(self.table.ranking('frags'), list(reversed(self.players)))
+
+    def test_awards_match_per_client(self):
+        players = self.players + [build_player(frags=15, deaths=3, flag_returns=2, damage_dealt=90, damage_spent=100),
+                                  build_player(frags=11, deaths=1, flags=2, flag_returns=2, damage_dealt=30, damage_spent=40),
+                                  build_player(frags=30, flags=5, flag_returns=4, damage_dealt=10, damage_spent=10, spectator=True)]
+        table = RoomStatsTable(players)
+
+        awards = [registration.registered_object for registration in RegistryManager.get_registrations('award')]
+        self.assertEqual(len(awards), 5)
+        for award in awards:
+            columnar = AwardInstance(award, lambda: iter(players), table)
+            per_client = AwardInstance(PerClientAward(award), lambda: iter(players))
+            self.assertEqual(columnar.eligible_clients, per_client.eligible_clients, award.award_text)
+            self.assertTrue(columnar.has_winner, award.award_text)
+            # KPD stats only compare by their formatting
+            self.assertEqual(list(map(award.format_stat, columnar.stats)), list(map(award.format_stat, per_client.stats)), award.award_text)
+            if award.stat_counter is not None:
+                winning_stat_value = per_client.get_winning_stat_value()
+                self.assertEqual(columnar.get_winning_stat_value(), winning_stat_value, award.award_text)
+                self.assertEqual(columnar.get_winners(winning_stat_value), per_client.get_winners(winning_stat_value), award.award_text)
+
+    def test_award_without_winner(self):
+        players = [build_player(frags=3)]
+        self.assertFalse(AwardInstance(DeadEye, lambda: iter(players)).has_winner)
+
+    def test_timing(self):
+        players = [build_player(frags=i, deaths=i % 7, flags=i % 3) for i in range(64)]
+        iterations = 200
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for award in (PerClientAward(Champion), PerClientAward(FragMonger)):
+                award_instance = AwardInstance(award, lambda: iter(players))
+                award_instance.get_winners(award_instance.get_winning_stat_value())
+        reference_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            table = RoomStatsTable(players)
+            for award in (Champion, FragMonger):
+                award_instance = AwardInstance(award, lambda: iter(players), table)
+                award_instance.get_winners(award_instance.get_winning_stat_value())
+        new_time = time.perf_counter() - start
+
+        print("\nawards for 64 players: per client {:.3f} ms, columnar {:.3f} ms ({:.1f}x)".format(reference_time / iterations * 1000, new_time / iterations * 1000, reference_time / new_time))
@@ -94,3 +94,124 @@ class Test(unittest.TestCase):
         self.assertEqual(game_clock.timeleft, 0)
         self.clock.advance(20)
         self.assertEqual(game_clock.timeleft, 0)
+
+    def test_freeze_stops_clock(self):
+        game_clock = GameClock()
+        game_clock.start(600, 10)
+        game_clock.resume(None)
+        self.clock.advance(20)
+
+        game_clock.freeze()
+        self.clock.advance(1000)
+        self.assertAlmostEqual(game_clock.timeleft, 580)
+        self.assertAlmostEqual(game_clock.time_elapsed, 20)
+        self.assertFalse(game_clock.is_intermission)
+
+        game_clock.thaw()
+        self.clock.advance(30)
+        self.assertAlmostEqual(game_clock.timeleft, 550)
+        self.assertAlmostEqual(game_clock.time_elapsed, 50)
+
+    def test_freeze_is_silent(self):
+        game_clock = GameClock()
+        game_clock.start(600, 10)
+        game_clock.resume(None)
+
+        calls = []
+        game_clock.add_paused_callback(calls.append, 'paused')
+        game_clock.add_resumed_callback(calls.append, 'resumed')
+
+        game_clock.freeze()
+        game_clock.thaw()
+        self.assertEqual(calls, [])
+        self.assertFalse(game_clock.is_paused)
+
+    def test_freeze_holds_scheduled_callbacks(self):
+        game_clock = GameClock()
+        game_clock.start(600, 10)
+        game_clock.resume(None)
+
+        self._was_called = False
+        def func():
+            self._was_called = True
+
+        game_clock.schedule_callback(5).add_timeup_callback(func)
+        game_clock.freeze()
+        game_clock.schedule_callback(1).add_timeup_callback(func)
+
+        self.clock.advance(10)
+        self.assertFalse(self._was_called)
+
+        game_clock.thaw()
+        self.clock.advance(1)
+        self.assertTrue(self._was_called)
+
+    def test_resume_while_frozen_waits_for_thaw(self):
+        game_clock = GameClock()
+        game_clock.start(600, 10)
+        game_clock.freeze()
+
+        game_clock.resume(None)
+        self.clock.advance(20)
+        self.assertAlmostEqual(game_clock.timeleft, 600)
+
+        game_clock.thaw()
+        self.clock.advance(20)
+        self.assertAlmostEqual(game_clock.timeleft, 580)
+
+    def test_freeze_during_resume_countdown(self):
+        game_clock = GameClock()
+        game_clock.start(600, 10)
+        game_clock.resume(3)
+        game_clock.freeze()
+
+        self.clock.advance(10)
+        self.assertTrue(game_clock.is_resuming)
+
+        game_clock.thaw()
+        self.assertFalse(game_clock.is_paused)
+
+    def test_time_snapshot(self):
+        game_clock = GameClock()
+        game_clock.start(600, 10)
+        game_clock.resume(None)
+        self.clock.advance(5)
+
+        with game_clock.time_snapshot():
+            self.assertAlmostEqual(game_clock.time_elapsed, 5)
+            self.clock.advance(1)
+            self.assertAlmostEqual(game_clock.time_elapsed, 5)
+            self.assertAlmostEqual(game_clock.get_time_elapsed(fresh=True), 6)
+            self.clock.advance(1)
+            self.assertAlmostEqual(game_clock.time_elapsed, 6)
+
+        self.assertAlmostEqual(game_clock.time_elapsed, 7)
+
+    def test_time_snapshot_reads_clock_once(self):
+        game_clock = GameClock()
+        game_clock.start(600, 10)
+        game_clock.resume(None)
+
+        seconds = self.clock.seconds
+        calls = []
+        def counting_seconds():
+            calls.append(1)
+            return seconds()
+        self.clock.seconds = counting_seconds
+
+        with game_clock.time_snapshot():
+            for _ in range(10):
+                game_clock.time_elapsed
+        self.assertEqual(len(calls), 1)
+
+    def test_time_snapshot_invalidated_by_pause(self):
+        game_clock = GameClock()
+        game_clock.start(600, 10)
+        game_clock.resume(None)
+
+        with game_clock.time_snapshot():
+            self.clock.advance(3)
+            game_clock.time_elapsed
+            game_clock.pause()
+            self.clock.advance(3)
+            self.assertAlmostEqual(game_clock.time_elapsed, 3)
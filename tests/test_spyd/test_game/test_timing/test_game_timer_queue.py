@@ -0,0 +1,82 @@
+import unittest
+
+from twisted.internet import task
+
+from spyd.game.timing.game_timer_queue import GameTimerQueue
+from spyd.game.timing.scheduled_callback_wrapper import ScheduledCallbackWrapper
+
+
+class TestGameTimerQueue(unittest.TestCase):
+    def setUp(self):
+        self.clock = task.Clock()
+        self.timer_queue = GameTimerQueue(self.clock)
+        self.timer_queue.resume()
+        self.fired = []
+
+    def schedule(self, name, seconds):
+        scheduled_callback_wrapper = ScheduledCallbackWrapper(seconds, self.timer_queue)
+        scheduled_callback_wrapper.add_timeup_callback(self.fired.append, name)
+        scheduled_callback_wrapper.resume()
+        return scheduled_callback_wrapper
+
+    def test_single_delayed_call(self):
+        for i in range(10):
+            self.schedule(i, 10 - i)
+        self.assertEqual(len(self.clock.getDelayedCalls()), 1)
+
+        self.clock.advance(10)
+        self.assertEqual(self.fired, list(reversed(range(10))))
+        self.assertEqual(len(self.clock.getDelayedCalls()), 0)
+
+    def test_pause_holds_game_time(self):
+        scheduled_callback_wrapper = self.schedule('a', 5)
+        self.clock.advance(2)
+        self.timer_queue.pause()
+        self.assertEqual(len(self.clock.getDelayedCalls()), 0)
+
+        self.clock.advance(100)
+        self.assertAlmostEqual(scheduled_callback_wrapper.timeleft, 3)
+        self.assertTrue(scheduled_callback_wrapper.is_paused)
+
+        self.timer_queue.resume()
+        self.clock.advance(2.9)
+        self.assertEqual(self.fired, [])
+        self.clock.advance(0.1)
+        self.assertEqual(self.fired, ['a'])
+
+    def test_lazy_cancel(self):
+        first = self.schedule('a', 1)
+        self.schedule('b', 2)
+        first.cancel()
+        self.assertEqual(len(self.timer_queue), 1)
+
+        self.clock.advance(2)
+        self.assertEqual(self.fired, ['b'])
+
+    def test_cancelled_entries_compacted(self):
+        wrappers = [self.schedule(i, 10 + i) for i in range(100)]
+        for scheduled_callback_wrapper in wrappers[:90]:
+            scheduled_callback_wrapper.cancel()
+        self.assertLess(len(self.timer_queue._heap), 60)
+
+        self.clock.advance(200)
+        self.assertEqual(self.fired, list(range(90, 100)))
+
+    def test_timeleft_altered(self):
+        scheduled_callback_wrapper = self.schedule('a', 10)
+        self.schedule('b', 5)
+        scheduled_callback_wrapper.timeleft = 1
+
+        self.clock.advance(1)
+        self.assertEqual(self.fired, ['a'])
+
+    def test_cancel_all_from_callback(self):
+        def cancel_all():
+            self.timer_queue.cancel_all()
+        scheduled_callback_wrapper = ScheduledCallbackWrapper(1, self.timer_queue)
+        scheduled_callback_wrapper.add_timeup_callback(cancel_all)
+        scheduled_callback_wrapper.resume()
+        self.schedule('b', 1)
+
+        self.clock.advance(5)
+        self.assertEqual(self.fired, [])
@@ -54,3 +54,14 @@ class TestGroup(unittest.TestCase):
         child_group = Group('test.child_group', (parent_group,), Ellipsis, (), ())
         self.assertFalse(child_group.allowed(functionality_name))
         
+
+    def test_merged_patterns_match_any(self):
+        other_pattern = re.compile("^test\.other$")
+        group = Group('test.my_group', (), Ellipsis, (other_pattern, functionality_pattern), ())
+        self.assertTrue(group.allowed(functionality_name))
+        self.assertTrue(group.allowed('test.other'))
+        self.assertIsNone(group.allowed('test.other.thing'))
+
+    def test_merged_patterns_do_not_leak_anchors(self):
+        group = Group('test.my_group', (), Ellipsis, (re.compile("^a$"), re.compile("^b$")), ())
+        self.assertIsNone(group.allowed('ab'))
@@ -74,3 +74,18 @@ class TestPermissionResolver(unittest.TestCase):
 
     def test_missing_group_raise_exception(self):
         self.assertRaises(MissingInheritedGroup, PermissionResolver.from_dictionary, test_permission_dictionary_with_missing_group)
+
+    def test_decision_is_cached(self):
+        server_connect_functionality = Functionality("server.connect")
+        self.permission_resolver.groups_allow(["local.ban"], server_connect_functionality)
+        self.permission_resolver.groups = {}
+        self.assertFalse(self.permission_resolver.groups_allow(("local.ban",), server_connect_functionality))
+
+    def test_load_dictionary_invalidates_cache(self):
+        server_connect_functionality = Functionality("server.connect")
+        self.assertFalse(self.permission_resolver.groups_allow(["local.ban"], server_connect_functionality))
+        version = self.permission_resolver.version
+
+        self.permission_resolver.load_dictionary({"local.ban": {"allows": ["server.connect"]}})
+        self.assertGreater(self.permission_resolver.version, version)
+        self.assertTrue(self.permission_resolver.groups_allow(["local.ban"], server_connect_functionality))
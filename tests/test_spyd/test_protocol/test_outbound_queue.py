@@ -0,0 +1,66 @@
+import unittest
+
+from mock import Mock
+
+from spyd.protocol.outbound_queue import OutboundQueue
+
+
+class TestOutboundQueue(unittest.TestCase):
+    def setUp(self):
+        self.send = Mock()
+        self.on_pending = Mock()
+        self.outbound_queue = OutboundQueue(self.send, 8, self.on_pending)
+
+    def sent(self):
+        return [call[0] for call in self.send.call_args_list]
+
+    def test_coalesces_messages(self):
+        self.outbound_queue.queue(1, b"\x01\x02")
+        self.outbound_queue.queue(1, b"\x03")
+        self.outbound_queue.queue(1, b"\x04\x05")
+
+        self.assertEqual(self.send.call_count, 0)
+        self.assertEqual(self.outbound_queue.flush(), 2)
+        self.assertEqual(self.sent(), [(1, b"\x01\x02\x03\x04\x05", True)])
+        self.assertTrue(self.outbound_queue.empty)
+
+    def test_splits_at_mtu(self):
+        self.outbound_queue.queue(1, b"\x01" * 5)
+        self.outbound_queue.queue(1, b"\x02" * 5)
+        self.outbound_queue.queue(1, b"\x03" * 3)
+
+        self.assertEqual(self.outbound_queue.flush(), 1)
+        self.assertEqual(self.sent(), [(1, b"\x01" * 5, True), (1, b"\x02" * 5 + b"\x03" * 3, True)])
+
+    def test_oversized_message_sent_alone(self):
+        self.outbound_queue.queue(1, b"\x01")
+        self.outbound_queue.queue(1, b"\x02" * 20)
+
+        self.outbound_queue.flush()
+        self.assertEqual(self.sent(), [(1, b"\x01", True), (1, b"\x02" * 20, True)])
+
+    def test_channels_kept_separate(self):
+        self.outbound_queue.queue(1, b"\x01")
+        self.outbound_queue.queue(0, b"\x02")
+        self.outbound_queue.queue(1, b"\x03")
+
+        self.assertEqual(self.outbound_queue.flush_channel(0), 0)
+        self.assertEqual(self.sent(), [(0, b"\x02", True)])
+        self.assertTrue(self.outbound_queue.has_pending(1))
+
+        self.outbound_queue.flush()
+        self.assertEqual(self.sent()[1:], [(1, b"\x01\x03", True)])
+
+    def test_on_pending_called_once(self):
+        self.outbound_queue.queue(1, b"\x01")
+        self.outbound_queue.queue(0, b"\x02")
+        self.on_pending.assert_called_once_with(self.outbound_queue)
+
+        self.outbound_queue.flush()
+        self.outbound_queue.queue(1, b"\x03")
+        self.assertEqual(self.on_pending.call_count, 2)
+
+    def test_empty_message_ignored(self):
+        self.outbound_queue.queue(1, b"")
+        self.assertTrue(self.outbound_queue.empty)
+        self.assertEqual(self.on_pending.call_count, 0)
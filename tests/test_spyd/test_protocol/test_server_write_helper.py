@@ -0,0 +1,33 @@
+import unittest
+
+from mock import Mock
+
+from cube2common.constants import message_types
+from cube2common.vec import vec
+from cube2protocol.cube_data_stream import CubeDataStream
+from spyd.protocol import swh
+
+
+class TestServerWriteHelper(unittest.TestCase):
+    def setUp(self):
+        self.cds = CubeDataStream()
+
+    def expected(self, *values):
+        cds = CubeDataStream()
+        for value in values:
+            cds.putint(value)
+        return bytes(cds)
+
+    def test_put_shotfx(self):
+        client = Mock(cn=3)
+        swh.put_shotfx(self.cds, client, 2, 15, vec(100, -200, 70000), vec(1, 2, 3))
+        self.assertEqual(bytes(self.cds), self.expected(message_types.N_SHOTFX, 3, 2, 15, 100, -200, 70000, 1, 2, 3))
+
+    def test_put_spawn(self):
+        player_state = Mock(lifesequence=1, health=100, maxhealth=100, armour=25, armourtype=0, gunselect=4, ammo=[0, 1, 2, 3, 4, 5, 6, 7])
+        swh.put_spawn(self.cds, player_state)
+        self.assertEqual(bytes(self.cds), self.expected(message_types.N_SPAWN, 1, 100, 100, 25, 0, 4, 1, 2, 3, 4, 5, 6))
+
+    def test_put_info_reply(self):
+        swh.put_info_reply(self.cds, "server", 3, 16, 0, "complex", 600, 1, False, 100)
+        self.assertEqual(bytes(self.cds)[-15:], b"complex\x00server\x00")
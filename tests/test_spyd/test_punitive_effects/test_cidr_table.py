@@ -0,0 +1,55 @@
+import random
+import unittest
+
+from spyd.punitive_effects.cidr_table import CidrTable, prefix_length_of_mask, mask_of_prefix_length
+
+
+def address(a, b, c, d):
+    return (a << 24) | (b << 16) | (c << 8) | d
+
+class TestCidrTable(unittest.TestCase):
+    def setUp(self):
+        self.table = CidrTable()
+
+    def test_masks(self):
+        self.assertEqual(prefix_length_of_mask(0xFFFFFF00), 24)
+        self.assertEqual(prefix_length_of_mask(0), 0)
+        self.assertEqual(prefix_length_of_mask(0xFFFFFFFF), 32)
+        self.assertIsNone(prefix_length_of_mask(0x00FFFFFF))
+        self.assertEqual(mask_of_prefix_length(8), 0xFF000000)
+
+    def test_longest_prefix_wins(self):
+        self.table.insert(address(10, 0, 0, 0), 8, 'wide')
+        self.table.insert(address(10, 1, 2, 0), 24, 'narrow')
+        self.assertEqual(self.table.longest_match(address(10, 1, 2, 3)), 'narrow')
+        self.assertEqual(self.table.longest_match(address(10, 1, 3, 3)), 'wide')
+        self.assertIsNone(self.table.longest_match(address(11, 1, 2, 3)))
+
+    def test_default_route(self):
+        self.table.insert(0, 0, 'everything')
+        self.assertEqual(self.table.longest_match(address(1, 2, 3, 4)), 'everything')
+
+    def test_remove_keeps_other_prefixes(self):
+        self.table.insert(address(10, 1, 2, 0), 24, 'a')
+        self.table.insert(address(10, 1, 3, 0), 24, 'b')
+        self.table.insert(address(10, 0, 0, 0), 8, 'c')
+        self.assertEqual(self.table.remove(address(10, 1, 2, 0), 24), 'a')
+        self.assertEqual(len(self.table), 2)
+        self.assertEqual(self.table.longest_match(address(10, 1, 2, 1)), 'c')
+        self.assertEqual(self.table.longest_match(address(10, 1, 3, 1)), 'b')
+        self.assertIsNone(self.table.remove(address(10, 1, 2, 0), 24))
+
+    def test_matches_linear_scan(self):
+        random_state = random.Random(7)
+        prefixes = {}
+        for _ in range(500):
+            length = random_state.choice((8, 16, 20, 24, 28, 32))
+            prefix = random_state.getrandbits(32) & mask_of_prefix_length(length)
+            prefixes[(prefix, length)] = (prefix, length)
+            self.table.insert(prefix, length, (prefix, length))
+
+        for _ in range(2000):
+            probe = random_state.choice(list(prefixes))[0] | random_state.getrandbits(8)
+            matching = [key for key in prefixes if probe & mask_of_prefix_length(key[1]) == key[0]]
+            expected = max(matching, key=lambda key: key[1]) if matching else None
+            self.assertEqual(self.table.longest_match(probe), expected)
@@ -1,9 +1,31 @@
+import random
+import time
 import unittest
 
+from spyd.punitive_effects.punitive_effect_info import EffectInfo, PermaExpiryInfo, TimedExpiryInfo
 from spyd.punitive_effects.punitive_model import PunitiveModel
+from spyd.utils.net import dottedQuadToLong, simpleMaskedIpToLongIpAndMask
 from mock import Mock
 
 
+class ReferencePunitiveModel(object):
+    "The mask scanning PunitiveModel, kept for the benchmark."
+    def __init__(self):
+        self.punitive_effects = {}
+
+    def get_effect(self, effect_type, client_ip):
+        client_ip = dottedQuadToLong(client_ip)
+        for mask, effects in self.punitive_effects.get(effect_type, {}).items():
+            masked_ip = mask & client_ip
+            if masked_ip in effects:
+                return effects[masked_ip]
+        return None
+
+    def add_effect(self, effect_type, effect_desc, effect_info):
+        long_ip, long_mask = simpleMaskedIpToLongIpAndMask(effect_desc)
+        self.punitive_effects.setdefault(effect_type, {}).setdefault(long_mask, {})[long_ip & long_mask] = effect_info
+
+
 class TestPunitiveModel(unittest.TestCase):
     def setUp(self):
         self.ban_effect = Mock()
@@ -32,3 +54,75 @@ class TestPunitiveModel(unittest.TestCase):
         self.punitive_model.add_effect('mute', '127.0.0.1', self.mute_effect)
         self.assertEqual(self.punitive_model.get_effect('ban', '127.0.0.1'), self.ban_effect)
         self.assertEqual(self.punitive_model.get_effect('mute', '127.0.0.1'), self.mute_effect)
+
+    def test_longest_prefix_wins(self):
+        self.punitive_model.add_effect('ban', '127.0', self.mute_effect)
+        self.punitive_model.add_effect('ban', '127.0.0.1', self.ban_effect)
+        self.assertEqual(self.punitive_model.get_effect('ban', '127.0.0.1'), self.ban_effect)
+        self.assertEqual(self.punitive_model.get_effect('ban', '127.0.0.2'), self.mute_effect)
+
+    def test_dotted_quad_long_tuple(self):
+        self.punitive_model.add_effect('ban', (dottedQuadToLong('10.1.0.0'), dottedQuadToLong('255.255.0.0')), self.ban_effect)
+        self.assertEqual(self.punitive_model.get_effect('ban', '10.1.200.3'), self.ban_effect)
+        self.assertEqual(self.punitive_model.get_effect('ban', '10.2.0.3'), None)
+
+    def test_expired_effects_are_purged(self):
+        now = [1000.0]
+        punitive_model = PunitiveModel(clock=lambda: now[0])
+        punitive_model.add_effect('ban', '127.0.0.1', EffectInfo(TimedExpiryInfo(1010.0)))
+        punitive_model.add_effect('ban', '127.0', EffectInfo(TimedExpiryInfo(1020.0)))
+        punitive_model.add_effect('ban', '10.0.0.1', EffectInfo(PermaExpiryInfo()))
+
+        now[0] = 1015.0
+        self.assertEqual(punitive_model.get_effect('ban', '127.0.0.1').expiry_info.expiry_time, 1020.0)
+        self.assertEqual(punitive_model.effect_count('ban'), 2)
+
+        now[0] = 1025.0
+        self.assertIsNone(punitive_model.get_effect('ban', '127.0.0.1'))
+        self.assertIsNotNone(punitive_model.get_effect('ban', '10.0.0.1'))
+        self.assertEqual(punitive_model.effect_count('ban'), 1)
+
+    def test_replaced_effect_outlives_old_expiry(self):
+        now = [1000.0]
+        punitive_model = PunitiveModel(clock=lambda: now[0])
+        punitive_model.add_effect('ban', '127.0.0.1', EffectInfo(TimedExpiryInfo(1010.0)))
+        punitive_model.add_effect('ban', '127.0.0.1', EffectInfo(PermaExpiryInfo()))
+        now[0] = 1020.0
+        self.assertIsNotNone(punitive_model.get_effect('ban', '127.0.0.1'))
+
+    def test_bulk_import(self):
+        effects = [('10.{}.{}'.format(i // 256, i % 256), self.ban_effect) for i in range(1000)]
+        self.punitive_model.add_effects('ban', effects)
+        self.assertEqual(self.punitive_model.effect_count('ban'), 1000)
+        self.assertEqual(self.punitive_model.get_effect('ban', '10.3.231.9'), self.ban_effect)
+        self.assertEqual(self.punitive_model.get_effect('ban', '10.3.232.9'), None)
+
+    def test_timing(self):
+        random_state = random.Random(3)
+        effects = []
+        for _ in range(100000):
+            octets = [str(random_state.randrange(1, 255)) for _ in range(random_state.choice((2, 3, 4)))]
+            effects.append(('.'.join(octets), EffectInfo(PermaExpiryInfo())))
+        probes = ['{}.{}.{}.{}'.format(*[random_state.randrange(1, 255) for _ in range(4)]) for _ in range(10000)]
+
+        reference_model = ReferencePunitiveModel()
+        start = time.perf_counter()
+        for effect_desc, effect_info in effects:
+            reference_model.add_effect('ban', effect_desc, effect_info)
+        reference_load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.punitive_model.add_effects('ban', effects)
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reference_results = [reference_model.get_effect('ban', probe) for probe in probes]
+        reference_lookup_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = [self.punitive_model.get_effect('ban', probe) for probe in probes]
+        lookup_time = time.perf_counter() - start
+
+        self.assertEqual(sum(result is not None for result in results), sum(result is not None for result in reference_results))
+        print("\n100k bans: load reference {:.0f} ms, bulk {:.0f} ms; lookup reference {:.2f} us, cidr table {:.2f} us".format(
+            reference_load_time * 1000, load_time * 1000, reference_lookup_time / len(probes) * 1e6, lookup_time / len(probes) * 1e6))
@@ -0,0 +1,59 @@
+import io
+import unittest
+
+from mock import Mock, patch
+from twisted.application import service
+from twisted.internet import defer, task
+
+from spyd.game.map.map_warm_up import MapWarmUp
+from spyd.server.metrics.get_metrics_service import NoOpMetricService
+from spyd.server.tick_scheduler import TickScheduler
+
+try:
+    # the bindings need the enet extension
+    from spyd.server.binding.binding_service import BindingService
+except ImportError:
+    BindingService = None
+
+@unittest.skipIf(BindingService is None, "enet is not installed")
+class TestBindingService(unittest.TestCase):
+    def setUp(self):
+        self.clock = task.Clock()
+        metrics_service = NoOpMetricService(None)
+
+        self.root_service = service.MultiService()
+        self.root_service.startService()
+
+        self.message_coalescer = Mock()
+        self.binding_service = BindingService(Mock(), metrics_service, self.message_coalescer)
+        self.binding_service.add_binding('127.0.0.1', 28785, 16, 0, 0, 10)
+        self.binding, = self.binding_service.bindings
+        self.binding.listen = Mock()
+
+        self.tick_scheduler = TickScheduler(metrics_service, tick_rate=30, reactor=self.clock)
+        self.tick_scheduler.add_flusher(self.binding_service.flush_all)
+        self.tick_scheduler.setServiceParent(self.root_service)
+
+    def test_not_flushed_during_warm_up(self):
+        pending = defer.Deferred()
+        accessor = Mock()
+        accessor.get_map_data.return_value = pending
+
+        output = io.StringIO()
+        with patch('sys.stdout', output), patch('sys.stderr', output):
+            map_warm_up = MapWarmUp(accessor, concurrency=2)
+            map_warm_up.warm_up(['complex']).addBoth(lambda _: self.binding_service.setServiceParent(self.root_service))
+
+            self.clock.pump([1.0 / 30] * 30)
+            self.assertEqual(self.message_coalescer.flush.call_count, 0)
+
+            pending.callback({})
+            self.clock.pump([1.0 / 30] * 30)
+
+        self.assertEqual(output.getvalue(), '')
+        self.binding.listen.assert_called_once_with(self.binding_service.client_protocol_factory)
+        self.assertGreater(self.message_coalescer.flush.call_count, 0)
+
+    def test_flush_before_listening(self):
+        self.binding_service.startService()
+        self.assertIsNone(self.binding.flush())
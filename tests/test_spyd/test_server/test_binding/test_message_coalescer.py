@@ -0,0 +1,48 @@
+import unittest
+
+from mock import Mock
+
+from spyd.server.binding.message_coalescer import MessageCoalescer
+from spyd.server.metrics.get_metrics_service import NoOpMetricService
+
+
+class TestMessageCoalescer(unittest.TestCase):
+    def setUp(self):
+        self.message_coalescer = MessageCoalescer(NoOpMetricService(None), enabled=True, mtu=1200)
+        self.message_coalescer.packets_saved_rate_aggregator = Mock()
+
+    def test_disabled(self):
+        message_coalescer = MessageCoalescer.from_dictionary(NoOpMetricService(None), {})
+        self.assertIsNone(message_coalescer.build_queue(Mock()))
+
+    def test_flush_sends_pending_queues(self):
+        sends = [Mock(), Mock()]
+        queues = [self.message_coalescer.build_queue(send) for send in sends]
+
+        for outbound_queue in queues:
+            for i in range(3):
+                outbound_queue.queue(1, bytes((i,)))
+
+        self.message_coalescer.flush()
+
+        for send in sends:
+            send.assert_called_once_with(1, b"\x00\x01\x02", True)
+        self.message_coalescer.packets_saved_rate_aggregator.tick.assert_called_once_with(4)
+
+    def test_flush_only_pending_queues(self):
+        send = Mock()
+        outbound_queue = self.message_coalescer.build_queue(send)
+        outbound_queue.queue(1, b"\x01")
+
+        self.message_coalescer.flush()
+        self.message_coalescer.flush()
+        self.assertEqual(send.call_count, 1)
+
+    def test_discarded_queue_not_flushed(self):
+        send = Mock()
+        outbound_queue = self.message_coalescer.build_queue(send)
+        outbound_queue.queue(1, b"\x01")
+
+        self.message_coalescer.discard_queue(outbound_queue)
+        self.message_coalescer.flush()
+        self.assertEqual(send.call_count, 0)
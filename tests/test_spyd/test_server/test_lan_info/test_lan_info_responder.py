@@ -0,0 +1,174 @@
+import time
+import unittest
+
+from mock import Mock
+
+from cube2protocol.cube_data_stream import CubeDataStream
+from cube2protocol.read_cube_data_stream import ReadCubeDataStream
+from spyd.game.player.player_state import PlayerState
+from spyd.protocol import swh
+from spyd.server.lan_info.lan_info_responder import LanInfoResponder, get_ext_info_reply_cds, EXT_NO_ERROR, EXT_PLAYERSTATS_RESP_IDS, EXT_PLAYERSTATS_RESP_STATS
+
+
+def reference_info_reply(room, millis):
+    cds = CubeDataStream()
+    cds.putint(millis)
+    swh.put_info_reply(cds, room.lan_info_name, room.player_count, room.maxplayers, room.mode_num, room.map_name, room.timeleft, room.mastermask, room.is_paused, 100)
+    return bytes(cds)
+
+def reference_player_stats(rcds, players, send_ips=True):
+    "The per request encoding of the ext playerstats response, kept for comparison and the benchmark."
+    datagrams = []
+
+    cds = get_ext_info_reply_cds(rcds)
+    cds.putint(EXT_NO_ERROR)
+    cds.putint(EXT_PLAYERSTATS_RESP_IDS)
+    for player in players:
+        cds.putint(player.pn)
+    datagrams.append(bytes(cds))
+
+    for player in players:
+        cds = get_ext_info_reply_cds(rcds)
+        cds.putint(EXT_NO_ERROR)
+        cds.putint(EXT_PLAYERSTATS_RESP_STATS)
+        state = player.state
+        cds.putint(player.pn)
+        cds.putint(player.ping)
+        cds.putstring(player.name)
+        cds.putstring(player.team_name)
+        cds.putint(state.frags)
+        cds.putint(state.flags)
+        cds.putint(state.deaths)
+        cds.putint(state.teamkills)
+        cds.putint(state.acc_percent_int)
+        cds.putint(state.health)
+        cds.putint(state.armour)
+        cds.putint(state.gunselect)
+        cds.putint(player.privilege)
+        cds.putint(state.state)
+        if send_ips:
+            octs = player.client.host.split('.')[:3]
+            for i in range(3):
+                cds.putbyte(int(octs[i]))
+        else:
+            for i in range(3):
+                cds.putbyte(0)
+        datagrams.append(bytes(cds))
+
+    return datagrams
+
+class FakePlayer(object):
+    def __init__(self, pn):
+        self.pn = pn
+        self.ping = 20 + pn
+        self.name = 'player{}'.format(pn)
+        self.team_name = 'good'
+        self.privilege = 0
+        self.state = PlayerState()
+        self.state.frags = pn * 3
+        self.client = Mock(host='10.0.{}.1'.format(pn))
+        self.ext_info_stats = None
+
+def player_stats_request(pn):
+    cds = CubeDataStream()
+    cds.putint(0)
+    cds.putint(1)
+    cds.putint(pn)
+    return ReadCubeDataStream(bytes(cds))
+
+class FakeRoom(object):
+    lan_info_name = 'spyd #1'
+    player_count = 3
+    maxplayers = 16
+    mode_num = 0
+    map_name = 'complex'
+    timeleft = 600
+    mastermask = -1
+    is_paused = False
+
+class FakeProtocol(object):
+    def send(self, data, address):
+        pass
+
+class TestLanInfoResponder(unittest.TestCase):
+    def setUp(self):
+        self.room = Mock(lan_info_name='spyd #1', player_count=3, maxplayers=16, mode_num=0, map_name='complex', timeleft=600, mastermask=-1, is_paused=False)
+        self.protocol = Mock()
+        self.responder = LanInfoResponder(Mock(), self.protocol, self.room, {})
+
+    def test_reply_matches_reference(self):
+        self.responder.info_request(('1.2.3.4', 5), 1234)
+        self.protocol.send.assert_called_once_with(reference_info_reply(self.room, 1234), ('1.2.3.4', 5))
+
+    def test_body_reused_until_room_changes(self):
+        body = self.responder.get_info_reply_body()
+        self.assertIs(self.responder.get_info_reply_body(), body)
+
+        self.room.map_name = 'turbine'
+        self.assertIsNot(self.responder.get_info_reply_body(), body)
+        self.responder.info_request(('1.2.3.4', 5), 99)
+        self.protocol.send.assert_called_with(reference_info_reply(self.room, 99), ('1.2.3.4', 5))
+
+    def test_player_stats_match_reference(self):
+        players = [FakePlayer(pn) for pn in range(1, 4)]
+        self.room.players = players
+        self.room.flush_count = 0
+        self.room.get_player = lambda pn: players[pn - 1]
+        self.responder.room_manager.find_room_for_client_ip.return_value = None
+
+        for pn, expected_players in ((-1, players), (2, players[1:2])):
+            self.protocol.reset_mock()
+            self.responder.ext_player_stats_request(('1.2.3.4', 5), player_stats_request(pn), pn)
+            sent = [call[0][0] for call in self.protocol.send.call_args_list]
+            self.assertEqual(sent, reference_player_stats(player_stats_request(pn), expected_players))
+
+    def test_player_stats_reencoded_each_tick(self):
+        player = FakePlayer(1)
+        self.room.players = [player]
+        self.room.flush_count = 0
+        self.responder.room_manager.find_room_for_client_ip.return_value = None
+
+        body = self.responder.get_player_stats_body(self.room, player)
+        player.state.frags = 40
+        self.assertIs(self.responder.get_player_stats_body(self.room, player), body)
+        self.assertIs(self.responder.get_room_player_ids_body(self.room, [player]), self.responder.get_room_player_ids_body(self.room, [player]))
+
+        self.room.flush_count = 1
+        self.responder.ext_player_stats_request(('1.2.3.4', 5), player_stats_request(-1), -1)
+        self.assertEqual(self.protocol.send.call_args_list[-1][0][0], reference_player_stats(player_stats_request(-1), [player])[-1])
+
+    def test_timing(self):
+        room = FakeRoom()
+        iterations = 20000
+
+        start = time.perf_counter()
+        for millis in range(1, iterations):
+            reference_info_reply(room, millis)
+        reference_time = time.perf_counter() - start
+
+        responder = LanInfoResponder(None, FakeProtocol(), room, {})
+        start = time.perf_counter()
+        for millis in range(1, iterations):
+            responder.info_request(None, millis)
+        new_time = time.perf_counter() - start
+
+        print("\ninfo reply: reference {:.2f} us, cached {:.2f} us".format(reference_time / iterations * 1e6, new_time / iterations * 1e6))
+
+    def test_player_stats_timing(self):
+        room = FakeRoom()
+        room.players = [FakePlayer(pn) for pn in range(1, 17)]
+        room.flush_count = 0
+        responder = LanInfoResponder(None, FakeProtocol(), room, {'wc_room_workaround': False})
+        iterations = 2000
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            reference_player_stats(player_stats_request(-1), room.players)
+        reference_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            responder.ext_player_stats_request(None, player_stats_request(-1), -1)
+        new_time = time.perf_counter() - start
+
+        print("\next playerstats for 16 players: reference {:.1f} us, pre-encoded {:.1f} us".format(reference_time / iterations * 1e6, new_time / iterations * 1e6))
@@ -0,0 +1,69 @@
+import unittest
+
+from mock import Mock
+from twisted.internet import task
+
+from spyd.server.lan_info.lan_info_protocol import LanInfoProtocol
+from spyd.server.lan_info.lan_info_service import LanInfoService
+from spyd.server.lan_info.source_rate_limiter import SourceRateLimiter
+
+
+class TestSourceRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = task.Clock()
+        self.rate_limiter = SourceRateLimiter(rate=2.0, burst=3, max_sources=2, clock=self.clock)
+
+    def test_burst_then_drop(self):
+        self.assertEqual([self.rate_limiter.allow('1.1.1.1') for _ in range(4)], [True, True, True, False])
+        self.assertEqual(self.rate_limiter.dropped_count, 1)
+        self.assertTrue(self.rate_limiter.allow('2.2.2.2'))
+
+    def test_refill(self):
+        for _ in range(3):
+            self.rate_limiter.allow('1.1.1.1')
+        self.clock.advance(0.5)
+        self.assertTrue(self.rate_limiter.allow('1.1.1.1'))
+        self.assertFalse(self.rate_limiter.allow('1.1.1.1'))
+
+    def test_idle_sources_forgotten(self):
+        self.rate_limiter.allow('1.1.1.1')
+        self.rate_limiter.allow('2.2.2.2')
+        self.clock.advance(10)
+        self.rate_limiter.allow('3.3.3.3')
+        self.assertEqual(set(self.rate_limiter._buckets), {'3.3.3.3'})
+
+    def test_max_sources_while_active(self):
+        rate_limiter = SourceRateLimiter(rate=4.0, burst=16, max_sources=100, clock=self.clock)
+        for i in range(1000):
+            rate_limiter.allow('10.0.{}.{}'.format(i // 256, i % 256))
+            self.clock.advance(0.001)
+        self.assertEqual(len(rate_limiter._buckets), 100)
+        self.assertEqual(next(iter(rate_limiter._buckets)), '10.0.3.132')
+
+    def test_least_recently_seen_forgotten(self):
+        self.rate_limiter.allow('1.1.1.1')
+        self.rate_limiter.allow('2.2.2.2')
+        self.rate_limiter.allow('1.1.1.1')
+        self.rate_limiter.allow('3.3.3.3')
+        self.assertEqual(list(self.rate_limiter._buckets), ['1.1.1.1', '3.3.3.3'])
+
+    def test_protocol_drops_limited_datagrams(self):
+        dropped_rate_aggregator = Mock()
+        protocol = LanInfoProtocol(rate_limiter=self.rate_limiter, dropped_rate_aggregator=dropped_rate_aggregator)
+        responder = Mock()
+        protocol.add_responder(responder)
+        for _ in range(5):
+            protocol.datagramReceived(b'\x05', ('1.1.1.1', 1000))
+        self.assertEqual(responder.info_request.call_count, 3)
+        self.assertEqual(dropped_rate_aggregator.tick.call_count, 2)
+
+class TestLanInfoServiceRateLimit(unittest.TestCase):
+    def test_limiter_per_port(self):
+        lan_info_service = LanInfoService(Mock(), False, {'enabled': True}, rate_limit_config={'rate': 4.0, 'burst': 16})
+        protocols = [lan_info_service._build_protocol(multicast=False) for _ in range(2)]
+        self.assertIsNotNone(protocols[0].rate_limiter)
+        self.assertIsNot(protocols[0].rate_limiter, protocols[1].rate_limiter)
+
+    def test_disabled(self):
+        lan_info_service = LanInfoService(Mock(), False, {'enabled': True}, rate_limit_config={'enabled': False})
+        self.assertIsNone(lan_info_service._build_protocol(multicast=False).rate_limiter)
@@ -0,0 +1,113 @@
+import unittest
+
+from mock import Mock
+from twisted.internet import task
+
+from spyd.server.metrics.get_metrics_service import NoOpMetricService
+from spyd.server.tick_scheduler import TickScheduler
+
+
+def build_room():
+    return Mock(decommissioned=False)
+
+class TestTickScheduler(unittest.TestCase):
+    def setUp(self):
+        self.clock = task.Clock()
+        self.tick_scheduler = TickScheduler(NoOpMetricService(None), tick_rate=10, max_catch_up_ticks=3, reactor=self.clock)
+        self.tick_scheduler.skipped_tick_rate_aggregator = Mock()
+
+        self.calls = []
+        self.flusher = lambda: self.calls.append('flusher')
+
+    def build_room(self, name, tick_rate=None):
+        room = build_room()
+        room.flush_messages.side_effect = lambda: self.calls.append(name)
+        self.tick_scheduler.add_room(room, tick_rate)
+        return room
+
+    def test_rooms_flushed_in_order_before_flushers(self):
+        self.build_room('a')
+        self.build_room('b')
+        self.tick_scheduler.add_flusher(self.flusher)
+
+        self.tick_scheduler.startService()
+        self.clock.advance(0)
+
+        self.assertEqual(self.calls, ['a', 'b', 'flusher'])
+
+    def test_tick_rate(self):
+        room = self.build_room('a')
+        self.tick_scheduler.startService()
+
+        self.clock.pump([0] + [0.1] * 10)
+        self.assertEqual(room.flush_messages.call_count, 11)
+
+    def test_room_tick_rate(self):
+        fast_room = self.build_room('fast')
+        slow_room = self.build_room('slow', tick_rate=5)
+        self.tick_scheduler.startService()
+
+        self.clock.pump([0] + [0.1] * 10)
+        self.assertEqual(fast_room.flush_messages.call_count, 11)
+        self.assertEqual(slow_room.flush_messages.call_count, 6)
+
+    def test_remove_room(self):
+        room = self.build_room('a')
+        self.tick_scheduler.startService()
+        self.clock.advance(0)
+
+        self.tick_scheduler.remove_room(room)
+        self.clock.advance(0.1)
+        self.assertEqual(room.flush_messages.call_count, 1)
+        self.assertFalse(self.tick_scheduler.has_room(room))
+
+    def test_decommissioned_room_dropped(self):
+        room = self.build_room('a')
+        room.decommissioned = True
+        self.tick_scheduler.startService()
+        self.clock.advance(0)
+
+        self.assertEqual(room.flush_messages.call_count, 0)
+        self.assertEqual(self.tick_scheduler.rooms, [])
+
+    def test_catches_up_when_slightly_behind(self):
+        room = self.build_room('a')
+        self.tick_scheduler.startService()
+        self.clock.advance(0)
+
+        # The late ticks run back to back and the timeline is kept
+        self.clock.advance(0.25)
+        self.assertEqual(room.flush_messages.call_count, 3)
+        self.clock.advance(0.06)
+        self.assertEqual(room.flush_messages.call_count, 4)
+        self.assertEqual(self.tick_scheduler.skipped_tick_rate_aggregator.tick.call_count, 0)
+
+    def test_skips_when_far_behind(self):
+        room = self.build_room('a')
+        self.tick_scheduler.startService()
+        self.clock.advance(0)
+
+        self.clock.advance(1.0)
+        self.assertEqual(self.tick_scheduler.skipped_tick_rate_aggregator.tick.call_count, 1)
+        self.assertEqual(room.flush_messages.call_count, 2)
+
+        # The timeline restarts from the late tick
+        self.clock.advance(0.1)
+        self.assertEqual(room.flush_messages.call_count, 3)
+
+    def test_flusher_exception_does_not_stop_ticks(self):
+        self.tick_scheduler.add_flusher(Mock(side_effect=Exception("boom")))
+        room = self.build_room('a')
+        self.tick_scheduler.startService()
+
+        self.clock.pump([0, 0.1])
+        self.assertEqual(room.flush_messages.call_count, 2)
+
+    def test_stop_service(self):
+        room = self.build_room('a')
+        self.tick_scheduler.startService()
+        self.clock.advance(0)
+        self.tick_scheduler.stopService()
+
+        self.clock.advance(1.0)
+        self.assertEqual(room.flush_messages.call_count, 1)
@@ -0,0 +1,93 @@
+import unittest
+
+from spyd.utils.tracing import Tracer
+
+
+class Base(object):
+    def shoot(self, target):
+        return target
+
+    def explode(self):
+        raise ValueError("boom")
+
+class Derived(Base):
+    def spawn(self):
+        return 'spawned'
+
+class TestTracer(unittest.TestCase):
+    def setUp(self):
+        self.tracer = Tracer(buffer_size=100)
+        self.tracer.register_class(Base)
+        self.tracer.register_class(Derived)
+        self.originals = dict(Base.__dict__), dict(Derived.__dict__)
+
+    def tearDown(self):
+        self.tracer.disable()
+
+    def events(self):
+        return [(r.event, r.name) for r in self.tracer.drain()]
+
+    def test_disabled_by_default(self):
+        self.assertFalse(self.tracer.enabled)
+        self.assertIs(Base.__dict__['shoot'], self.originals[0]['shoot'])
+        Base().shoot(1)
+        self.assertEqual(self.events(), [])
+
+    def test_enable_class(self):
+        self.tracer.enable('Base')
+        self.assertEqual(Base().shoot(5), 5)
+        self.assertEqual(self.events(), [('start', 'Base.shoot'), ('end', 'Base.shoot')])
+
+    def test_enable_method(self):
+        self.tracer.enable('Derived.spawn')
+        derived = Derived()
+        derived.shoot(1)
+        self.assertEqual(derived.spawn(), 'spawned')
+        self.assertEqual(self.events(), [('start', 'Derived.spawn'), ('end', 'Derived.spawn')])
+
+    def test_no_double_wrapping(self):
+        self.tracer.enable('Base')
+        self.tracer.enable('Derived')
+        Derived().shoot(1)
+        self.assertEqual(self.events(), [('start', 'Derived.shoot'), ('end', 'Derived.shoot')])
+
+    def test_disable_restores_classes(self):
+        self.tracer.enable('Base')
+        self.tracer.enable('Derived')
+        self.tracer.disable()
+        self.assertEqual(dict(Base.__dict__), self.originals[0])
+        self.assertEqual(dict(Derived.__dict__), self.originals[1])
+
+    def test_exception_recorded(self):
+        self.tracer.enable('Base.explode')
+        self.assertRaises(ValueError, Base().explode)
+        records = self.tracer.drain()
+        self.assertEqual(records[-1].event, 'raise')
+        self.assertIn('ValueError: boom', records[-1].detail)
+
+    def test_sampling(self):
+        self.tracer.enable('Base.shoot', 0.0)
+        Base().shoot(1)
+        self.assertEqual(self.events(), [])
+
+    def test_ring_buffer_bounded(self):
+        self.tracer.enable('Base.shoot')
+        base = Base()
+        for i in range(100):
+            base.shoot(i)
+        self.assertEqual(len(self.tracer.records), 100)
+        self.assertEqual(self.tracer.dropped, 100)
+
+    def test_configure_deferred_registration(self):
+        self.tracer.configure({'enabled': True, 'targets': {'Later': 1.0}})
+
+        class Later(object):
+            def run(self):
+                pass
+
+        self.tracer.register_class(Later)
+        Later().run()
+        self.assertEqual(self.events(), [('start', 'Later.run'), ('end', 'Later.run')])
+
+    def test_unknown_target(self):
+        self.assertRaises(KeyError, self.tracer.enable, 'Unknown')
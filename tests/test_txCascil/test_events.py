@@ -0,0 +1,48 @@
+import unittest
+
+from mock import Mock
+
+from txCascil.events import EventSubscriptionFulfiller, SubscriptionError
+from txCascil.packings.json import JsonPacking
+from txCascil.server.client_controller import ClientController
+from txCascil.transports.netstring import NetstringProtocol
+
+
+class CountingPacking(object):
+    pack_count = 0
+
+    @classmethod
+    def pack(cls, message):
+        cls.pack_count += 1
+        return JsonPacking.pack(message)
+
+def build_subscriber(event_subscription_fulfiller, packing, event_stream):
+    protocol = NetstringProtocol(packing)
+    protocol.transport = Mock()
+    client_controller = ClientController(None, None, protocol, Mock(), Mock(), Mock(), event_subscription_fulfiller)
+    client_controller.subscribe(event_stream)
+    return protocol
+
+class TestEventSubscriptionFulfiller(unittest.TestCase):
+    def setUp(self):
+        self.event_subscription_fulfiller = EventSubscriptionFulfiller()
+        CountingPacking.pack_count = 0
+
+    def test_event_encoded_once_per_packing(self):
+        protocols = [build_subscriber(self.event_subscription_fulfiller, CountingPacking, 'spyd.game.player.connect') for _ in range(5)]
+        json_protocol = build_subscriber(self.event_subscription_fulfiller, JsonPacking, 'spyd.game.player.connect')
+
+        self.event_subscription_fulfiller.publish('spyd.game.player.connect', {'player': 'abc', 'room': '1'})
+
+        self.assertEqual(CountingPacking.pack_count, 1)
+        frames = [protocol.transport.write.call_args[0][0] for protocol in protocols]
+        self.assertTrue(all(frame is frames[0] for frame in frames))
+        self.assertEqual(frames[0], json_protocol.transport.write.call_args[0][0])
+        self.assertEqual(frames[0], json_protocol.encode({"msgtype": "event", "event_stream": 'spyd.game.player.connect', "event_data": {'player': 'abc', 'room': '1'}}))
+
+    def test_handler_unsubscribed_on_subscription_error(self):
+        event_handler = Mock(side_effect=SubscriptionError())
+        self.event_subscription_fulfiller.subscribe('spyd.test', event_handler)
+        self.event_subscription_fulfiller.publish('spyd.test', {})
+        self.event_subscription_fulfiller.publish('spyd.test', {})
+        self.assertEqual(event_handler.call_count, 1)
@@ -0,0 +1,74 @@
+import decimal
+import time
+import unittest
+import uuid
+
+from txCascil.client.service_factory import ClientServiceFactory
+from txCascil.exceptions import PackingError
+from txCascil.packings.binary import BinaryPacking
+from txCascil.packings.edn import EdnPacking
+from txCascil.packings.json import JsonPacking
+from txCascil.server.service_factory import ServerServiceFactory
+
+
+def player_event(cn):
+    return {'msgtype': 'event', 'event_stream': 'spyd.game.player.chat', 'event_data': {'player': str(uuid.UUID(int=cn)), 'room': '1', 'text': 'gg wp', 'scope': 'room'}}
+
+player_info_message = {
+    'msgtype': 'player_info',
+    'player': str(uuid.UUID(int=3)),
+    'player_info': {
+        'cn': 3, 'name': 'player é', 'team': 'good', 'room': '1', 'host': '10.0.0.3', 'model': 0, 'isai': False,
+        'groups': ['local.client', 'local.room.master'],
+        'game_state': {'is_spectator': False, 'is_alive': True, 'frags': 9, 'health': 100, 'ammo': [0, 10, 20, 5, 5, 40, 0]}
+    },
+    'respid': 7
+}
+
+class TestBinaryPacking(unittest.TestCase):
+    def test_round_trip(self):
+        values = [
+            player_info_message,
+            [None, True, False, 0, -1, 2 ** 31, -2 ** 63, 2 ** 80, 1.5, -0.25, '', 'x' * 300, decimal.Decimal('12.50')],
+            {'nested': {'set': {1, 2, 3}, 'empty': {}, 'list': []}},
+        ]
+        for value in values:
+            self.assertEqual(BinaryPacking.unpack(BinaryPacking.pack(value)), value)
+
+    def test_tuples_unpack_as_lists(self):
+        self.assertEqual(BinaryPacking.unpack(BinaryPacking.pack(('a', 1))), ['a', 1])
+
+    def test_rejects_other_packings(self):
+        self.assertRaises(PackingError, BinaryPacking.unpack, JsonPacking.pack(player_info_message).encode('utf-8'))
+        self.assertRaises(PackingError, BinaryPacking.unpack, BinaryPacking.pack(player_info_message)[:-3])
+        self.assertRaises(PackingError, BinaryPacking.unpack, BinaryPacking.pack(1) + b'N')
+
+    def test_selectable_by_endpoints(self):
+        self.assertIs(ServerServiceFactory()._packings['binary'], BinaryPacking)
+        self.assertIs(ClientServiceFactory()._packings['binary'], BinaryPacking)
+
+    def test_timing(self):
+        messages = [player_event(cn) for cn in range(100)] + [player_info_message] * 20
+        iterations = 20
+
+        print("")
+        for name, packing, encode in (('json', JsonPacking, True), ('edn', EdnPacking, True), ('binary', BinaryPacking, False)):
+            packed = [packing.pack(message) for message in messages]
+            if encode:
+                packed = [data.encode('utf-8') for data in packed]
+            size = sum(len(data) for data in packed)
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                for message in messages:
+                    packing.pack(message)
+            pack_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                for data in packed:
+                    packing.unpack(data)
+            unpack_time = time.perf_counter() - start
+
+            count = iterations * len(messages)
+            print("{:>6}: {:6d} bytes for {} messages, pack {:7.0f} msg/s, unpack {:7.0f} msg/s".format(name, size, len(messages), count / pack_time, count / unpack_time))
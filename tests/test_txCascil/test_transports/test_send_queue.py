@@ -0,0 +1,80 @@
+import unittest
+
+from mock import Mock
+from twisted.internet import task
+
+from txCascil.transports.send_queue import SendQueue, SendQueueStats
+
+
+class TestSendQueue(unittest.TestCase):
+    def setUp(self):
+        self.clock = task.Clock()
+        self.transport = Mock()
+        self.stats = SendQueueStats()
+
+    def build_send_queue(self, overflow='drop_oldest'):
+        return SendQueue(self.transport, max_pending=3, overflow=overflow, stats=self.stats, clock=self.clock)
+
+    def written(self):
+        return [call[0][0] for call in self.transport.write.call_args_list]
+
+    def test_writes_through_when_not_paused(self):
+        send_queue = self.build_send_queue()
+        self.transport.registerProducer.assert_called_once_with(send_queue, True)
+        send_queue.write(b'a', droppable=True)
+        self.assertEqual(self.written(), [b'a'])
+
+    def test_queued_while_paused(self):
+        send_queue = self.build_send_queue()
+        send_queue.pauseProducing()
+        send_queue.write(b'a', droppable=True)
+        send_queue.write(b'b')
+        self.assertEqual(self.written(), [])
+
+        self.clock.advance(2)
+        self.assertEqual(self.stats.pending_count, 2)
+        self.assertEqual(send_queue.lag, 2)
+
+        send_queue.resumeProducing()
+        self.assertEqual(self.written(), [b'a', b'b'])
+        self.assertEqual(self.stats.get_and_reset_max_lag(), 2)
+        self.assertEqual(self.stats.get_and_reset_max_lag(), 0)
+
+    def test_drop_oldest_event(self):
+        send_queue = self.build_send_queue()
+        send_queue.pauseProducing()
+        send_queue.write(b'response')
+        for frame in (b'1', b'2', b'3'):
+            send_queue.write(frame, droppable=True)
+        send_queue.resumeProducing()
+        self.assertEqual(self.written(), [b'response', b'2', b'3'])
+        self.assertEqual(self.stats.get_and_reset_dropped_count(), 1)
+
+    def test_responses_never_dropped(self):
+        send_queue = self.build_send_queue()
+        send_queue.pauseProducing()
+        for frame in (b'1', b'2', b'3'):
+            send_queue.write(frame)
+        send_queue.write(b'event', droppable=True)
+        send_queue.write(b'4')
+        send_queue.resumeProducing()
+        self.assertEqual(self.written(), [b'1', b'2', b'3', b'4'])
+
+    def test_disconnect_on_overflow(self):
+        send_queue = self.build_send_queue(overflow='disconnect')
+        send_queue.pauseProducing()
+        for frame in (b'1', b'2', b'3', b'4'):
+            send_queue.write(frame, droppable=True)
+        self.transport.loseConnection.assert_called_once_with()
+        self.assertEqual(self.stats.disconnected_count, 1)
+        self.assertEqual(len(send_queue), 0)
+
+    def test_repauses_while_draining(self):
+        send_queue = self.build_send_queue()
+        send_queue.pauseProducing()
+        send_queue.write(b'1')
+        send_queue.write(b'2')
+        self.transport.write.side_effect = lambda frame: send_queue.pauseProducing()
+        send_queue.resumeProducing()
+        self.assertEqual(self.written(), [b'1'])
+        self.assertEqual(len(send_queue), 1)
@@ -0,0 +1,146 @@
+import decimal
+import io
+import time
+import unittest
+import uuid
+from datetime import datetime
+
+import pytz
+
+import clj
+from txCascil.utils import edn_codec
+
+
+# clj.py predates python 3; these names are all it is missing for the comparisons below
+for name, value in (('long', int), ('unicode', str), ('basestring', str)):
+    if not hasattr(clj, name):
+        setattr(clj, name, value)
+
+class SeekableStringIO(io.StringIO):
+    "Allows the relative seeks clj.CljEncoder uses to overwrite trailing separators."
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            return io.StringIO.seek(self, self.tell() + offset)
+        return io.StringIO.seek(self, offset, whence)
+
+def reference_dumps(value):
+    buf = SeekableStringIO()
+    clj.CljEncoder(value, buf).encode()
+    return buf.getvalue()[:buf.tell()]
+
+room_info_message = {
+    'msgtype': 'room_info',
+    'room': '1',
+    'room_info': {
+        'is_paused': False,
+        'is_resuming': False,
+        'timeleft': 432,
+        'is_intermission': False,
+        'resume_delay': None,
+        'mode': 'instactf',
+        'map': 'forge',
+        'players': [str(uuid.UUID(int=i)) for i in range(16)],
+        'show_awards': True,
+        'mastermode': 0,
+        'mastermask': -1,
+        'temporary': False,
+        'maxplayers': 16
+    },
+    'respid': 12
+}
+
+def player_info_message(cn):
+    return {
+        'msgtype': 'player_info',
+        'player': str(uuid.UUID(int=cn)),
+        'player_info': {
+            'cn': cn,
+            'name': 'player é "{}"'.format(cn),
+            'team': 'good',
+            'room': '1',
+            'host': '10.0.0.{}'.format(cn),
+            'model': 0,
+            'isai': False,
+            'groups': ['local.client', 'local.room.master'],
+            'game_state': {'is_spectator': False, 'is_alive': True, 'frags': cn * 3, 'health': 100, 'ammo': [0, 10, 20, 5, 5, 40, 0]}
+        }
+    }
+
+player_info_list = [player_info_message(cn) for cn in range(16)]
+
+class TestEdnCodec(unittest.TestCase):
+    def test_encoding_matches_reference(self):
+        for value in (room_info_message, player_info_list, {'a': {1, 2}}, [decimal.Decimal('1.5'), 2.25, -7, None, True, 'tab\there'], [], {}, set()):
+            self.assertEqual(edn_codec.dumps(value), reference_dumps(value))
+
+    def test_decoding_matches_reference(self):
+        for text in ('{:a 1 :b [1 2.5 -3] :c nil}', '#{1 2 3}', '[:a :b (true false)]', '#:spyd{:a 1 :b 2}', '{:n 12.5M}', '[1[2]]'):
+            self.assertEqual(edn_codec.loads(text), clj.loads(text))
+
+    def test_round_trip(self):
+        for value in (room_info_message, player_info_list):
+            text = edn_codec.dumps(value)
+            decoded = edn_codec.loads(text)
+            self.assertEqual(decoded, value)
+            self.assertEqual(edn_codec.dumps(decoded), text)
+            self.assertEqual(edn_codec.loads(reference_dumps(value)), decoded)
+
+    def test_strings(self):
+        self.assertEqual(edn_codec.loads('"a \\"quoted\\" \\u00e9 \\\\ \\n"'), 'a "quoted" é \\ \n')
+        self.assertEqual(edn_codec.loads(edn_codec.dumps('\U0001f600')), '\U0001f600')
+
+    def test_tagged_values(self):
+        value = [datetime(2020, 1, 2, 3, 4, 5, tzinfo=pytz.utc), uuid.UUID(int=5)]
+        self.assertEqual(edn_codec.dumps(value), reference_dumps(value))
+        self.assertEqual(edn_codec.loads(edn_codec.dumps(value)), value)
+
+    def test_keywords_decode_to_strings(self):
+        self.assertEqual(edn_codec.loads(b'{:msgtype :ping, :reqid 3}'), {'msgtype': 'ping', 'reqid': 3})
+
+    def test_errors(self):
+        self.assertRaises(ValueError, edn_codec.loads, '[1 2')
+        self.assertRaises(ValueError, edn_codec.loads, '[1 2}')
+        circular = []
+        circular.append(circular)
+        self.assertRaises(ValueError, edn_codec.dumps, circular)
+        shared = [1]
+        self.assertEqual(edn_codec.dumps([shared, shared]), '[[1] [1]]')
+
+    def test_timing(self):
+        iterations = 200
+        payloads = (room_info_message, player_info_list)
+
+        # clj.py can not decode strings under python 3, so its decoding is timed on the keyword and number parts of a player list
+        stats_text = '[' + ' '.join('{{:cn {0} :frags {1} :health 100 :isai false :team :good :ammo [0 10 20 5 5 40 0]}}'.format(cn, cn * 3) for cn in range(16)) + ']'
+        start = time.perf_counter()
+        for _ in range(iterations):
+            clj.loads(stats_text)
+        reference_decode_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(iterations):
+            edn_codec.loads(stats_text)
+        decode_time = time.perf_counter() - start
+        print("\nplayer stats list ({} bytes): decode clj {:.1f} us, codec {:.1f} us ({:.1f}x)".format(
+            len(stats_text), reference_decode_time / iterations * 1e6, decode_time / iterations * 1e6, reference_decode_time / decode_time))
+
+        for payload in payloads:
+            text = reference_dumps(payload)
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                reference_dumps(payload)
+            reference_encode_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                edn_codec.dumps(payload)
+            encode_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                edn_codec.loads(text)
+            decode_time = time.perf_counter() - start
+
+            print("{} ({} bytes): encode clj {:.1f} us, codec {:.1f} us ({:.1f}x); decode codec {:.1f} us".format(
+                payload['msgtype'] if isinstance(payload, dict) else 'player_info list', len(text),
+                reference_encode_time / iterations * 1e6, encode_time / iterations * 1e6, reference_encode_time / encode_time, decode_time / iterations * 1e6))